@@ -0,0 +1,37 @@
+"""
+Reminder claim leases.
+
+Revision ID: 1ca58a7c4abd
+Revises: 3d9c7f4c3e4c
+Create Date: 2026-10-18 01:40:12.512830
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '1ca58a7c4abd'
+down_revision = '3d9c7f4c3e4c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the claim lease of reminders and an index on due reminders."""
+    op.add_column(
+        'api_reminder',
+        sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        'ix_api_reminder_due',
+        'api_reminder',
+        ['expiration'],
+        unique=False,
+        postgresql_where=sa.text('active'),
+    )
+
+
+def downgrade() -> None:
+    """Drop the claim lease of reminders and the index on due reminders."""
+    op.drop_index('ix_api_reminder_due', table_name='api_reminder')
+    op.drop_column('api_reminder', 'claimed_until')
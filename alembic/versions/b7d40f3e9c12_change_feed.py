@@ -0,0 +1,79 @@
+"""
+Change feed.
+
+Revision ID: b7d40f3e9c12
+Revises: 5e8b1c2f7a90
+Create Date: 2026-10-18 03:48:26.904173
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d40f3e9c12'
+down_revision = '5e8b1c2f7a90'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = (
+    'api_botsetting',
+    'api_documentationlink',
+    'api_filterlist',
+    'api_offtopicchannelname',
+    'api_role',
+)
+
+# The advisory lock serializes the writers of the tracked tables, so
+# changes are committed in the order of their ids and a reader that
+# resumes after an id never skips a change committed later.
+RECORD_CHANGE_FUNCTION = """
+CREATE FUNCTION api_record_change() RETURNS trigger AS $$
+DECLARE
+    change_id bigint;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('api_change'));
+    INSERT INTO api_change (table_name, operation, data)
+    VALUES (
+        TG_TABLE_NAME,
+        TG_OP,
+        CASE WHEN TG_OP = 'DELETE' THEN to_jsonb(OLD) ELSE to_jsonb(NEW) END
+    )
+    RETURNING id INTO change_id;
+    PERFORM pg_notify('api_change_feed', change_id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Add the change table and the triggers recording changes into it."""
+    op.create_table(
+        'api_change',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('operation', sa.String(length=6), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute(RECORD_CHANGE_FUNCTION)
+    for table in TRACKED_TABLES:
+        op.execute(
+            f'CREATE TRIGGER {table}_change AFTER INSERT OR UPDATE OR DELETE '
+            f'ON {table} FOR EACH ROW EXECUTE FUNCTION api_record_change()'
+        )
+
+
+def downgrade() -> None:
+    """Drop the change table and its triggers."""
+    for table in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER {table}_change ON {table}')
+    op.execute('DROP FUNCTION api_record_change()')
+    op.drop_table('api_change')
@@ -0,0 +1,47 @@
+"""
+Partial unique active infraction.
+
+Revision ID: d3a91c6b5f27
+Revises: b7d40f3e9c12
+Create Date: 2026-10-18 09:41:26.208193
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a91c6b5f27'
+down_revision = 'b7d40f3e9c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Only require active infractions to be unique per type and user."""
+    op.drop_index(
+        'unique_active_infraction_per_type_per_user', table_name='api_infraction'
+    )
+    op.create_index(
+        'unique_active_infraction_per_type_per_user',
+        'api_infraction',
+        ['user_id', 'type'],
+        unique=True,
+        postgresql_where=sa.text('active'),
+    )
+
+
+def downgrade() -> None:
+    """
+    Require all infractions to be unique per type and user again.
+
+    This fails once a user has several infractions of the same type.
+    """
+    op.drop_index(
+        'unique_active_infraction_per_type_per_user', table_name='api_infraction'
+    )
+    op.create_index(
+        'unique_active_infraction_per_type_per_user',
+        'api_infraction',
+        ['user_id', 'type'],
+        unique=True,
+    )
@@ -0,0 +1,139 @@
+"""
+A read-through cache for responses that rarely change.
+
+Some resources, like the bot settings and the documentation
+links, are read on almost every bot command but only change a
+few times a day. Their serialized responses are cached in
+memory by every worker, under a namespace per resource, and
+served with a strong `ETag` derived from the response body.
+Clients that send that ETag back in `If-None-Match` get a
+`304 Not Modified` without a body.
+
+Write endpoints call `commit_and_invalidate`, which commits
+the session together with a notification on `CACHE_CHANNEL`.
+Every worker listening on that channel then drops the cached
+responses of that namespace, so the next read goes to the
+database again.
+"""
+
+import hashlib
+import time
+import typing
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from api.core.database.notifications import listener, notify
+from api.core.schemas import dumps
+from api.core.settings import settings
+
+CACHE_CHANNEL = "api_cache_invalidation"
+
+
+class CachedResponse(typing.NamedTuple):
+    """A serialized response body with its ETag."""
+
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def etag_matches(if_none_match: typing.Optional[str], etag: str) -> bool:
+    """Return whether an `If-None-Match` header matches the given ETag."""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # `If-None-Match` uses the weak comparison, so a `W/` prefix is ignored.
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """Cached responses of a worker, grouped by namespace."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, CachedResponse]] = {}
+        # Bumped on every invalidation of a namespace or of the whole cache.
+        # A response loaded while its namespace was invalidated is not cached.
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+
+    def generation(self, namespace: str) -> tuple[int, int]:
+        """Return the current generation of a namespace."""
+        return self._epoch, self._generations.get(namespace, 0)
+
+    def get(self, namespace: str, key: str) -> typing.Optional[CachedResponse]:
+        """Return a cached response, unless it is missing or has expired."""
+        entry = self._entries.get(namespace, {}).get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            return None
+        return entry
+
+    def put(
+        self, namespace: str, key: str, content: object, generation: tuple[int, int]
+    ) -> CachedResponse:
+        """
+        Serialize content and cache it, if the namespace is still at `generation`.
+
+        The serialized response is returned either way.
+        """
+        body = dumps(content)
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            expires_at=time.monotonic() + settings.response_cache_ttl,
+        )
+        if generation == self.generation(namespace):
+            self._entries.setdefault(namespace, {})[key] = entry
+        return entry
+
+    def invalidate(self, namespace: typing.Optional[str] = None) -> None:
+        """Drop the cached responses of a namespace, or of all namespaces."""
+        if namespace is None:
+            self._entries.clear()
+            self._epoch += 1
+            return
+
+        self._entries.pop(namespace, None)
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+response_cache = ResponseCache()
+listener.subscribe(CACHE_CHANNEL, response_cache.invalidate)
+
+
+async def cached_response(
+    request: Request,
+    namespace: str,
+    load: typing.Callable[[], typing.Awaitable[object]],
+) -> Response:
+    """
+    Respond with the cached response of a request, loading it if needed.
+
+    The cache key is the path and query string of the request, and `load`
+    is only awaited if no response is cached for it yet.
+    """
+    key = f"{request.url.path}?{request.url.query}"
+
+    entry = response_cache.get(namespace, key)
+    if entry is None:
+        generation = response_cache.generation(namespace)
+        entry = response_cache.put(namespace, key, await load(), generation)
+
+    headers = {"ETag": entry.etag}
+    if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+async def commit_and_invalidate(session: AsyncSession, namespace: str) -> None:
+    """Commit the session and invalidate a namespace in every worker."""
+    await notify(session, CACHE_CHANNEL, namespace)
+    await session.commit()
+    # This worker is notified as well, but reads that follow this request
+    # right away should not have to wait for the notification to arrive.
+    response_cache.invalidate(namespace)
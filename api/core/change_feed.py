@@ -0,0 +1,163 @@
+"""
+A feed of the changes to the tables the bot keeps a copy of.
+
+Every insert, update and delete on the tracked tables is recorded
+in the `api_change` table by a database trigger, which also sends
+the id of the change on `CHANGE_CHANNEL`. Change ids are assigned
+in commit order, so a client that has seen all changes up to an
+id can resume the feed right after it.
+
+Clients read the feed as server-sent events. The id of every
+event is the id of its change, which the client sends back in
+the `Last-Event-ID` header when it reconnects. Notifications only
+wake up the open streams, which then read the new changes from
+the table, so a change is never lost if a notification is.
+
+Changes are kept for `change_feed_retention` seconds and then
+purged by `api.core.purge`. A client resuming from a change that
+is older than that gets a `resync` event instead of `ready`: it
+has missed changes, so it has to load the tracked tables in full.
+"""
+
+import asyncio
+import json
+import typing
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import Select
+
+from api.core.database.models.api.bot import Change
+from api.core.database.notifications import listener
+
+CHANGE_CHANNEL = "api_change_feed"
+
+TRACKED_TABLES = (
+    "api_botsetting",
+    "api_documentationlink",
+    "api_filterlist",
+    "api_offtopicchannelname",
+    "api_role",
+)
+
+# The number of changes read from the database at once.
+BATCH_SIZE = 500
+
+# The time in seconds after which an idle stream sends a comment, so that
+# proxies and clients don't consider the connection dead.
+KEEPALIVE_INTERVAL = 15.0
+
+changes = Change.__table__
+
+
+class ChangeNotifier:
+    """Wakes up the streams of this worker when a change was committed."""
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self._changed: typing.Optional[asyncio.Event] = None
+
+    def notify(self, _payload: typing.Optional[str] = None) -> None:
+        """Wake up all waiting streams."""
+        self.generation += 1
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def wait(self, generation: int, timeout: float) -> bool:
+        """
+        Wait for a change after `generation`, for up to `timeout` seconds.
+
+        Returns whether a change happened.
+        """
+        if generation != self.generation:
+            return True
+
+        # The event is created here, so it belongs to the running event loop.
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+change_notifier = ChangeNotifier()
+listener.subscribe(CHANGE_CHANNEL, change_notifier.notify)
+
+
+def changes_query(
+    after: int, tables: typing.Optional[typing.Collection[str]]
+) -> Select:
+    """Select the next batch of changes after a change id."""
+    query = (
+        select(changes)
+        .where(changes.c.id > after)
+        .order_by(changes.c.id)
+        .limit(BATCH_SIZE)
+    )
+    if tables:
+        query = query.where(changes.c.table_name.in_(tables))
+    return query
+
+
+def format_event(change: typing.Mapping) -> bytes:
+    """Format a change as a server-sent event."""
+    data = json.dumps(
+        {
+            "table": change["table_name"],
+            "operation": change["operation"],
+            "data": change["data"],
+            "created_at": change["created_at"].isoformat(),
+        },
+        separators=(",", ":"),
+    )
+    return f"id: {change['id']}\nevent: change\ndata: {data}\n\n".encode()
+
+
+async def stream_changes(
+    session_factory: sessionmaker,
+    after: typing.Optional[int],
+    tables: typing.Optional[typing.Collection[str]] = None,
+) -> typing.AsyncIterator[bytes]:
+    """
+    Stream the changes after a change id as server-sent events, forever.
+
+    Without a change id, only changes made from now on are streamed. The
+    stream starts with a `ready` event carrying the id it resumes from,
+    or with a `resync` event if changes after the id were purged, in
+    which case it continues from the latest change. A session is only
+    opened to read changes, so an idle stream doesn't hold a pooled
+    connection.
+    """
+    async with session_factory() as session:
+        oldest, latest = (
+            await session.execute(
+                select(func.min(changes.c.id), func.max(changes.c.id))
+            )
+        ).one()
+
+    event = "ready"
+    # The latest change is never purged, so an empty table has no changes yet.
+    if after is not None and oldest is not None and oldest > after + 1:
+        after, event = None, "resync"
+    if after is None:
+        after = latest or 0
+    yield f"id: {after}\nevent: {event}\ndata: \n\n".encode()
+
+    while True:
+        generation = change_notifier.generation
+        async with session_factory() as session:
+            batch = (
+                (await session.execute(changes_query(after, tables))).mappings().all()
+            )
+
+        if batch:
+            after = batch[-1]["id"]
+            yield b"".join(format_event(change) for change in batch)
+            if len(batch) == BATCH_SIZE:
+                continue
+
+        if not await change_notifier.wait(generation, KEEPALIVE_INTERVAL):
+            yield b": keepalive\n\n"
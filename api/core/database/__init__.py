@@ -7,5 +7,7 @@ other functionality related to database interop.
 
 from sqlalchemy.orm import declarative_base
 
+from .engine import get_engine, get_session
+
 Base = declarative_base()
 metadata = Base.metadata
@@ -0,0 +1,86 @@
+"""
+Management of the database engine used by the API.
+
+Every worker process owns exactly one `AsyncEngine` with a
+bounded connection pool. The engine is created when the app
+starts up and disposed of when it shuts down, which means
+that nothing connects to the database at import time.
+
+Endpoints get a database session through the `get_session`
+dependency, which hands out a fresh `AsyncSession` bound to
+the shared engine for the duration of a single request.
+"""
+
+import typing
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.core.settings import settings
+
+_engine: typing.Optional[AsyncEngine] = None
+_session_factory: typing.Optional[sessionmaker] = None
+
+
+def create_engine() -> AsyncEngine:
+    """Create a new `AsyncEngine` with the pool configured in the settings."""
+    return create_async_engine(
+        settings.database_url,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        future=True,
+    )
+
+
+async def connect() -> None:
+    """Create the engine and session factory of this worker process."""
+    global _engine, _session_factory
+
+    if _engine is not None:
+        return
+
+    _engine = create_engine()
+    _session_factory = sessionmaker(
+        bind=_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+
+async def disconnect() -> None:
+    """Dispose of the engine, closing all pooled connections."""
+    global _engine, _session_factory
+
+    if _engine is None:
+        return
+
+    await _engine.dispose()
+    _engine = None
+    _session_factory = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the engine of this worker process."""
+    if _engine is None:
+        raise RuntimeError("The database engine has not been started yet.")
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    """Return the `AsyncSession` factory bound to the engine of this worker."""
+    if _session_factory is None:
+        raise RuntimeError("The database engine has not been started yet.")
+    return _session_factory
+
+
+async def get_session() -> typing.AsyncIterator[AsyncSession]:
+    """
+    Yield an `AsyncSession` for the duration of a request.
+
+    This is meant to be used as a FastAPI dependency. The
+    session is closed after the response has been sent, which
+    returns its connection to the pool.
+    """
+    async with get_session_factory()() as session:
+        yield session
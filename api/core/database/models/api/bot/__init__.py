@@ -1,4 +1,5 @@
 from .bot_setting import BotSetting
+from .change import Change
 from .deleted_message import DeletedMessage
 from .documentation_link import DocumentationLink
 from .filter_list import FilterList
@@ -6,6 +6,11 @@ from sqlalchemy.orm import validates
 
 from api.core.database import Base
 
+BOT_SETTING_NAMES = (
+    "defcon",
+    "news",
+)
+
 
 class BotSetting(Base):
     """A configuration entry for the bot."""
@@ -20,10 +25,6 @@ class BotSetting(Base):
     @validates("name")
     def validate_name(self, _key: str, name: str) -> Union[str, NoReturn]:
         """Raise ValueError if the provided name is not in the known settings."""
-        known_settings = (
-            "defcon",
-            "news",
-        )
-        if name not in known_settings:
+        if name not in BOT_SETTING_NAMES:
             raise ValueError(f"`{name}` is not a known bot setting name.")
         return name
@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from api.core.database import Base
+
+
+class Change(Base):
+    """
+    A change to a row of a table that the bot keeps a copy of.
+
+    Changes are recorded by database triggers, see `api.core.change_feed`.
+    """
+
+    __tablename__ = "api_change"
+
+    # The sequence number of this change. Changes are committed in this order.
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # The table of the changed row.
+    table_name = Column(String(63), nullable=False)
+
+    # The operation, one of INSERT, UPDATE, and DELETE.
+    operation = Column(String(6), nullable=False)
+
+    # The row after an insert or update, or before a delete.
+    data = Column(JSONB, nullable=False)
+
+    # When this change was made.
+    created_at = Column(DateTime(True), nullable=False, server_default=func.now())
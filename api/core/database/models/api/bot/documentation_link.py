@@ -6,6 +6,24 @@ from sqlalchemy.orm import validates
 
 from api.core.database import Base
 
+PACKAGE_NAME_RE = re.compile(r"^[a-z0-9_]+$")
+
+
+def validate_base_url(url: str) -> Union[str, NoReturn]:
+    """Raise ValueError if the provided url does not end with a slash('/')."""
+    if not url.endswith("/"):
+        raise ValueError("The entered URL must end with a slash.")
+    return url
+
+
+def validate_package(package: str) -> Union[str, NoReturn]:
+    """Raise ValueError if the provided package name does not meet the conditions."""
+    if not PACKAGE_NAME_RE.match(package):
+        raise ValueError(
+            "Package names can only consist of lowercase a-z letters, digits, and underscores."
+        )
+    return package
+
 
 class DocumentationLink(Base):
     """A documentation link used by the `!docs` command of the bot."""
@@ -24,17 +42,10 @@ class DocumentationLink(Base):
 
     @validates("base_url")
     def validate_base_url(self, _key: str, url: str) -> Union[str, NoReturn]:
-        """Raise ValueError if the provided url does not start with a slash('/')."""
-        if not url.endswith("/"):
-            raise ValueError("The entered URL must end with a slash.")
-        return url
+        """Raise ValueError if the provided url does not end with a slash('/')."""
+        return validate_base_url(url)
 
     @validates("package")
     def validate_package(self, _key: str, package: str) -> Union[str, NoReturn]:
         """Raise ValueError if the provided package name does not meet the conditions."""
-        pattern = re.compile(r"^[a-z0-9_]+$")
-        if not pattern.match(package):
-            raise ValueError(
-                "Package names can only consist of lowercase a-z letters, digits, and underscores."
-            )
-        return package
+        return validate_package(package)
@@ -13,6 +13,8 @@ from sqlalchemy.orm import validates
 
 from api.core.database import Base
 
+FILTER_LIST_TYPES = ("GUILD_INVITE", "FILE_FORMAT", "DOMAIN_NAME", "FILTER_TOKEN")
+
 
 class FilterList(Base):
     """An item that is either allowed or denied."""
@@ -39,7 +41,6 @@ class FilterList(Base):
     @validates("type")
     def validate_type(self, _key: str, typeval: str) -> Union[str, NoReturn]:
         """Raise ValueError if the provided type is not in the list of valid types."""
-        choices = ("GUILD_INVITE", "FILE_FORMAT", "DOMAIN_NAME", "FILTER_TOKEN")
-        if typeval not in choices:
+        if typeval not in FILTER_LIST_TYPES:
             raise ValueError(f"{typeval} is not a valid FilterList type")
         return typeval
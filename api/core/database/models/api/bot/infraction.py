@@ -10,20 +10,47 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import validates
 
 from api.core.database import Base
 
+INFRACTION_TYPES = (
+    "note",
+    "warning",
+    "watch",
+    "mute",
+    "kick",
+    "ban",
+    "superstar",
+    "voice_ban",
+    "voice_mute",
+)
+
 
 class Infraction(Base):
     """An infraction for a Discord user."""
 
     __tablename__ = "api_infraction"
     __table_args__ = (
+        # Only active infractions are unique, a user may have any number of
+        # inactive infractions of a type.
+        Index(
+            "unique_active_infraction_per_type_per_user",
+            "user_id",
+            "type",
+            unique=True,
+            postgresql_where=text("active"),
+        ),
+        # Covers the per-user summary, so it never has to visit the table.
         Index(
-            "unique_active_infraction_per_type_per_user", "user_id", "type", unique=True
+            "ix_api_infraction_user_summary",
+            "user_id",
+            "active",
+            "type",
+            postgresql_include=["expires_at", "id"],
         ),
     )
 
@@ -79,17 +106,6 @@ class Infraction(Base):
     @validates("type")
     def validate_type(self, _key: str, infrtype: str) -> Union[str, NoReturn]:
         """Raise ValueError if the provided Infranction type is not in the list of supported types."""
-        type_choices = (
-            "note",
-            "warning",
-            "watch",
-            "mute",
-            "kick",
-            "ban",
-            "superstar",
-            "voice_ban",
-            "voice_mute",
-        )
-        if infrtype not in type_choices:
+        if infrtype not in INFRACTION_TYPES:
             raise ValueError(f"{infrtype} is not a valid Infraction type!")
         return infrtype
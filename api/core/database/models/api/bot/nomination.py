@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import relationship
 
 from api.core.database import Base
@@ -10,6 +10,10 @@ class Nomination(Base):
     """A general helper nomination information created by staff."""
 
     __tablename__ = "api_nomination"
+    __table_args__ = (
+        # Serves the review queue, the active unreviewed nominations by age.
+        Index("ix_api_nomination_review_queue", "active", "reviewed", "inserted_at"),
+    )
 
     # Whether this nomination is still relevant.
     active = Column(Boolean, nullable=False)
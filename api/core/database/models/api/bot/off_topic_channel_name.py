@@ -1,16 +1,26 @@
 import re
 from typing import NoReturn, Union
 
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Index, String, text
 from sqlalchemy.orm import validates
 
 from api.core.database import Base
 
+NAME_RE = re.compile(r"^[a-z0-9\U0001d5a0-\U0001d5b9-ǃ？’'＜＞]+$")
+
 
 class OffTopicChannelName(Base):
     """An off-topic channel name, used during the daily channel name shuffle."""
 
     __tablename__ = "api_offtopicchannelname"
+    __table_args__ = (
+        # Serves the draw of the names that are left in this rotation.
+        Index(
+            "ix_api_offtopicchannelname_unused",
+            "name",
+            postgresql_where=text("NOT used"),
+        ),
+    )
 
     # The actual channel name that will be used on our Discord server.
     name = Column(String(96), primary_key=True, index=True)
@@ -21,6 +31,6 @@ class OffTopicChannelName(Base):
     @validates("name")
     def validate_name(self, _key: str, name: str) -> Union[str, NoReturn]:
         """Raise ValueError if the provided Off-topic name does not meet the conditions."""
-        if not re.match(r"^[a-z0-9\U0001d5a0-\U0001d5b9-ǃ？’'＜＞]+$", name):
+        if not NAME_RE.match(name):
             raise ValueError(f"{name} is not a valid Off Topic channel name!")
         return name
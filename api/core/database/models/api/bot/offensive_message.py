@@ -19,7 +19,7 @@ class OffensiveMessage(Base):
     channel_id = Column(BigInteger, nullable=False)
 
     # The date on which the message will be auto-deleted.
-    delete_date = Column(DateTime(True), nullable=False)
+    delete_date = Column(DateTime(True), nullable=False, index=True)
 
     @validates("id")
     def validate_ofmessage_id(self, _key: str, message_id: int) -> Union[int, NoReturn]:
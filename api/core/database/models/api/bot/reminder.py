@@ -7,8 +7,10 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import validates
@@ -20,6 +22,10 @@ class Reminder(Base):
     """A reminder created by a user."""
 
     __tablename__ = "api_reminder"
+    __table_args__ = (
+        # Due reminders are looked up among the active ones only.
+        Index("ix_api_reminder_due", "expiration", postgresql_where=text("active")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -39,6 +45,10 @@ class Reminder(Base):
     # Number of times we attempted to send the reminder and failed.
     failures = Column(Integer, default=0, nullable=False)
 
+    # Until when the reminder is claimed by a client that is sending it.
+    # Null if the reminder is not claimed or the claim was acknowledged.
+    claimed_until = Column(DateTime(True))
+
     author_id = Column(
         ForeignKey(
             "api_user.id", deferrable=True, initially="DEFERRED", ondelete="CASCADE"
@@ -6,24 +6,46 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Index,
     SmallInteger,
     String,
 )
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, validates
+from sqlalchemy.orm import validates
 
 from api.core.database import Base
-from api.core.settings import settings
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(bind=engine)
+
+def validate_user_id(user_id: int) -> Union[int, NoReturn]:
+    """Raise ValueError if the provided id is negative."""
+    if user_id < 0:
+        raise ValueError("User IDs cannot be negative.")
+    return user_id
+
+
+def validate_discriminator(discriminator: int) -> Union[int, NoReturn]:
+    """Raise ValueError if the provided discriminator is exceeds `9999`."""
+    if discriminator > 9999 or discriminator <= 0:
+        raise ValueError("Discriminators may not exceed `9999` or be below `0001`.")
+    return discriminator
+
+
+def validate_roles(roles: list[int]) -> Union[list[int], NoReturn]:
+    """Raise ValueError if the provided role(s) is negative."""
+    for role in roles:
+        if role < 0:
+            raise ValueError("Role IDs cannot be negative")
+    return roles
 
 
 class User(Base):
     """A Discord user."""
 
     __tablename__ = "api_user"
-    __table_args__ = (CheckConstraint("discriminator >= 0"),)
+    __table_args__ = (
+        CheckConstraint("discriminator >= 0"),
+        # Serves the role membership queries, `roles @> ...` and `roles && ...`.
+        Index("ix_api_user_roles", "roles", postgresql_using="gin"),
+    )
 
     # The ID of this user, taken from Discord.
     id = Column(BigInteger, primary_key=True)
@@ -43,23 +65,16 @@ class User(Base):
     @validates("id")
     def validate_user_id(self, _key: str, user_id: int) -> Union[int, NoReturn]:
         """Raise ValueError if the provided id is negative."""
-        if user_id < 0:
-            raise ValueError("User IDs cannot be negative.")
-        return user_id
+        return validate_user_id(user_id)
 
     @validates("discriminator")
     def validate_discriminator(
         self, _key: str, discriminator: int
     ) -> Union[int, NoReturn]:
         """Raise ValueError if the provided discriminator is exceeds `9999`."""
-        if discriminator > 9999 or discriminator <= 0:
-            raise ValueError("Discriminators may not exceed `9999` or be below `0001`.")
-        return discriminator
+        return validate_discriminator(discriminator)
 
     @validates("roles")
     def validate_roles(self, _key: str, roles: list[int]) -> Union[list[int], NoReturn]:
         """Raise ValueError if the provided role(s) is negative."""
-        for role in roles:
-            if role < 0:
-                raise ValueError("Role IDs cannot be negative")
-        return roles
+        return validate_roles(roles)
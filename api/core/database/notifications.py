@@ -0,0 +1,123 @@
+"""
+PostgreSQL `LISTEN/NOTIFY` support.
+
+Every worker process keeps a single dedicated connection that
+listens on the channels other parts of the API subscribed to.
+This connection is not taken from the pool of the engine, so
+it never competes with requests for a pooled connection.
+
+Notifications are sent with `notify` inside the transaction of
+a request, which means that PostgreSQL delivers them to every
+listening worker only once the transaction has been committed.
+
+If the listening connection is lost, notifications sent in
+the meantime are lost as well. Subscribers are therefore
+called with `None` as the payload after every (re)connect, to
+signal that they should resynchronize their state.
+"""
+
+import asyncio
+import collections
+import logging
+import typing
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+Subscriber = typing.Callable[[typing.Optional[str]], None]
+
+# The delay in seconds before reconnecting after the connection was lost.
+RECONNECT_DELAY = 5.0
+
+
+async def notify(session: AsyncSession, channel: str, payload: str = "") -> None:
+    """Send a notification that is delivered once the session commits."""
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+class NotificationListener:
+    """A dedicated connection dispatching notifications to subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, list[Subscriber]] = collections.defaultdict(list)
+        self._task: typing.Optional[asyncio.Task] = None
+
+    def subscribe(self, channel: str, subscriber: Subscriber) -> None:
+        """
+        Call `subscriber` with the payload of every notification on `channel`.
+
+        Subscribers have to be registered before the listener is started.
+        They are called on the event loop and must not block.
+        """
+        self._subscribers[channel].append(subscriber)
+
+    def _dispatch(
+        self, _connection: asyncpg.Connection, _pid: int, channel: str, payload: str
+    ) -> None:
+        for subscriber in self._subscribers[channel]:
+            try:
+                subscriber(payload)
+            except Exception:
+                log.exception("Subscriber of channel %r failed.", channel)
+
+    def _resynchronize(self) -> None:
+        for channel, subscribers in self._subscribers.items():
+            for subscriber in subscribers:
+                try:
+                    subscriber(None)
+                except Exception:
+                    log.exception("Subscriber of channel %r failed.", channel)
+
+    async def _listen(self) -> None:
+        dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+        while True:
+            try:
+                connection = await asyncpg.connect(dsn)
+            except (OSError, asyncpg.PostgresError):
+                log.exception("Failed to connect the notification listener.")
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(
+                lambda _connection, closed=closed: closed.set()
+            )
+            try:
+                for channel in self._subscribers:
+                    await connection.add_listener(channel, self._dispatch)
+                self._resynchronize()
+                await closed.wait()
+                log.warning("The notification listener lost its connection.")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                log.exception("The notification listener failed.")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def start(self) -> None:
+        """Start listening in the background, if anything subscribed."""
+        if self._task is None and self._subscribers:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+listener = NotificationListener()
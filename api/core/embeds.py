@@ -0,0 +1,165 @@
+"""
+Validation of Discord message embeds.
+
+This attempts to rebuild the validation used by Discord as well
+as possible by checking for various embed limits, so we can
+ensure that any embed we store will also be accepted as a valid
+embed by the Discord API.
+
+All key sets are built once at import time and every embed is
+validated in a single pass over its keys. Whole batches of
+messages can be validated with `embed_errors`, which reports
+the first error of every invalid message instead of stopping
+at the first invalid message.
+"""
+
+import typing
+from collections.abc import Mapping
+
+EMBED_KEYS = frozenset(
+    {
+        "title",
+        "type",
+        "description",
+        "url",
+        "timestamp",
+        "color",
+        "footer",
+        "image",
+        "thumbnail",
+        "video",
+        "provider",
+        "author",
+        "fields",
+    }
+)
+ONE_REQUIRED_OF = frozenset({"description", "fields", "image", "title", "video"})
+# Sorted once, so error messages are the same every time.
+ONE_REQUIRED_OF_NAMES = ", ".join(sorted(ONE_REQUIRED_OF))
+
+FIELD_KEYS = frozenset({"name", "value", "inline"})
+FIELD_REQUIRED_KEYS = frozenset({"name", "value"})
+FOOTER_KEYS = frozenset({"text", "icon_url", "proxy_icon_url"})
+AUTHOR_KEYS = frozenset({"name", "url", "icon_url", "proxy_icon_url"})
+
+
+def _check_title(title: str) -> None:
+    if len(title) < 1:
+        raise ValueError("Embed title must not be empty")
+    if len(title) > 256:
+        raise ValueError("Reached max length of embed title")
+
+
+def _check_description(description: str) -> None:
+    if len(description) > 4096:
+        raise ValueError("Reached max length of embed description")
+
+
+def _check_fields(fields: list) -> None:
+    for field in fields:
+        if not isinstance(field, Mapping):
+            raise ValueError("Embed fields must be a mapping.")
+        if not FIELD_REQUIRED_KEYS <= field.keys():
+            raise ValueError(
+                "Embed fields must contain the following fields: name, value."
+            )
+        if not FIELD_KEYS >= field.keys():
+            unknown = min(field.keys() - FIELD_KEYS)
+            raise ValueError(f"Unknown embed field field: {unknown!r}.")
+        if len(field["name"]) > 256:
+            raise ValueError("Embed field-name length reached max limit.")
+        if len(field["value"]) > 1024:
+            raise ValueError("Embed field-value length reached max limit.")
+        if "inline" in field and not isinstance(field["inline"], bool):
+            raise ValueError(
+                f"This field must be of type bool, not {type(field['inline'])}."
+            )
+
+
+def _check_footer(footer: Mapping) -> None:
+    if not isinstance(footer, Mapping):
+        raise ValueError("Embed footer must be a mapping.")
+    if not FOOTER_KEYS >= footer.keys():
+        unknown = min(footer.keys() - FOOTER_KEYS)
+        raise ValueError(f"Unknown embed footer field: {unknown!r}.")
+    text = footer.get("text", "")
+    if len(text) < 1:
+        raise ValueError("Footer text must not be empty.")
+    if len(text) > 2048:
+        raise ValueError("Footer text length reached the max limit.")
+
+
+def _check_author(author: Mapping) -> None:
+    if not isinstance(author, Mapping):
+        raise ValueError("Embed author must be a mapping.")
+    if not AUTHOR_KEYS >= author.keys():
+        unknown = min(author.keys() - AUTHOR_KEYS)
+        raise ValueError(f"Unknown embed author field: {unknown!r}.")
+    name = author.get("name", "")
+    if len(name) < 1:
+        raise ValueError("Embed author name must not be empty.")
+    if len(name) > 256:
+        raise ValueError("Embed author name length reached the max limit.")
+
+
+# The checks of the keys that have a check, run once per key of the embed.
+_KEY_CHECKS: dict[str, typing.Callable[[typing.Any], None]] = {
+    "title": _check_title,
+    "description": _check_description,
+    "fields": _check_fields,
+    "footer": _check_footer,
+    "author": _check_author,
+}
+
+
+def validate_embed(embed: Mapping) -> Mapping:
+    """Raise ValueError if the embed would not be accepted by Discord."""
+    if not isinstance(embed, Mapping):
+        raise ValueError("Tag embed must be a mapping.")
+    if not embed:
+        raise ValueError("Tag embed must not be empty.")
+
+    has_required = False
+    for key, value in embed.items():
+        if key not in EMBED_KEYS:
+            raise ValueError(f"Unknown field name: {key!r}")
+
+        if key in ONE_REQUIRED_OF:
+            if not value:
+                raise ValueError(f"Key {key!r} must not be empty.")
+            has_required = True
+
+        if (check := _KEY_CHECKS.get(key)) is not None:
+            check(value)
+
+    if not has_required:
+        raise ValueError(
+            f"Tag embed must contain one of the fields {ONE_REQUIRED_OF_NAMES}."
+        )
+    return embed
+
+
+def validate_embeds(embeds: typing.Iterable[Mapping]) -> typing.Iterable[Mapping]:
+    """Raise ValueError if any of the embeds would not be accepted by Discord."""
+    for embed in embeds:
+        validate_embed(embed)
+    return embeds
+
+
+def embed_errors(
+    batch: typing.Iterable[typing.Iterable[Mapping]],
+) -> dict[int, str]:
+    """
+    Validate the embeds of a batch of messages.
+
+    Returns the error of every message with invalid embeds, keyed by the
+    index of the message in the batch. An empty dict means that all
+    messages are valid.
+    """
+    errors = {}
+    for index, embeds in enumerate(batch):
+        try:
+            validate_embeds(embeds)
+        except (ValueError, TypeError, AttributeError) as e:
+            errors[index] = str(e)
+    return errors
@@ -0,0 +1,337 @@
+"""
+Server-side matching of messages against the filter lists.
+
+Instead of downloading every `FilterList` row and running its
+own regexes, the bot sends a message to the API and gets the
+matching filter list entries back. To make that cheap, the
+entries are compiled into an index per filter list type:
+
+- `FILTER_TOKEN` patterns are combined into a single regex, so
+  a message that matches no token is scanned only once;
+- `DOMAIN_NAME` entries are stored in a trie of reversed
+  domain labels, which matches a domain and its subdomains;
+- `GUILD_INVITE` and `FILE_FORMAT` entries are hash sets.
+
+Each worker process keeps its own index. It is refreshed when
+the `updated_at` watermark or the number of rows in the table
+changes, and only the indexes of the types that were changed
+are rebuilt.
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+import re
+import time
+import typing
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.database.models.api.bot import FilterList
+from api.core.database.models.api.bot.filter_list import FILTER_LIST_TYPES
+from api.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+filter_lists = FilterList.__table__
+
+URL_HOST_RE = re.compile(r"https?://(?:[^\s/@]*@)?([^\s/:?#]+)", re.IGNORECASE)
+INVITE_RE = re.compile(
+    r"(?:discord(?:app)?\.com/invite|discord\.gg|discord\.me|discord\.li|discord\.io)"
+    r"/([a-zA-Z0-9\-]+)",
+    re.IGNORECASE,
+)
+
+
+class FilterEntry(typing.NamedTuple):
+    """A single filter list entry, as stored in the index."""
+
+    id: int
+    type: str
+    allowed: bool
+    content: str
+
+
+class FilterMatch(typing.NamedTuple):
+    """A filter list entry together with the value that matched it."""
+
+    entry: FilterEntry
+    value: str
+
+
+class TokenIndex:
+    """
+    All `FILTER_TOKEN` patterns, with a combined regex to rule out a message.
+
+    Patterns without groups are combined into one alternation, so a
+    message without any token is scanned only once. The alternation
+    finds one alternative at each position and no overlapping matches,
+    so once it matches, each of these patterns is searched on its own.
+    Patterns that can't be combined, for instance because they contain
+    groups or backreferences, are always searched separately.
+    """
+
+    def __init__(self, entries: typing.Iterable[FilterEntry]) -> None:
+        self.combinable: list[tuple[typing.Pattern, FilterEntry]] = []
+        self.separate: list[tuple[typing.Pattern, FilterEntry]] = []
+        alternatives = []
+
+        for entry in entries:
+            try:
+                pattern = re.compile(entry.content, re.IGNORECASE)
+            except re.error:
+                log.warning("Ignoring invalid filter token %d.", entry.id)
+                continue
+
+            if pattern.groups:
+                self.separate.append((pattern, entry))
+                continue
+
+            alternative = f"(?:{entry.content})"
+            try:
+                re.compile(alternative)
+            except re.error:
+                self.separate.append((pattern, entry))
+                continue
+
+            self.combinable.append((pattern, entry))
+            alternatives.append(alternative)
+
+        self.combined = (
+            re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        )
+
+    def match(self, content: str) -> typing.Iterator[FilterMatch]:
+        """Yield a match for every token found in the content."""
+        candidates = self.separate
+        if self.combined is not None and self.combined.search(content):
+            candidates = self.combinable + self.separate
+
+        for pattern, entry in candidates:
+            if match := pattern.search(content):
+                yield FilterMatch(entry, match.group())
+
+
+class DomainIndex:
+    """
+    All `DOMAIN_NAME` entries, stored in a trie of reversed domain labels.
+
+    An entry for `example.com` is stored under `com -> example`, which
+    means that `example.com` and all of its subdomains match it, while
+    `notexample.com` does not.
+    """
+
+    # The key of the entry of a node, which can't clash with any label.
+    TERMINAL = object()
+
+    def __init__(self, entries: typing.Iterable[FilterEntry]) -> None:
+        self.root: dict = {}
+
+        for entry in entries:
+            labels = self.normalize(entry.content).split(".")
+            if not all(labels):
+                log.warning("Ignoring filter domain %d with empty labels.", entry.id)
+                continue
+
+            node = self.root
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[self.TERMINAL] = entry
+
+    @staticmethod
+    def normalize(domain: str) -> str:
+        """Strip the scheme, path, and wildcard prefix from a domain entry."""
+        domain = domain.strip().lower()
+        domain = domain.split("://", 1)[-1].split("/", 1)[0]
+        return domain.lstrip("*.").rstrip(".")
+
+    def lookup(self, domain: str) -> typing.Optional[FilterEntry]:
+        """Return the entry matching the domain or one of its parents, if any."""
+        node = self.root
+        for label in reversed(domain.lower().rstrip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                return None
+            if self.TERMINAL in node:
+                return node[self.TERMINAL]
+        return None
+
+    def match(self, content: str) -> typing.Iterator[FilterMatch]:
+        """Yield a match for every URL in the content with a listed domain."""
+        for host in URL_HOST_RE.findall(content):
+            if entry := self.lookup(host):
+                yield FilterMatch(entry, host.lower())
+
+
+class FilterIndex:
+    """The compiled filter list entries of all types."""
+
+    def __init__(self) -> None:
+        self.entries: dict[int, FilterEntry] = {}
+        self.tokens = TokenIndex(())
+        self.domains = DomainIndex(())
+        self.invites: dict[str, FilterEntry] = {}
+        self.file_formats: dict[str, FilterEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def of_type(self, filter_type: str) -> typing.Iterator[FilterEntry]:
+        """Yield all entries of a single filter list type."""
+        return (entry for entry in self.entries.values() if entry.type == filter_type)
+
+    def update(
+        self,
+        changed: typing.Iterable[FilterEntry],
+        deleted: typing.Iterable[int] = (),
+    ) -> set[str]:
+        """
+        Apply changed and deleted entries, rebuilding only the affected types.
+
+        Returns the set of filter list types that were rebuilt.
+        """
+        types = set()
+
+        for entry_id in deleted:
+            if (entry := self.entries.pop(entry_id, None)) is not None:
+                types.add(entry.type)
+
+        for entry in changed:
+            if (previous := self.entries.get(entry.id)) is not None:
+                types.add(previous.type)
+            self.entries[entry.id] = entry
+            types.add(entry.type)
+
+        if "FILTER_TOKEN" in types:
+            self.tokens = TokenIndex(self.of_type("FILTER_TOKEN"))
+        if "DOMAIN_NAME" in types:
+            self.domains = DomainIndex(self.of_type("DOMAIN_NAME"))
+        if "GUILD_INVITE" in types:
+            self.invites = {
+                entry.content.strip(): entry for entry in self.of_type("GUILD_INVITE")
+            }
+        if "FILE_FORMAT" in types:
+            self.file_formats = {
+                "." + entry.content.strip().lower().lstrip("."): entry
+                for entry in self.of_type("FILE_FORMAT")
+            }
+
+        return types.intersection(FILTER_LIST_TYPES)
+
+    def match(
+        self, content: str, filenames: typing.Iterable[str] = ()
+    ) -> list[FilterMatch]:
+        """Return the matches of a message and its attachments, one per entry."""
+        matches = {}
+
+        for match in self.tokens.match(content):
+            matches.setdefault(match.entry.id, match)
+
+        for match in self.domains.match(content):
+            matches.setdefault(match.entry.id, match)
+
+        for code in INVITE_RE.findall(content):
+            if (entry := self.invites.get(code)) is not None:
+                matches.setdefault(entry.id, FilterMatch(entry, code))
+
+        for filename in filenames:
+            extension = os.path.splitext(filename)[1].lower()
+            if (entry := self.file_formats.get(extension)) is not None:
+                matches.setdefault(entry.id, FilterMatch(entry, extension))
+
+        return list(matches.values())
+
+
+class FilterMatcher:
+    """
+    The filter index of this worker process, refreshed from the database.
+
+    The database is checked for changes at most once per
+    `filter_lists_refresh_interval` seconds.
+    """
+
+    def __init__(self) -> None:
+        self.index = FilterIndex()
+        self._watermark: typing.Optional[datetime.datetime] = None
+        self._checked_at: typing.Optional[float] = None
+        self._lock: typing.Optional[asyncio.Lock] = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at
+            < settings.filter_lists_refresh_interval
+        )
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Apply the filter list rows that changed since the last refresh."""
+        if self._is_fresh():
+            return
+
+        # The lock is created here, so it belongs to the running event loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._is_fresh():
+                return
+
+            watermark, count = (
+                await session.execute(
+                    select(func.max(filter_lists.c.updated_at), func.count())
+                )
+            ).one()
+
+            if watermark != self._watermark or count != len(self.index):
+                await self._apply_changes(session, watermark, count)
+
+            self._checked_at = time.monotonic()
+
+    async def _apply_changes(
+        self,
+        session: AsyncSession,
+        watermark: typing.Optional[datetime.datetime],
+        count: int,
+    ) -> None:
+        rows = select(
+            filter_lists.c.id,
+            filter_lists.c.type,
+            filter_lists.c.allowed,
+            filter_lists.c.content,
+        )
+        query = rows
+        if self._watermark is not None:
+            # Rows written in the same instant as the previous watermark may
+            # not have been committed at the time, so they are fetched again.
+            query = query.where(filter_lists.c.updated_at >= self._watermark)
+
+        changed = [FilterEntry(*row) for row in await session.execute(query)]
+        known = self.index.entries.keys() | {entry.id for entry in changed}
+
+        deleted = set()
+        if len(known) != count:
+            existing = set(await session.scalars(select(filter_lists.c.id)))
+            deleted = known - existing
+            # Rows committed after a later watermark, with an earlier
+            # `updated_at` set by their writer, are fetched by their id.
+            if missing := existing - known:
+                result = await session.execute(
+                    rows.where(filter_lists.c.id.in_(missing))
+                )
+                changed += [FilterEntry(*row) for row in result]
+
+        rebuilt = self.index.update(changed, deleted)
+        self._watermark = watermark
+        log.debug("Rebuilt the filter index for %s.", ", ".join(sorted(rebuilt)))
+
+    async def match(
+        self, session: AsyncSession, content: str, filenames: typing.Iterable[str]
+    ) -> list[FilterMatch]:
+        """Refresh the index if needed and match a message against it."""
+        await self.refresh(session)
+        return self.index.match(content, filenames)
+
+
+filter_matcher = FilterMatcher()
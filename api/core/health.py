@@ -0,0 +1,123 @@
+"""
+Readiness checks of a worker process.
+
+A worker is ready to receive traffic when:
+
+- its connection pool has a connection to spare;
+- the database is reachable;
+- the database has been migrated to the alembic head this code
+  was written for.
+
+The pool is checked on every probe, since that costs nothing and
+a saturated pool should take the worker out of rotation right
+away. The database checks cost a query, so their result is
+cached for `readiness_cache_ttl` seconds, and probes in between
+never reach the database.
+"""
+
+import asyncio
+import functools
+import logging
+import pathlib
+import time
+import typing
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+
+from api.core.database import engine
+from api.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+ALEMBIC_DIRECTORY = pathlib.Path(__file__).parents[2] / "alembic"
+
+
+@functools.lru_cache(maxsize=None)
+def expected_revision() -> typing.Optional[str]:
+    """Return the alembic head revision of this code."""
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIRECTORY))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def pool_available() -> bool:
+    """Return whether the pool of this worker could hand out a connection now."""
+    pool = engine.get_engine().sync_engine.pool
+    # A negative overflow means that the number of connections is unlimited.
+    if not isinstance(pool, QueuePool) or settings.database_max_overflow < 0:
+        return True
+    return pool.checkedout() < pool.size() + settings.database_max_overflow
+
+
+class DatabaseCheck(typing.NamedTuple):
+    """The result of checking the database."""
+
+    database: bool
+    migrations: bool
+
+
+class ReadinessCheck:
+    """The cached database checks of this worker process."""
+
+    def __init__(self) -> None:
+        self._result: typing.Optional[DatabaseCheck] = None
+        self._checked_at: typing.Optional[float] = None
+        self._lock: typing.Optional[asyncio.Lock] = None
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < settings.readiness_cache_ttl
+        )
+
+    @staticmethod
+    async def _query_revision() -> typing.Optional[str]:
+        async with engine.get_engine().connect() as connection:
+            return await connection.scalar(
+                text("SELECT version_num FROM alembic_version")
+            )
+
+    async def _check_database(self) -> DatabaseCheck:
+        try:
+            revision = await asyncio.wait_for(
+                self._query_revision(), settings.readiness_timeout
+            )
+        except (OSError, asyncio.TimeoutError, SQLAlchemyError):
+            log.exception("The readiness check could not query the database.")
+            return DatabaseCheck(database=False, migrations=False)
+
+        return DatabaseCheck(database=True, migrations=revision == expected_revision())
+
+    async def check_database(self) -> DatabaseCheck:
+        """Return the cached result of the database checks, checking if needed."""
+        if self._is_fresh():
+            return self._result
+
+        # The lock is created here, so it belongs to the running event loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._is_fresh():
+                self._result = await self._check_database()
+                self._checked_at = time.monotonic()
+        return self._result
+
+    async def check(self) -> dict[str, bool]:
+        """Run all checks and return their results."""
+        pool = pool_available()
+        if pool:
+            database = await self.check_database()
+        else:
+            # Checking the database would only wait for a connection as well.
+            database = self._result or DatabaseCheck(database=False, migrations=False)
+
+        checks = {"pool": pool, **database._asdict()}
+        return {"ready": all(checks.values()), **checks}
+
+
+readiness_check = ReadinessCheck()
@@ -0,0 +1,219 @@
+"""
+Scheduling of the expiry of temporary infractions.
+
+Instead of polling for expired mutes and bans, the bot long-polls
+the API, which answers as soon as an infraction expires. Each
+worker process keeps the active infractions that expire in a
+heap ordered by their expiry, loaded lazily from the database.
+
+Endpoints that apply, edit or pardon infractions call
+`notify_expiry` in their transaction, and every worker listening
+on `EXPIRY_CHANNEL` updates its heap once the transaction has
+been committed. If the listener loses its connection, the heap
+is loaded from the database again.
+
+An infraction that was handed out as expired stays scheduled
+and is handed out again after `REDELIVERY_DELAY` seconds, until
+it is no longer active. This way an expiry is never lost if the
+client fails before deactivating the infraction.
+"""
+
+import asyncio
+import datetime
+import heapq
+import time
+import typing
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.database.models.api.bot import Infraction
+from api.core.database.notifications import listener, notify
+
+EXPIRY_CHANNEL = "api_infraction_expiry"
+
+# The delay in seconds before an expired infraction is handed out again.
+REDELIVERY_DELAY = 60.0
+
+infractions = Infraction.__table__
+
+
+def expiry_payload(
+    infraction_id: int, expires_at: typing.Optional[datetime.datetime]
+) -> str:
+    """Encode the new expiry of an infraction as a notification payload."""
+    return f"{infraction_id}:{expires_at.isoformat() if expires_at else ''}"
+
+
+async def notify_expiry(
+    session: AsyncSession,
+    infraction_id: int,
+    expires_at: typing.Optional[datetime.datetime],
+) -> None:
+    """
+    Reschedule an infraction in every worker once the session commits.
+
+    `expires_at` must be `None` if the infraction is no longer active
+    or doesn't expire.
+    """
+    await notify(session, EXPIRY_CHANNEL, expiry_payload(infraction_id, expires_at))
+
+
+class ExpiryScheduler:
+    """The expiring active infractions of this worker, ordered by expiry."""
+
+    def __init__(self) -> None:
+        # Entries of the heap are only removed once they are popped, so an
+        # entry is stale unless it matches the expiry in `_expiries`.
+        self._heap: list[tuple[float, int]] = []
+        self._expiries: dict[int, float] = {}
+        self._loaded = False
+        # The notifications received while the schedule is being loaded.
+        self._replay: typing.Optional[list[str]] = None
+        self._lock: typing.Optional[asyncio.Lock] = None
+        self._changed: typing.Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the schedule is in sync with the database."""
+        return self._loaded
+
+    def _wake(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+
+    def schedule(self, infraction_id: int, expires_at: float) -> None:
+        """Schedule an infraction to expire at a UNIX timestamp."""
+        self._expiries[infraction_id] = expires_at
+        heapq.heappush(self._heap, (expires_at, infraction_id))
+        self._wake()
+
+    def cancel(self, infraction_id: int) -> None:
+        """Stop scheduling an infraction, if it is scheduled."""
+        self._expiries.pop(infraction_id, None)
+
+    def next_expiry(self) -> typing.Optional[float]:
+        """Return the earliest scheduled expiry, dropping stale entries."""
+        while self._heap:
+            expires_at, infraction_id = self._heap[0]
+            if self._expiries.get(infraction_id) == expires_at:
+                return expires_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: typing.Optional[float] = None) -> list[int]:
+        """
+        Return the infractions that are due, in order of expiry.
+
+        Every due infraction is rescheduled `REDELIVERY_DELAY` seconds
+        from now, until it is cancelled.
+        """
+        if now is None:
+            now = time.time()
+
+        due = []
+        while (expires_at := self.next_expiry()) is not None and expires_at <= now:
+            _, infraction_id = heapq.heappop(self._heap)
+            due.append(infraction_id)
+
+        for infraction_id in due:
+            self.schedule(infraction_id, now + REDELIVERY_DELAY)
+        return due
+
+    def on_notification(self, payload: typing.Optional[str]) -> None:
+        """Apply a notification, or resynchronize if the payload is `None`."""
+        if payload is None:
+            self._loaded = False
+            self._wake()
+            return
+
+        if self._replay is not None:
+            self._replay.append(payload)
+        self._apply(payload)
+
+    def _apply(self, payload: str) -> None:
+        infraction_id, _, expires_at = payload.partition(":")
+        if expires_at:
+            self.schedule(
+                int(infraction_id),
+                datetime.datetime.fromisoformat(expires_at).timestamp(),
+            )
+        else:
+            self.cancel(int(infraction_id))
+
+    async def load(self, session: AsyncSession) -> None:
+        """Load the schedule from the database, unless it is in sync already."""
+        if self._loaded:
+            return
+
+        # The lock is created here, so it belongs to the running event loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._loaded:
+                return
+
+            # Set first, so a resynchronization during the load isn't lost.
+            self._loaded = True
+            # Notifications during the query may or may not be reflected in
+            # its result, so they are applied to the loaded schedule again.
+            self._replay = replay = []
+            try:
+                result = await session.execute(
+                    select(infractions.c.id, infractions.c.expires_at).where(
+                        infractions.c.active, infractions.c.expires_at.is_not(None)
+                    )
+                )
+            except BaseException:
+                # Nothing was loaded, so the next call has to try again.
+                self._loaded = False
+                raise
+            finally:
+                self._replay = None
+
+            self._expiries = {
+                infraction_id: expires_at.timestamp()
+                for infraction_id, expires_at in result
+            }
+            self._heap = [
+                (expires_at, id_) for id_, expires_at in self._expiries.items()
+            ]
+            heapq.heapify(self._heap)
+            for payload in replay:
+                self._apply(payload)
+
+    async def wait_due(self, timeout: float) -> list[int]:
+        """
+        Wait up to `timeout` seconds for infractions to become due.
+
+        Returns early with an empty list if the schedule has to be loaded.
+        """
+        if self._changed is None:
+            self._changed = asyncio.Event()
+
+        deadline = time.monotonic() + timeout
+        while self._loaded:
+            if due := self.pop_due():
+                return due
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if (expires_at := self.next_expiry()) is not None:
+                remaining = min(remaining, max(expires_at - time.time(), 0))
+
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+        return []
+
+
+expiry_scheduler = ExpiryScheduler()
+listener.subscribe(EXPIRY_CHANNEL, expiry_scheduler.on_notification)
@@ -0,0 +1,180 @@
+"""
+Prometheus metrics of the API.
+
+Every worker process records its own metrics:
+
+- the duration of every request, by method, route and status;
+- the number of requests in progress;
+- the number of queries and the time spent in them, per request;
+- the connections checked out of its database pool, and how many
+  of them are overflow connections beyond the size of the pool.
+
+Requests are measured by `MetricsMiddleware`, and the database
+metrics by the event listeners `instrument_engine` registers on
+the engine of the worker.
+
+Gunicorn runs several workers, so the metrics of all of them are
+written to the directory in `PROMETHEUS_MULTIPROC_DIR`, which is
+set up in `gunicorn.conf.py`, and `render_metrics` aggregates
+them. Without that variable, as in development, only the metrics
+of the current process are rendered.
+"""
+
+import collections
+import contextvars
+import os
+import re
+import time
+import typing
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool, QueuePool
+
+METRICS_MEDIA_TYPE = CONTENT_TYPE_LATEST
+
+REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "Time spent handling requests.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "api_requests_in_progress",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_QUERIES = Histogram(
+    "api_request_queries",
+    "Database queries executed per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+REQUEST_QUERY_DURATION = Histogram(
+    "api_request_query_duration_seconds",
+    "Time spent executing database queries per request.",
+    ["route"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "api_db_pool_checked_out",
+    "Database connections checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "api_db_pool_overflow",
+    "Database connections opened beyond the size of the pool.",
+    multiprocess_mode="livesum",
+)
+
+
+# Bind parameters in the `numeric_dollar`, `format` and `pyformat` styles,
+# including the lists of parameters rendered for expanding `IN` clauses.
+_PARAMETER = r"(?:\$\d+|%s|%\(\w+\)s)"
+PARAMETERS_RE = re.compile(rf"{_PARAMETER}(?:\s*,\s*{_PARAMETER})*")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse the parameters of a statement, so executions of it compare equal."""
+    return PARAMETERS_RE.sub("?", statement)
+
+
+class QueryStats:
+    """
+    The queries executed while handling a single request.
+
+    Only the number and total duration of queries are recorded, unless
+    statements are inspected, see `api.core.middleware.query_inspection`.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        # The executions and the longest duration of each normalized statement.
+        self.statements: typing.Optional[collections.Counter[str]] = None
+        self.longest: dict[str, float] = {}
+
+    def inspect_statements(self) -> None:
+        """Start recording the executed statements as well."""
+        if self.statements is None:
+            self.statements = collections.Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record an executed query."""
+        self.count += 1
+        self.duration += duration
+
+        if self.statements is not None:
+            statement = normalize_statement(statement)
+            self.statements[statement] += 1
+            self.longest[statement] = max(self.longest.get(statement, 0.0), duration)
+
+
+# The query stats of the request that is currently handled, if any.
+query_stats: contextvars.ContextVar[
+    typing.Optional[QueryStats]
+] = contextvars.ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn: Connection, *_args: object) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection, _cursor: object, statement: str, *_args: object
+) -> None:
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    if (stats := query_stats.get()) is not None:
+        stats.record(statement, duration)
+
+
+class PoolMonitor:
+    """Tracks the connections checked out of a pool through its events."""
+
+    def __init__(self, pool: Pool) -> None:
+        # Pools without a fixed size, like `NullPool`, only have overflow.
+        self.size = pool.size() if isinstance(pool, QueuePool) else 0
+        self.checked_out = 0
+        event.listen(pool, "checkout", self.on_checkout)
+        event.listen(pool, "checkin", self.on_checkin)
+
+    def _update(self) -> None:
+        POOL_CHECKED_OUT.set(self.checked_out)
+        POOL_OVERFLOW.set(max(self.checked_out - self.size, 0))
+
+    def on_checkout(self, *_args: object) -> None:
+        """Count a connection that was checked out."""
+        self.checked_out += 1
+        self._update()
+
+    def on_checkin(self, *_args: object) -> None:
+        """Count a connection that was returned."""
+        self.checked_out -= 1
+        self._update()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Record the query and pool metrics of an engine."""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    PoolMonitor(sync_engine.pool)
+
+
+def render_metrics() -> bytes:
+    """Render the metrics of all workers in the Prometheus text format."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest(REGISTRY)
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return generate_latest(registry)
@@ -1,3 +1,10 @@
 """Custom middleware for the Python Discord API."""
 
-from .token_authentication import TokenAuthentication, on_auth_error
+from .compression import CompressionMiddleware, skip_compression
+from .metrics import MetricsMiddleware
+from .query_inspection import QueryInspectionMiddleware
+from .token_authentication import (
+    TokenAuthentication,
+    TokenAuthenticationMiddleware,
+    on_auth_error,
+)
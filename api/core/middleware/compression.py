@@ -0,0 +1,227 @@
+"""
+Middleware for compressing responses.
+
+The encoding is negotiated from the `Accept-Encoding` header of
+the request. Brotli is preferred if the `brotli` package is
+installed, gzip is used otherwise.
+
+Response bodies are buffered until they reach the minimum size.
+Responses that end before that, like most single-object and
+health-check responses, are sent as they are, because compressing
+them costs more time than it saves. Streamed responses are
+compressed chunk by chunk, and every compressed chunk is flushed,
+so clients still receive rows as soon as they are streamed.
+
+A compressed response is a different representation, so its strong
+`ETag`, if any, is made weak. Routes can opt out with the
+`skip_compression` decorator. Server sent events and responses
+that already have a `Content-Encoding` are never compressed.
+"""
+
+import typing
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.settings import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EndpointT = typing.TypeVar("EndpointT", bound=typing.Callable)
+
+GZIP_LEVEL = 6
+# Higher qualities compress little better, but many times slower.
+BROTLI_QUALITY = 4
+
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+_uncompressed_endpoints: set[typing.Callable] = set()
+
+
+def skip_compression(endpoint: EndpointT) -> EndpointT:
+    """Never compress the responses of a route."""
+    _uncompressed_endpoints.add(endpoint)
+    return endpoint
+
+
+class GzipEncoder:
+    """Compresses a response body with gzip."""
+
+    name = "gzip"
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(
+            GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush a chunk of the body."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        """Return the end of the compressed body."""
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Compresses a response body with brotli."""
+
+    name = "br"
+
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress and flush a chunk of the body."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        """Return the end of the compressed body."""
+        return self._compressor.finish()
+
+
+Encoder = typing.Union[GzipEncoder, BrotliEncoder]
+
+# Supported encoders, from most to least preferred.
+ENCODERS: dict[str, type[Encoder]] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS = {"br": BrotliEncoder, **ENCODERS}
+
+
+def negotiate_encoding(accept_encoding: str) -> typing.Optional[str]:
+    """Return the preferred supported encoding accepted by the client, if any."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        qualities[coding] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in ENCODERS:
+        if (quality := qualities.get(name, wildcard)) > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses that are larger than `minimum_size` bytes."""
+
+    def __init__(self, app: ASGIApp, minimum_size: typing.Optional[int] = None) -> None:
+        self.app = app
+        if minimum_size is None:
+            minimum_size = settings.compression_minimum_size
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compress the response of an HTTP request, if it is eligible."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(
+            self.app, ENCODERS[encoding](), self.minimum_size
+        )
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    """Compresses a single response, once its body reaches the minimum size."""
+
+    def __init__(self, app: ASGIApp, encoder: Encoder, minimum_size: int) -> None:
+        self.app = app
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.send: Send
+        self.scope: Scope
+        self.start_message: typing.Optional[Message] = None
+        self.buffer: list[bytes] = []
+        self.buffered = 0
+        # None until it is decided whether the response is compressed.
+        self.compressing: typing.Optional[bool] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the app, compressing its response on the way out."""
+        self.scope = scope
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _is_eligible(self, start_message: Message) -> bool:
+        headers = Headers(raw=start_message["headers"])
+        media_type = headers.get("Content-Type", "").partition(";")[0].strip()
+        return (
+            "Content-Encoding" not in headers
+            and media_type not in UNCOMPRESSED_MEDIA_TYPES
+            and self.scope.get("endpoint") not in _uncompressed_endpoints
+        )
+
+    async def _start(self, compress: bool) -> None:
+        self.compressing = compress
+        if compress:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoder.name
+            headers.add_vary_header("Accept-Encoding")
+            # A strong ETag identifies the uncompressed representation only.
+            etag = headers.get("ETag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if "Content-Length" in headers:
+                del headers["Content-Length"]
+        await self.send(self.start_message)
+
+    async def send_compressed(self, message: Message) -> None:
+        """Buffer, compress or pass through a message of the response."""
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            if not self._is_eligible(message):
+                await self._start(compress=False)
+            return
+
+        if message["type"] != "http.response.body" or self.compressing is False:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressing is None:
+            self.buffer.append(body)
+            self.buffered += len(body)
+            if self.buffered < self.minimum_size:
+                if more_body:
+                    return
+                # The whole body is smaller than the minimum size.
+                await self._start(compress=False)
+                await self.send(
+                    {"type": "http.response.body", "body": b"".join(self.buffer)}
+                )
+                return
+
+            await self._start(compress=True)
+            body = b"".join(self.buffer)
+            self.buffer.clear()
+
+        compressed = self.encoder.compress(body)
+        if not more_body:
+            compressed += self.encoder.finish()
+        await self.send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
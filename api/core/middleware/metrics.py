@@ -0,0 +1,74 @@
+"""Middleware measuring requests for the metrics in `api.core.metrics`."""
+
+import time
+import typing
+
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.metrics import (
+    QueryStats,
+    REQUESTS_IN_PROGRESS,
+    REQUEST_DURATION,
+    REQUEST_QUERIES,
+    REQUEST_QUERY_DURATION,
+    query_stats,
+)
+
+# The route label of requests that didn't match any route, so that
+# requests for random paths can't create new time series.
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Measure the duration and the queries of every HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._routes: typing.Optional[dict[typing.Callable, str]] = None
+
+    def route_template(self, scope: Scope) -> str:
+        """Return the path template of the route that handled a request."""
+        # Routes can't change once the app serves requests, so they are
+        # collected once, on the first request.
+        if self._routes is None:
+            routes: typing.Iterable[BaseRoute] = scope["app"].routes
+            self._routes = {
+                route.endpoint: route.path
+                for route in routes
+                if hasattr(route, "endpoint") and hasattr(route, "path")
+            }
+        return self._routes.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, recording its metrics afterwards."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(scope["method"])
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            query_stats.reset(token)
+
+            route = self.route_template(scope)
+            REQUEST_DURATION.labels(scope["method"], route, str(status)).observe(
+                duration
+            )
+            REQUEST_QUERIES.labels(route).observe(stats.count)
+            REQUEST_QUERY_DURATION.labels(route).observe(stats.duration)
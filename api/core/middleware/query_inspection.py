@@ -0,0 +1,96 @@
+"""
+Middleware detecting requests that run too many or too slow queries.
+
+Lazy-loaded relationships make it easy to run one query per row
+of a result by accident. When `query_inspection` is enabled, or
+in DEBUG mode, this middleware records every statement a request
+executes, grouped by the statement with its parameters collapsed,
+and logs a warning for requests that:
+
+- execute more than `query_inspection_max_queries` statements;
+- execute the same statement more than `query_inspection_max_repeats`
+  times, which is the signature of an N+1 query;
+- execute a statement that took longer than `slow_query_threshold`.
+
+In DEBUG mode, the number of queries is also sent in the
+`X-Query-Count` header of every response.
+"""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.metrics import QueryStats, query_stats
+from api.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+# The maximum length of a statement in a log message.
+MAX_STATEMENT_LENGTH = 200
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_STATEMENT_LENGTH:
+        return statement[: MAX_STATEMENT_LENGTH - 3] + "..."
+    return statement
+
+
+def query_problems(stats: QueryStats) -> list[str]:
+    """Describe every threshold the queries of a request went over."""
+    problems = []
+
+    if stats.count > settings.query_inspection_max_queries:
+        problems.append(f"{stats.count} queries")
+
+    for statement, executions in stats.statements.most_common():
+        if executions <= settings.query_inspection_max_repeats:
+            break
+        problems.append(f"{executions} executions of {_shorten(statement)}")
+
+    for statement, duration in stats.longest.items():
+        if duration > settings.slow_query_threshold:
+            problems.append(f"{duration:.3f}s for {_shorten(statement)}")
+
+    return problems
+
+
+class QueryInspectionMiddleware:
+    """Log requests whose queries go over the configured thresholds."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle a request, inspecting the queries it executes."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Share the stats of the metrics middleware, if it created any.
+        stats = query_stats.get()
+        token = None
+        if stats is None:
+            stats = QueryStats()
+            token = query_stats.set(stats)
+        stats.inspect_statements()
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            if token is not None:
+                query_stats.reset(token)
+
+            if problems := query_problems(stats):
+                log.warning(
+                    "%s %s: %s", scope["method"], scope["path"], "; ".join(problems)
+                )
@@ -1,4 +1,23 @@
-"""Middleware for Bearer token authentication."""
+"""
+Middleware for Bearer token authentication.
+
+Every client has its own token with its own scopes. The token in
+`auth_token` has full access, additional tokens with limited scopes
+are configured in `auth_tokens`.
+
+The credentials of every token are built once, and the header of a
+request is compared with the digests of all tokens in constant time,
+so the response time reveals nothing about the expected tokens.
+
+Every request pays for authentication, so `TokenAuthenticationMiddleware`
+is a plain ASGI middleware: it reads the header straight from the scope,
+never builds a `Request`, and sends pre-encoded error responses.
+"""
+
+import hashlib
+import hmac
+import json
+import typing
 
 from starlette.authentication import (
     AuthCredentials,
@@ -6,43 +25,190 @@ from starlette.authentication import (
     AuthenticationError,
     SimpleUser,
 )
-from starlette.requests import Request
+from starlette.requests import HTTPConnection, Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from api.core.settings import settings
+from api.core.settings import ScopedToken, settings
 
 NO_AUTHORIZATION_HEADER = "no `Authorization` header in request."
 INVALID_CREDENTIALS = "invalid credentials."
+INSUFFICIENT_SCOPE = "insufficient scope."
 NO_AUTH_DEBUG_ENDPOINTS = ("/docs", "/openapi.json")
+# The probes of the orchestrator, which don't reveal anything.
+NO_AUTH_ENDPOINTS = ("/health/live", "/health/ready")
+
+FULL_ACCESS_SCOPE = "authenticated"
+READ_SCOPE = "read"
+METRICS_SCOPE = "metrics"
+METRICS_ENDPOINT = "/metrics"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class Identity(typing.NamedTuple):
+    """The credentials and user of an authenticated client."""
+
+    credentials: AuthCredentials
+    user: SimpleUser
+
+    @classmethod
+    def build(cls, name: str, scopes: typing.Iterable[str]) -> "Identity":
+        """Build the identity of a client with the given scopes."""
+        return cls(AuthCredentials(scopes=list(scopes)), SimpleUser(username=name))
+
+    def allows(self, method: typing.Optional[str], path: str) -> bool:
+        """Return whether the scopes of the client allow a request."""
+        scopes = self.credentials.scopes
+        if FULL_ACCESS_SCOPE in scopes:
+            return True
+        if method not in SAFE_METHODS:
+            return False
+        return READ_SCOPE in scopes or (
+            METRICS_SCOPE in scopes and path == METRICS_ENDPOINT
+        )
+
+
+DEBUG_IDENTITY = Identity.build("api_client", ["debug"])
+PROBE_IDENTITY = Identity.build("probe", ["probe"])
+
+
+def header_digest(authorization_header: bytes) -> bytes:
+    """Hash an Authorization header, so all digests have the same length."""
+    return hashlib.sha256(authorization_header).digest()
 
 
 class TokenAuthentication(AuthenticationBackend):
-    """Simple token authentication."""
+    """Token authentication with a set of scoped tokens."""
 
-    def __init__(self, token: str) -> None:
-        self.expected_auth_header = f"Bearer {token}"
+    def __init__(
+        self, token: str, scoped_tokens: typing.Iterable[ScopedToken] = ()
+    ) -> None:
+        identities = [(token, Identity.build("api_client", [FULL_ACCESS_SCOPE]))]
+        identities += [
+            (scoped.token, Identity.build(scoped.name, scoped.scopes))
+            for scoped in scoped_tokens
+        ]
+        self.identities = tuple(
+            (header_digest(f"Bearer {secret}".encode()), identity)
+            for secret, identity in identities
+        )
 
-    async def authenticate(
-        self, request: Request
-    ) -> tuple[AuthCredentials, SimpleUser]:
-        """Authenticate the request based on the Authorization header."""
-        if settings.DEBUG and request.url.path.startswith(NO_AUTH_DEBUG_ENDPOINTS):
-            credentials = AuthCredentials(scopes=["debug"])
-            user = SimpleUser(username="api_client")
-            return credentials, user
+    def identify(self, authorization_header: bytes) -> typing.Optional[Identity]:
+        """Return the identity of the token in an Authorization header, if any."""
+        digest = header_digest(authorization_header)
+        match = None
+        # Compare with every token, so the time taken doesn't depend on a match.
+        for expected_digest, identity in self.identities:
+            if hmac.compare_digest(digest, expected_digest):
+                match = identity
+        return match
 
-        authorization_header = request.headers.get("Authorization")
+    def resolve(
+        self,
+        path: str,
+        method: typing.Optional[str],
+        authorization_header: typing.Optional[bytes],
+    ) -> Identity:
+        """
+        Return the identity of the client of a request, or raise an error.
+
+        Connections other than HTTP requests have no method, so they are
+        only allowed with full access.
+        """
+        if settings.DEBUG and path.startswith(NO_AUTH_DEBUG_ENDPOINTS):
+            return DEBUG_IDENTITY
+
+        if path in NO_AUTH_ENDPOINTS:
+            return PROBE_IDENTITY
 
         if not authorization_header:
             raise AuthenticationError(NO_AUTHORIZATION_HEADER)
 
-        if authorization_header != self.expected_auth_header:
+        identity = self.identify(authorization_header)
+        if identity is None:
             raise AuthenticationError(INVALID_CREDENTIALS)
 
-        credentials = AuthCredentials(scopes=["authenticated"])
-        user = SimpleUser(username="api_client")
+        if not identity.allows(method, path):
+            raise AuthenticationError(INSUFFICIENT_SCOPE)
+
+        return identity
+
+    async def authenticate(
+        self, request: HTTPConnection
+    ) -> tuple[AuthCredentials, SimpleUser]:
+        """Authenticate the request based on the Authorization header."""
+        authorization_header = request.headers.get("Authorization")
+        return self.resolve(
+            request.url.path,
+            request.scope.get("method"),
+            authorization_header.encode() if authorization_header else None,
+        )
+
+
+def encode_error(message: str) -> bytes:
+    """Encode an authentication error message like `on_auth_error` does."""
+    return json.dumps({"error": message}, separators=(",", ":")).encode()
+
+
+ERROR_BODIES = {
+    message: encode_error(message)
+    for message in (NO_AUTHORIZATION_HEADER, INVALID_CREDENTIALS, INSUFFICIENT_SCOPE)
+}
+
+
+class TokenAuthenticationMiddleware:
+    """
+    Authenticate every request with a `TokenAuthentication` back-end.
+
+    Like Starlette's `AuthenticationMiddleware`, this sets the `auth` and
+    `user` of the scope, and refuses unauthenticated requests with a 403.
+    """
+
+    def __init__(self, app: ASGIApp, backend: TokenAuthentication) -> None:
+        self.app = app
+        self.backend = backend
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Authenticate a request before handing it to the app."""
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        authorization_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization_header = value
+                break
+
+        try:
+            scope["auth"], scope["user"] = self.backend.resolve(
+                scope["path"], scope.get("method"), authorization_header
+            )
+        except AuthenticationError as exc:
+            await self.refuse(scope, send, str(exc))
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def refuse(scope: Scope, send: Send, message: str) -> None:
+        """Send the pre-encoded response of an authentication error."""
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1000})
+            return
 
-        return credentials, user
+        body = ERROR_BODIES.get(message) or encode_error(message)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 403,
+                "headers": [
+                    (b"content-length", str(len(body)).encode()),
+                    (b"content-type", b"application/json"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
 
 
 def on_auth_error(_request: Request, exc: Exception) -> JSONResponse:
@@ -0,0 +1,88 @@
+"""
+Keyset pagination for list endpoints.
+
+All of our large tables have a monotonically increasing key,
+like the Discord snowflake of a message or the serial id of
+an infraction. Instead of skipping rows with `OFFSET`, which
+gets slower the deeper a client pages, a page is selected
+with `WHERE key > :cursor ORDER BY key LIMIT n`. That is a
+single index range scan, so every page costs the same.
+
+The cursor is handed to clients as an opaque token, which
+means that its encoding may change without breaking them.
+"""
+
+import base64
+import typing
+
+from fastapi import HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+INVALID_CURSOR = "invalid pagination cursor."
+
+
+def encode_cursor(key: int) -> str:
+    """Encode the key of the last row on a page as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(key).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor back into a key, raising ValueError if it is invalid."""
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(cursor + padding).decode())
+    except ValueError as e:
+        raise ValueError(INVALID_CURSOR) from e
+
+
+class Pagination:
+    """
+    The page requested by a client, used as a FastAPI dependency.
+
+    A list endpoint builds its filtered query as usual and passes it
+    to `paginate`, which restricts it to the requested page.
+    """
+
+    def __init__(
+        self,
+        cursor: typing.Optional[str] = Query(
+            None, description="The `next_cursor` of the previous page."
+        ),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ) -> None:
+        try:
+            self.after = decode_cursor(cursor) if cursor is not None else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=INVALID_CURSOR) from e
+        self.limit = limit
+
+    def apply(self, query: Select, key: ColumnElement) -> Select:
+        """
+        Restrict a query to the rows of this page.
+
+        One row more than the limit is selected, which tells
+        us whether there is a next page without counting.
+        """
+        if self.after is not None:
+            query = query.where(key > self.after)
+        return query.order_by(key).limit(self.limit + 1)
+
+    def page(self, rows: typing.Sequence[typing.Mapping], key: str) -> dict:
+        """Build the page envelope from the rows selected by `apply`."""
+        items = rows[: self.limit]
+        next_cursor = None
+        if len(rows) > self.limit:
+            next_cursor = encode_cursor(items[-1][key])
+        return {"items": items, "next_cursor": next_cursor}
+
+
+async def paginate(
+    session: AsyncSession, query: Select, key: ColumnElement, pagination: Pagination
+) -> dict:
+    """Execute a query for the requested page and return the page envelope."""
+    result = await session.execute(pagination.apply(query, key))
+    return pagination.page(result.mappings().all(), key.name)
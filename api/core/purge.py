@@ -0,0 +1,188 @@
+"""
+Purging of overdue offensive messages and old changes.
+
+The bot deletes an offensive message from Discord on its delete
+date and then deletes its row through the API. If that never
+happens, for instance because the message was already gone, the
+row would stay around forever. This module removes such rows
+once they are overdue by a grace period.
+
+Every write to a table tracked by the change feed adds a change,
+so changes are purged as well once they are older than the
+retention period of the feed, see `api.core.change_feed`.
+
+Rows are deleted in bounded batches, each in its own short
+transaction, so the purge never holds locks on a large part of
+the table. The purge runs as a background task of the app, but
+can also be run on its own with `python -m api.core.purge`.
+"""
+
+import asyncio
+import datetime
+import logging
+import typing
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import Executable
+
+from api.core.database import engine
+from api.core.database.models.api.bot import Change, OffensiveMessage
+from api.core.settings import settings
+
+log = logging.getLogger(__name__)
+
+changes = Change.__table__
+offensive_messages = OffensiveMessage.__table__
+
+_task: typing.Optional[asyncio.Task] = None
+
+
+def purge_statement(batch_size: int, grace: datetime.timedelta) -> Executable:
+    """
+    Build a statement deleting a single batch of overdue offensive messages.
+
+    The batch is selected through the index on the delete date, and rows
+    locked by another purge or by a client are skipped.
+    """
+    overdue = (
+        select(offensive_messages.c.id)
+        .where(offensive_messages.c.delete_date <= func.now() - grace)
+        .order_by(offensive_messages.c.delete_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(offensive_messages).where(
+        offensive_messages.c.id.in_(overdue.scalar_subquery())
+    )
+
+
+def change_purge_statement(
+    batch_size: int, retention: datetime.timedelta
+) -> Executable:
+    """
+    Build a statement deleting a single batch of changes older than `retention`.
+
+    The oldest changes come first by id, so the batch is selected through
+    the primary key. The latest change is always kept, which lets the change
+    feed tell a purged change apart from an empty feed.
+    """
+    latest = select(func.max(changes.c.id)).scalar_subquery()
+    old = (
+        select(changes.c.id)
+        .where(changes.c.created_at <= func.now() - retention, changes.c.id < latest)
+        .order_by(changes.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return delete(changes).where(changes.c.id.in_(old.scalar_subquery()))
+
+
+async def delete_in_batches(
+    session_factory: sessionmaker, statement: Executable, batch_size: int
+) -> int:
+    """Run a batched delete until a batch isn't full, and return the total."""
+    total = 0
+
+    while True:
+        async with session_factory() as session:
+            result = await session.execute(statement)
+            await session.commit()
+
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+async def purge_overdue(
+    session_factory: sessionmaker,
+    batch_size: typing.Optional[int] = None,
+    grace: typing.Optional[datetime.timedelta] = None,
+) -> int:
+    """Delete all overdue offensive messages and return how many were deleted."""
+    if batch_size is None:
+        batch_size = settings.offensive_messages_purge_batch_size
+    if grace is None:
+        grace = datetime.timedelta(seconds=settings.offensive_messages_purge_grace)
+
+    statement = purge_statement(batch_size, grace)
+    return await delete_in_batches(session_factory, statement, batch_size)
+
+
+async def purge_changes(
+    session_factory: sessionmaker,
+    batch_size: typing.Optional[int] = None,
+    retention: typing.Optional[datetime.timedelta] = None,
+) -> int:
+    """Delete all changes older than the retention period and return how many."""
+    if batch_size is None:
+        batch_size = settings.change_feed_purge_batch_size
+    if retention is None:
+        retention = datetime.timedelta(seconds=settings.change_feed_retention)
+
+    statement = change_purge_statement(batch_size, retention)
+    return await delete_in_batches(session_factory, statement, batch_size)
+
+
+async def run_purge_loop(interval: float) -> None:
+    """Purge overdue offensive messages and old changes every `interval` seconds."""
+    while True:
+        try:
+            purged = await purge_overdue(engine.get_session_factory())
+        except Exception:
+            log.exception("Failed to purge overdue offensive messages.")
+        else:
+            if purged:
+                log.info("Purged %d overdue offensive messages.", purged)
+
+        try:
+            purged = await purge_changes(engine.get_session_factory())
+        except Exception:
+            log.exception("Failed to purge old changes.")
+        else:
+            if purged:
+                log.info("Purged %d old changes.", purged)
+
+        await asyncio.sleep(interval)
+
+
+def start() -> None:
+    """Start the purge task of this worker, unless it is disabled."""
+    global _task
+
+    if _task is None and settings.offensive_messages_purge_interval > 0:
+        _task = asyncio.create_task(
+            run_purge_loop(settings.offensive_messages_purge_interval)
+        )
+
+
+async def stop() -> None:
+    """Cancel the purge task of this worker and wait for it to finish."""
+    global _task
+
+    if _task is None:
+        return
+
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
+
+
+async def main() -> None:
+    """Purge all overdue offensive messages and old changes once."""
+    await engine.connect()
+    try:
+        purged = await purge_overdue(engine.get_session_factory())
+        purged_changes = await purge_changes(engine.get_session_factory())
+    finally:
+        await engine.disconnect()
+    log.info("Purged %d overdue offensive messages.", purged)
+    log.info("Purged %d old changes.", purged_changes)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
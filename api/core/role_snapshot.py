@@ -0,0 +1,137 @@
+"""
+A snapshot of the role hierarchy, resolving the permissions of users.
+
+The effective permissions of a user are the permissions of all
+of their roles combined, and their top role is the role with
+the highest position. Instead of joining the roles of every
+user and sorting them in Python, each worker process keeps all
+roles in memory, ranked by their position in the hierarchy:
+
+- the permissions of the `@everyone` role, the only role at
+  position 0, are folded into a base that every user has;
+- every distinct set of roles is resolved once, later users
+  with the same roles are a dictionary lookup.
+
+Roles are tracked by the change feed, so the snapshot is loaded
+again after any notification on `CHANGE_CHANNEL`, including a
+resynchronization of the listener.
+"""
+
+import asyncio
+import typing
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core.change_feed import CHANGE_CHANNEL
+from api.core.database.models.api.bot import Role
+from api.core.database.notifications import listener
+
+# The number of resolved sets of roles that are kept at most.
+MAX_RESOLVED = 10_000
+
+roles = Role.__table__
+
+
+class ResolvedRoles(typing.NamedTuple):
+    """The effective permissions and the top role of a user."""
+
+    permissions: int
+    top_role_id: typing.Optional[int]
+
+
+class RankedRole(typing.NamedTuple):
+    """A role and its rank, the higher the rank the higher the role."""
+
+    rank: int
+    permissions: int
+
+
+class RoleSnapshot:
+    """The roles of the guild, as last loaded by this worker."""
+
+    def __init__(self) -> None:
+        self._roles: dict[int, RankedRole] = {}
+        self._base_permissions = 0
+        self._resolved: dict[frozenset[int], ResolvedRoles] = {}
+        self._loaded = False
+        self._lock: typing.Optional[asyncio.Lock] = None
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the snapshot is in sync with the database."""
+        return self._loaded
+
+    def update(self, rows: typing.Iterable[tuple[int, int, int]]) -> None:
+        """Replace the roles with rows of `(id, permissions, position)`."""
+        # Like discord.py, roles at the same position are ranked by age.
+        ordered = sorted(rows, key=lambda row: (row[2], -row[0]))
+        self._roles = {
+            role_id: RankedRole(rank, permissions)
+            for rank, (role_id, permissions, _) in enumerate(ordered)
+        }
+
+        base_permissions = 0
+        for _, permissions, position in ordered:
+            if position == 0:
+                base_permissions |= permissions
+        self._base_permissions = base_permissions
+        self._resolved = {}
+
+    def resolve(self, role_ids: typing.Iterable[int]) -> ResolvedRoles:
+        """Resolve the roles of a user, ignoring unknown roles."""
+        key = frozenset(role_ids)
+        if (resolved := self._resolved.get(key)) is not None:
+            return resolved
+
+        permissions = self._base_permissions
+        top_rank = -1
+        top_role_id = None
+        for role_id in key:
+            if (role := self._roles.get(role_id)) is None:
+                continue
+            permissions |= role.permissions
+            if role.rank > top_rank:
+                top_rank, top_role_id = role.rank, role_id
+
+        if len(self._resolved) >= MAX_RESOLVED:
+            self._resolved.clear()
+        resolved = self._resolved[key] = ResolvedRoles(permissions, top_role_id)
+        return resolved
+
+    def on_change(self, _payload: typing.Optional[str] = None) -> None:
+        """Load the roles again before they are used next."""
+        self._loaded = False
+
+    async def load(self, session: AsyncSession) -> None:
+        """Load the roles from the database, unless they are in sync already."""
+        if self._loaded:
+            return
+
+        # The lock is created here, so it belongs to the running event loop.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._loaded:
+                return
+
+            # Set first, so a change during the load isn't lost.
+            self._loaded = True
+            try:
+                result = await session.execute(
+                    select(roles.c.id, roles.c.permissions, roles.c.position)
+                )
+            except BaseException:
+                # Nothing was loaded, so the next call has to try again.
+                self._loaded = False
+                raise
+
+            self.update(result.all())
+
+
+role_snapshot = RoleSnapshot()
+listener.subscribe(CHANGE_CHANNEL, role_snapshot.on_change)
@@ -6,5 +6,29 @@ endpoints of the API. Schemas are represented by pydantic
 models, which simplifies data coercion and validation.
 """
 
+from .bot_settings import BotSetting, BotSettingData
+from .deleted_messages import ArchivedDeletion, MessageDeletionContext
+from .documentation_links import DocumentationLink
 from .errors import ErrorMessage
-from .health_check import HealthCheck
+from .filter_lists import FilterMatch, FilterMatchRequest, FilterMatchResult
+from .health_check import HealthCheck, Liveness, Readiness
+from .infractions import (
+    AppliedInfraction,
+    Infraction,
+    InfractionSummary,
+    InfractionTypeSummary,
+    NewInfraction,
+)
+from .messages import Message
+from .nominations import ReviewEntry, ReviewNomination
+from .offensive_messages import OffensiveMessage
+from .pagination import Page
+from .reminders import Reminder, ReminderAck
+from .serialization import ORJSONResponse, dumps
+from .users import (
+    BulkUserResult,
+    PartialUser,
+    RoleCounts,
+    User,
+    UserPermissions,
+)
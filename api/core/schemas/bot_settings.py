@@ -0,0 +1,16 @@
+"""Schemas for the bot settings endpoints."""
+
+from pydantic import BaseModel
+
+
+class BotSetting(BaseModel):
+    """A configuration entry for the bot."""
+
+    name: str
+    data: dict
+
+
+class BotSettingData(BaseModel):
+    """The new data of a bot setting."""
+
+    data: dict
@@ -0,0 +1,36 @@
+"""Schemas for the deleted messages endpoints."""
+
+import datetime
+import typing
+
+from pydantic import BaseModel, validator
+
+from api.core.embeds import embed_errors
+from .messages import Message
+
+
+class MessageDeletionContext(BaseModel):
+    """A bulk deletion of messages, together with the deleted messages."""
+
+    actor_id: typing.Optional[int]
+    creation: datetime.datetime
+    deletedmessage_set: list[Message]
+
+    @validator("deletedmessage_set")
+    def validate_embeds(cls, messages: list[Message]) -> list[Message]:  # noqa: N805
+        """Raise ValueError listing every message with invalid embeds."""
+        errors = embed_errors(message.embeds for message in messages)
+        if errors:
+            details = "; ".join(
+                f"message {messages[index].id}: {error}"
+                for index, error in errors.items()
+            )
+            raise ValueError(f"Invalid embeds in {details}")
+        return messages
+
+
+class ArchivedDeletion(BaseModel):
+    """The result of archiving a bulk deletion."""
+
+    id: int
+    messages: int
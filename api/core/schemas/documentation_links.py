@@ -0,0 +1,20 @@
+"""Schemas for the documentation links endpoints."""
+
+from pydantic import BaseModel, Field, validator
+
+from api.core.database.models.api.bot import documentation_link
+
+
+class DocumentationLink(BaseModel):
+    """A documentation link used by the `!docs` command of the bot."""
+
+    package: str = Field(..., max_length=50)
+    base_url: str = Field(..., max_length=200)
+    inventory_url: str = Field(..., max_length=200)
+
+    _validate_package = validator("package", allow_reuse=True)(
+        documentation_link.validate_package
+    )
+    _validate_base_url = validator("base_url", allow_reuse=True)(
+        documentation_link.validate_base_url
+    )
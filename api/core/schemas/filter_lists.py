@@ -0,0 +1,28 @@
+"""Schemas for the filter lists endpoints."""
+
+from pydantic import BaseModel
+
+
+class FilterMatchRequest(BaseModel):
+    """A message to match against the filter lists."""
+
+    content: str
+    # The file names of the attachments of the message.
+    attachments: list[str] = []
+
+
+class FilterMatch(BaseModel):
+    """A filter list entry that matched a message."""
+
+    id: int
+    type: str
+    allowed: bool
+    content: str
+    # The part of the message that matched the entry.
+    value: str
+
+
+class FilterMatchResult(BaseModel):
+    """All filter list entries that matched a message."""
+
+    matches: list[FilterMatch]
@@ -7,4 +7,20 @@ class HealthCheck(BaseModel):
     """A schema representing a simple health check response."""
 
     description: str
+    commit_sha: str
     timestamp: int
+
+
+class Liveness(BaseModel):
+    """The liveness of a worker process."""
+
+    alive: bool
+
+
+class Readiness(BaseModel):
+    """The readiness of a worker process, and the checks it is based on."""
+
+    ready: bool
+    pool: bool
+    database: bool
+    migrations: bool
@@ -0,0 +1,71 @@
+"""Schemas for the infractions endpoints."""
+
+import datetime
+import typing
+
+from pydantic import BaseModel, validator
+
+from api.core.database.models.api.bot.infraction import INFRACTION_TYPES
+
+
+class Infraction(BaseModel):
+    """An infraction for a Discord user."""
+
+    id: int
+    inserted_at: datetime.datetime
+    expires_at: typing.Optional[datetime.datetime]
+    active: bool
+    type: str
+    reason: typing.Optional[str]
+    hidden: bool
+    dm_sent: typing.Optional[bool]
+    actor_id: int
+    user_id: int
+
+
+class NewInfraction(BaseModel):
+    """An infraction to apply to a Discord user."""
+
+    expires_at: typing.Optional[datetime.datetime]
+    active: bool = True
+    type: str
+    reason: typing.Optional[str]
+    hidden: bool = False
+    dm_sent: typing.Optional[bool]
+    actor_id: int
+    user_id: int
+
+    @validator("type")
+    def validate_type(cls, infraction_type: str) -> str:  # noqa: N805
+        """Raise ValueError if the type of infraction is not supported."""
+        if infraction_type not in INFRACTION_TYPES:
+            raise ValueError(f"{infraction_type} is not a valid infraction type.")
+        return infraction_type
+
+
+class AppliedInfraction(Infraction):
+    """An applied infraction, and the infractions it replaced."""
+
+    # The previously active infractions of the same type that were deactivated.
+    deactivated_ids: list[int]
+
+
+class InfractionTypeSummary(BaseModel):
+    """The infractions of a single type of a user."""
+
+    type: str
+    total: int
+    active: int
+    # The latest expiry of the active infractions of this type, if any expire.
+    latest_expiry: typing.Optional[datetime.datetime]
+    active_ids: list[int]
+
+
+class InfractionSummary(BaseModel):
+    """The infractions of a user, counted by type."""
+
+    user_id: int
+    total: int
+    active: int
+    latest_expiry: typing.Optional[datetime.datetime]
+    types: list[InfractionTypeSummary]
@@ -0,0 +1,14 @@
+"""Schemas for the messages endpoints."""
+
+from pydantic import BaseModel, Field, constr
+
+
+class Message(BaseModel):
+    """A message, sent somewhere on the Discord server."""
+
+    id: int = Field(..., ge=0)
+    channel_id: int = Field(..., ge=0)
+    content: str = Field(..., max_length=4000)
+    embeds: list[dict]
+    author_id: int
+    attachments: list[constr(max_length=512)]
@@ -0,0 +1,25 @@
+"""Schemas for the nominations endpoints."""
+
+import datetime
+
+from pydantic import BaseModel
+
+
+class ReviewEntry(BaseModel):
+    """The nomination of a user by a single staff member."""
+
+    id: int
+    actor_id: int
+    actor_name: str
+    reason: str
+    inserted_at: datetime.datetime
+
+
+class ReviewNomination(BaseModel):
+    """An active nomination waiting for a review, with all of its entries."""
+
+    id: int
+    user_id: int
+    user_name: str
+    inserted_at: datetime.datetime
+    entries: list[ReviewEntry]
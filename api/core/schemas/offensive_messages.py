@@ -0,0 +1,13 @@
+"""Schemas for the offensive messages endpoints."""
+
+import datetime
+
+from pydantic import BaseModel
+
+
+class OffensiveMessage(BaseModel):
+    """A message that triggered a filter and that will be deleted."""
+
+    id: int
+    channel_id: int
+    delete_date: datetime.datetime
@@ -0,0 +1,19 @@
+"""Schemas for paginated responses."""
+
+import typing
+
+from pydantic.generics import GenericModel
+
+ItemT = typing.TypeVar("ItemT")
+
+
+class Page(GenericModel, typing.Generic[ItemT]):
+    """
+    A single page of a list endpoint.
+
+    If `next_cursor` is not null, it can be passed as the
+    `cursor` query parameter to request the next page.
+    """
+
+    items: list[ItemT]
+    next_cursor: typing.Optional[str]
@@ -0,0 +1,29 @@
+"""Schemas for the reminders endpoints."""
+
+import datetime
+import typing
+
+from pydantic import BaseModel
+
+
+class Reminder(BaseModel):
+    """A reminder created by a user."""
+
+    id: int
+    active: bool
+    channel_id: int
+    content: str
+    expiration: datetime.datetime
+    failures: int
+    author_id: int
+    jump_url: str
+    mentions: list[int]
+    claimed_until: typing.Optional[datetime.datetime]
+
+
+class ReminderAck(BaseModel):
+    """The outcome of sending a claimed reminder."""
+
+    # If false, the failure count of the reminder is incremented and
+    # it can be claimed again; otherwise the reminder is deactivated.
+    delivered: bool
@@ -0,0 +1,52 @@
+"""
+Fast JSON serialization of responses.
+
+`ORJSONResponse` is the default response class of the app, so
+every response is encoded with orjson instead of the standard
+library. Responses returned by endpoints are still validated
+against their `response_model` and go through
+`jsonable_encoder` first, which is the safe choice for data that
+comes from clients.
+
+Endpoints that return rows they just read from the database can
+skip that by returning an `ORJSONResponse` themselves. It encodes
+SQLAlchemy rows and mappings directly, without building pydantic
+models or intermediate dicts of encoded values first. The
+`response_model` of such an endpoint is only used to document it.
+"""
+
+from collections.abc import Mapping
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+from starlette.responses import JSONResponse
+
+# Keys of JSONB documents may be integers after a round trip through Python.
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: object) -> object:
+    """Convert values orjson can't serialize natively."""
+    if isinstance(value, Row):
+        return dict(value._mapping)
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: object) -> bytes:
+    """Serialize content, including SQLAlchemy rows and mappings, to JSON."""
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """A JSON response encoded with orjson."""
+
+    def render(self, content: object) -> bytes:
+        """Serialize the content of the response."""
+        return dumps(content)
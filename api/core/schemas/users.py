@@ -0,0 +1,62 @@
+"""Schemas for the users endpoints."""
+
+import typing
+
+from pydantic import BaseModel, Field, validator
+
+from api.core.database.models.api.bot import user
+
+
+class User(BaseModel):
+    """A Discord user, as synchronized by the bot."""
+
+    id: int
+    name: str = Field(..., max_length=32)
+    discriminator: int
+    in_guild: bool = True
+    roles: list[int] = []
+
+    # The checks are shared with the `User` model, which means that a
+    # request body can be validated without building any ORM objects.
+    _validate_id = validator("id", allow_reuse=True)(user.validate_user_id)
+    _validate_discriminator = validator("discriminator", allow_reuse=True)(
+        user.validate_discriminator
+    )
+    _validate_roles = validator("roles", allow_reuse=True)(user.validate_roles)
+
+
+class PartialUser(User):
+    """A Discord user of which only the given fields will be updated."""
+
+    name: typing.Optional[str] = Field(None, max_length=32)
+    discriminator: typing.Optional[int]
+    in_guild: typing.Optional[bool]
+    roles: typing.Optional[list[int]]
+
+
+class BulkUserResult(BaseModel):
+    """The number of users affected by a bulk synchronization."""
+
+    created: int
+    updated: int
+    unchanged: int
+
+
+class UserPermissions(BaseModel):
+    """The effective permissions of a user, resolved from their roles."""
+
+    id: int
+    # The permissions of all roles of the user combined, as a Discord bitset.
+    permissions: int
+    # The role of the user with the highest position, if they have any.
+    top_role_id: typing.Optional[int]
+
+
+class RoleCounts(BaseModel):
+    """The number of users with some roles."""
+
+    # The users with any, and with all, of the roles.
+    any: int
+    all: int
+    # The users with each of the roles, by role id.
+    roles: dict[int, int]
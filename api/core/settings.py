@@ -10,7 +10,9 @@ To use settings in other parts of the application, you can
 import the name `settings` from `api.core` directly.
 """
 
-from pydantic import BaseSettings, PostgresDsn
+import typing
+
+from pydantic import BaseModel, BaseSettings, PostgresDsn
 
 
 class AsyncPostgresDsn(PostgresDsn):
@@ -19,6 +21,22 @@ class AsyncPostgresDsn(PostgresDsn):
     allowed_schemes = {"postgresql+asyncpg"}
 
 
+class ScopedToken(BaseModel):
+    """
+    An API token of a client with limited access.
+
+    The scopes are:
+
+    - `authenticated`: full access, like `auth_token`;
+    - `read`: read-only access to all endpoints;
+    - `metrics`: read-only access to the `/metrics` endpoint.
+    """
+
+    name: str
+    token: str
+    scopes: list[typing.Literal["authenticated", "read", "metrics"]]
+
+
 class Settings(BaseSettings):
     """
     A Settings class that will parse env variables.
@@ -35,6 +53,57 @@ class Settings(BaseSettings):
 
     database_url: AsyncPostgresDsn
     auth_token: str
+
+    # The tokens of additional clients, as a JSON list of objects with
+    # a `name`, a `token` and `scopes`, such as the site or a read-only
+    # metrics scraper. `auth_token` has full access.
+    auth_tokens: list[ScopedToken] = []
+
+    # Connection pool of the engine, per worker process. A worker
+    # will never hold more than `pool_size + max_overflow` connections.
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+
+    # How often, in seconds, a worker checks the filter lists for changes.
+    filter_lists_refresh_interval: float = 5.0
+
+    # Offensive messages are purged once they are overdue by the grace
+    # period, in seconds, which leaves the bot time to delete them from
+    # Discord first. An interval of zero disables the in-app purge task.
+    offensive_messages_purge_interval: float = 3600.0
+    offensive_messages_purge_grace: float = 86400.0
+    offensive_messages_purge_batch_size: int = 1000
+
+    # Changes of the change feed are kept for the retention period, in
+    # seconds, and purged by the same task as the offensive messages.
+    # A client resuming from a purged change has to load everything again.
+    change_feed_retention: float = 604800.0
+    change_feed_purge_batch_size: int = 1000
+
+    # The maximum age, in seconds, of a cached response. Cached responses
+    # are invalidated on writes, this only limits the damage of a missed
+    # invalidation.
+    response_cache_ttl: float = 300.0
+
+    # Responses smaller than this many bytes are never compressed.
+    compression_minimum_size: int = 1024
+
+    # Log requests that execute too many, too often repeated, or too slow
+    # queries. Always enabled in DEBUG mode.
+    query_inspection: bool = False
+    query_inspection_max_queries: int = 20
+    query_inspection_max_repeats: int = 5
+    slow_query_threshold: float = 0.5
+
+    # The time in seconds the result of the database readiness checks is
+    # cached, and the time they may take before the database is considered
+    # unreachable.
+    readiness_cache_ttl: float = 5.0
+    readiness_timeout: float = 2.0
+
     commit_sha: str = "development"
     DEBUG: bool = False
 
@@ -5,3 +5,11 @@ This package contains all the route definitions of the Python Discord API.
 There are currently no plan to use a strictly versioned API design, as this API
 is currently tightly coupled with a single client application.
 """
+
+from fastapi import APIRouter
+
+from api.core.schemas import ErrorMessage
+from . import bot
+
+router = APIRouter(responses={403: {"model": ErrorMessage}})
+router.include_router(bot.router)
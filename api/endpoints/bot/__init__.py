@@ -0,0 +1,34 @@
+"""Endpoints used by our Discord bot."""
+
+from fastapi import APIRouter
+
+from . import (
+    bot_settings,
+    changes,
+    deleted_messages,
+    documentation_links,
+    filter_lists,
+    infractions,
+    messages,
+    nominations,
+    off_topic_channel_names,
+    offensive_messages,
+    reminders,
+    roles,
+    users,
+)
+
+router = APIRouter(prefix="/bot")
+router.include_router(bot_settings.router)
+router.include_router(changes.router)
+router.include_router(deleted_messages.router)
+router.include_router(documentation_links.router)
+router.include_router(filter_lists.router)
+router.include_router(infractions.router)
+router.include_router(messages.router)
+router.include_router(nominations.router)
+router.include_router(off_topic_channel_names.router)
+router.include_router(offensive_messages.router)
+router.include_router(reminders.router)
+router.include_router(roles.router)
+router.include_router(users.router)
@@ -0,0 +1,74 @@
+"""
+Endpoints for the settings of the bot.
+
+The bot settings are read on almost every command, so reads
+are served from the response cache and writes invalidate it.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core import schemas
+from api.core.cache import cached_response, commit_and_invalidate
+from api.core.database import get_session
+from api.core.database.models.api.bot import BotSetting
+from api.core.database.models.api.bot.bot_setting import BOT_SETTING_NAMES
+
+router = APIRouter(prefix="/bot_settings", tags=["bot settings"])
+
+CACHE_NAMESPACE = "bot_settings"
+
+bot_settings = BotSetting.__table__
+
+
+@router.get("", response_model=list[schemas.BotSetting])
+async def list_bot_settings(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """List all bot settings."""
+
+    async def load() -> list[dict]:
+        result = await session.execute(select(bot_settings).order_by("name"))
+        return [dict(row) for row in result.mappings()]
+
+    return await cached_response(request, CACHE_NAMESPACE, load)
+
+
+@router.get("/{name}", response_model=schemas.BotSetting)
+async def get_bot_setting(
+    name: str, request: Request, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Get a single bot setting by its name."""
+
+    async def load() -> dict:
+        result = await session.execute(
+            select(bot_settings).where(bot_settings.c.name == name)
+        )
+        if (row := result.mappings().first()) is None:
+            raise HTTPException(status_code=404, detail="Bot setting not found.")
+        return dict(row)
+
+    return await cached_response(request, CACHE_NAMESPACE, load)
+
+
+@router.put("/{name}", response_model=schemas.BotSetting)
+async def put_bot_setting(
+    name: str,
+    body: schemas.BotSettingData,
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """Create or replace the data of a known bot setting."""
+    if name not in BOT_SETTING_NAMES:
+        raise HTTPException(status_code=404, detail="Unknown bot setting.")
+
+    statement = insert(bot_settings).values(name=name, data=body.data)
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[bot_settings.c.name],
+            set_={"data": statement.excluded.data},
+        )
+    )
+    await commit_and_invalidate(session, CACHE_NAMESPACE)
+    return {"name": name, "data": body.data}
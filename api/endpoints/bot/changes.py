@@ -0,0 +1,54 @@
+"""Endpoints for the change feed of the bot, see `api.core.change_feed`."""
+
+import typing
+
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import StreamingResponse
+
+from api.core.change_feed import TRACKED_TABLES, stream_changes
+from api.core.database import engine
+from api.core.middleware import skip_compression
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    responses={200: {"content": {EVENT_STREAM_MEDIA_TYPE: {}}}},
+)
+@skip_compression
+async def stream_change_feed(
+    table: typing.Optional[list[str]] = Query(
+        None, description="Only stream changes of these tables."
+    ),
+    after: typing.Optional[int] = Query(
+        None, ge=0, description="Resume after this change id."
+    ),
+    last_event_id: typing.Optional[int] = Header(None, ge=0),
+) -> StreamingResponse:
+    """
+    Stream the changes of the tables the bot keeps a copy of.
+
+    Changes are sent as server-sent events. A reconnecting client resumes
+    after the id in `Last-Event-ID`, which takes precedence over `after`.
+    Changes are only kept for a while: if changes after the id were
+    purged, the stream starts with a `resync` event, after which the
+    client has to load the tracked tables in full.
+    """
+    if table and (unknown := set(table).difference(TRACKED_TABLES)):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Untracked tables: {', '.join(sorted(unknown))}.",
+        )
+
+    if last_event_id is not None:
+        after = last_event_id
+
+    return StreamingResponse(
+        stream_changes(engine.get_session_factory(), after, table),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
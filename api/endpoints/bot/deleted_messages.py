@@ -0,0 +1,126 @@
+"""
+Endpoints for archiving deleted messages.
+
+When the bot bulk-deletes messages, for instance when cleaning
+a channel or after a raid, it archives all of them at once.
+Instead of inserting one row per message, the messages are
+streamed into a temporary staging table with `COPY` and merged
+into the message tables with two `INSERT ... SELECT` statements,
+all in a single transaction. This keeps the number of round
+trips constant, no matter how many messages were deleted.
+"""
+
+import json
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import column, insert, literal, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import (
+    DeletedMessage,
+    Message,
+    MessageDeletionContext,
+)
+
+router = APIRouter(prefix="/deleted_messages", tags=["deleted messages"])
+
+deleted_messages = DeletedMessage.__table__
+messages = Message.__table__
+deletion_contexts = MessageDeletionContext.__table__
+
+STAGING_TABLE = "staging_message"
+COLUMNS = ("id", "channel_id", "content", "embeds", "author_id", "attachments")
+
+staging = table(STAGING_TABLE, *(column(name) for name in COLUMNS))
+
+
+def message_records(
+    deleted: typing.Iterable[schemas.Message],
+) -> typing.Iterator[tuple]:
+    """Yield a `COPY` record for every message, in the order of `COLUMNS`."""
+    for message in deleted:
+        yield (
+            message.id,
+            message.channel_id,
+            message.content,
+            # The JSONB codec of the connection expects serialized documents.
+            [json.dumps(embed) for embed in message.embeds],
+            message.author_id,
+            message.attachments,
+        )
+
+
+def merge_messages_statement() -> Executable:
+    """Build a statement that copies the staged messages into the messages."""
+    return (
+        pg_insert(messages)
+        .from_select(COLUMNS, select(*staging.c))
+        .on_conflict_do_nothing(index_elements=[messages.c.id])
+    )
+
+
+def merge_deleted_statement(context_id: int) -> Executable:
+    """Build a statement that marks the staged messages as deleted."""
+    return (
+        pg_insert(deleted_messages)
+        .from_select(
+            ["id", "deletion_context_id"],
+            select(staging.c.id, literal(context_id)),
+        )
+        .on_conflict_do_nothing(index_elements=[deleted_messages.c.id])
+    )
+
+
+async def copy_messages(session: AsyncSession, deleted: list[schemas.Message]) -> None:
+    """Stream the messages into a staging table that is dropped on commit."""
+    await session.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} "
+            f"(LIKE {messages.name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+    )
+    # `COPY` is not supported by SQLAlchemy, so it is issued on the asyncpg
+    # connection of the session, inside the transaction of the session.
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        STAGING_TABLE, records=message_records(deleted), columns=COLUMNS
+    )
+
+
+@router.post("", status_code=201, response_model=schemas.ArchivedDeletion)
+async def archive_deleted_messages(
+    context: schemas.MessageDeletionContext,
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """
+    Archive a bulk deletion of messages in a single transaction.
+
+    Messages that are already archived are left untouched. The authors
+    of all messages and the actor must be known users.
+    """
+    context_id = await session.scalar(
+        insert(deletion_contexts)
+        .values(actor_id=context.actor_id, creation=context.creation)
+        .returning(deletion_contexts.c.id)
+    )
+
+    if context.deletedmessage_set:
+        await copy_messages(session, context.deletedmessage_set)
+        await session.execute(merge_messages_statement())
+        await session.execute(merge_deleted_statement(context_id))
+
+    try:
+        await session.commit()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400, detail="The actor or an author is not a known user."
+        )
+
+    return {"id": context_id, "messages": len(context.deletedmessage_set)}
@@ -0,0 +1,89 @@
+"""
+Endpoints for the documentation links of the bot.
+
+The documentation links are read by every `!docs` command, so
+reads are served from the response cache and writes invalidate
+it.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core import schemas
+from api.core.cache import cached_response, commit_and_invalidate
+from api.core.database import get_session
+from api.core.database.models.api.bot import DocumentationLink
+
+router = APIRouter(prefix="/documentation_links", tags=["documentation links"])
+
+CACHE_NAMESPACE = "documentation_links"
+
+documentation_links = DocumentationLink.__table__
+
+
+@router.get("", response_model=list[schemas.DocumentationLink])
+async def list_documentation_links(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """List all documentation links."""
+
+    async def load() -> list[dict]:
+        result = await session.execute(select(documentation_links).order_by("package"))
+        return [dict(row) for row in result.mappings()]
+
+    return await cached_response(request, CACHE_NAMESPACE, load)
+
+
+@router.get("/{package}", response_model=schemas.DocumentationLink)
+async def get_documentation_link(
+    package: str, request: Request, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Get the documentation link of a single package."""
+
+    async def load() -> dict:
+        result = await session.execute(
+            select(documentation_links).where(documentation_links.c.package == package)
+        )
+        if (row := result.mappings().first()) is None:
+            raise HTTPException(status_code=404, detail="Package not found.")
+        return dict(row)
+
+    return await cached_response(request, CACHE_NAMESPACE, load)
+
+
+@router.post("", status_code=201, response_model=schemas.DocumentationLink)
+async def create_documentation_link(
+    link: schemas.DocumentationLink,
+    session: AsyncSession = Depends(get_session),
+) -> schemas.DocumentationLink:
+    """Create the documentation link of a package."""
+    result = await session.execute(
+        insert(documentation_links)
+        .values(**link.dict())
+        .on_conflict_do_nothing(index_elements=[documentation_links.c.package])
+        .returning(documentation_links.c.package)
+    )
+    if result.first() is None:
+        raise HTTPException(status_code=409, detail="Package already exists.")
+
+    await commit_and_invalidate(session, CACHE_NAMESPACE)
+    return link
+
+
+@router.delete("/{package}", status_code=204, response_class=Response)
+async def delete_documentation_link(
+    package: str, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Delete the documentation link of a package."""
+    result = await session.execute(
+        delete(documentation_links)
+        .where(documentation_links.c.package == package)
+        .returning(documentation_links.c.package)
+    )
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Package not found.")
+
+    await commit_and_invalidate(session, CACHE_NAMESPACE)
+    return Response(status_code=204)
@@ -0,0 +1,30 @@
+"""Endpoints for the filter lists of the bot."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.filter_matching import filter_matcher
+
+router = APIRouter(prefix="/filter_lists", tags=["filter lists"])
+
+
+@router.post("/match", response_model=schemas.FilterMatchResult)
+async def match_filter_lists(
+    message: schemas.FilterMatchRequest,
+    session: AsyncSession = Depends(get_session),
+) -> dict[str, list[dict]]:
+    """
+    Match a message and its attachments against all filter lists.
+
+    Every matching entry is returned once, with the part of the message
+    that matched it. Whether a match should be acted upon depends on the
+    `allowed` flag of the entry and is left to the client.
+    """
+    matches = await filter_matcher.match(session, message.content, message.attachments)
+    return {
+        "matches": [
+            {**match.entry._asdict(), "value": match.value} for match in matches
+        ]
+    }
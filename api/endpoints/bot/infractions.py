@@ -0,0 +1,222 @@
+"""
+Endpoints for the infractions of the bot.
+
+Moderators look up the infractions of a user all the time, but
+mostly need to know how many infractions of each type the user
+has and which of them are still active. The summary endpoint
+answers that with a single aggregate that is covered by the
+index on `(user_id, active, type)`, so its cost doesn't grow
+with the size of the infraction rows of the user.
+
+A user has at most one active infraction of each type, which is
+enforced by a unique index on the active infractions. Applying an
+infraction deactivates the active infraction of the same type and
+inserts the new one in a single statement, so moderators applying
+infractions at the same time can't race each other.
+
+Expired infractions are long-polled through the expiry
+scheduler in `api.core.infraction_expiry`.
+"""
+
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import Integer, any_, bindparam, func, literal, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import Infraction
+from api.core.infraction_expiry import expiry_scheduler, notify_expiry
+
+router = APIRouter(prefix="/infractions", tags=["infractions"])
+
+infractions = Infraction.__table__
+
+
+def summary_statement(user_id: int) -> Executable:
+    """Build a statement that aggregates the infractions of a user by type."""
+    active = infractions.c.active
+    return (
+        select(
+            infractions.c.type,
+            func.count().label("total"),
+            func.count().filter(active).label("active"),
+            func.max(infractions.c.expires_at).filter(active).label("latest_expiry"),
+            func.array_agg(infractions.c.id).filter(active).label("active_ids"),
+        )
+        .where(infractions.c.user_id == user_id)
+        .group_by(infractions.c.type)
+        .order_by(infractions.c.type)
+    )
+
+
+def apply_statement(infraction: schemas.NewInfraction) -> Executable:
+    """
+    Build a statement that applies an infraction in place of the active one.
+
+    If the infraction is active, the active infraction of the same type
+    of the user is deactivated first. The insert reads the deactivated
+    ids, which makes sure it only runs after the update.
+
+    The statement returns a single row with the ids of the deactivated
+    infractions, and the columns of the new infraction. These are null
+    if another active infraction of the type was committed concurrently.
+    """
+    deactivated = (
+        update(infractions)
+        .where(
+            infractions.c.user_id == infraction.user_id,
+            infractions.c.type == infraction.type,
+            infractions.c.active,
+            literal(infraction.active),
+        )
+        .values(active=False)
+        .returning(infractions.c.id)
+        .cte("deactivated")
+    )
+    previous = select(
+        func.coalesce(
+            func.array_agg(deactivated.c.id), literal([], ARRAY(Integer))
+        ).label("deactivated_ids")
+    ).cte("previous")
+
+    values = infraction.dict()
+    inserted = (
+        pg_insert(infractions)
+        .from_select(
+            ["inserted_at", *values],
+            select(
+                func.now(),
+                *(
+                    literal(value, infractions.c[name].type)
+                    for name, value in values.items()
+                ),
+            ).select_from(previous),
+            include_defaults=False,
+        )
+        .on_conflict_do_nothing(
+            index_elements=[infractions.c.user_id, infractions.c.type],
+            index_where=infractions.c.active,
+        )
+        .returning(*infractions.c)
+        .cte("inserted")
+    )
+
+    return select(inserted, previous.c.deactivated_ids).select_from(
+        previous.outerjoin(inserted, true())
+    )
+
+
+@router.post("", status_code=201, response_model=schemas.AppliedInfraction)
+async def apply_infraction(
+    infraction: schemas.NewInfraction, session: AsyncSession = Depends(get_session)
+) -> dict:
+    """
+    Apply an infraction, deactivating the active infraction of its type.
+
+    Fails with a 409 if another active infraction of the same type was
+    applied to the user at the same time.
+    """
+    result = await session.execute(apply_statement(infraction))
+    applied = result.mappings().one()
+    if applied["id"] is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Another infraction of this type was applied concurrently.",
+        )
+
+    for infraction_id in applied["deactivated_ids"]:
+        await notify_expiry(session, infraction_id, None)
+    if applied["active"] and applied["expires_at"] is not None:
+        await notify_expiry(session, applied["id"], applied["expires_at"])
+
+    try:
+        await session.commit()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=400, detail="The actor or the user is not a known user."
+        )
+
+    return applied
+
+
+@router.get("/summary/{user_id}", response_model=schemas.InfractionSummary)
+async def summarize_infractions(
+    user_id: int, session: AsyncSession = Depends(get_session)
+) -> dict:
+    """
+    Summarize the infractions of a user by type.
+
+    Users without infractions get an empty summary.
+    """
+    result = await session.execute(summary_statement(user_id))
+    types = [
+        {**row, "active_ids": sorted(row["active_ids"] or ())}
+        for row in result.mappings()
+    ]
+    expiries = [row["latest_expiry"] for row in types if row["latest_expiry"]]
+
+    return {
+        "user_id": user_id,
+        "total": sum(row["total"] for row in types),
+        "active": sum(row["active"] for row in types),
+        "latest_expiry": max(expiries, default=None),
+        "types": types,
+    }
+
+
+@router.get("/expired", response_model=list[schemas.Infraction])
+async def wait_for_expired_infractions(
+    timeout: float = Query(
+        30, ge=0, le=300, description="The time in seconds to wait at most."
+    ),
+    session: AsyncSession = Depends(get_session),
+) -> schemas.ORJSONResponse:
+    """
+    Wait until active infractions expire and return them.
+
+    Returns an empty list if nothing expired within the timeout. Expired
+    infractions are returned again after a while until they are
+    deactivated, so an expiry is never lost.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        await expiry_scheduler.load(session)
+        # Don't hold on to a pooled connection while waiting.
+        await session.close()
+        due = await expiry_scheduler.wait_due(max(deadline - time.monotonic(), 0))
+        if due or expiry_scheduler.loaded:
+            break
+
+    if not due:
+        return schemas.ORJSONResponse([])
+
+    # Due ids are checked against the clock of the database, which may
+    # be a little behind the clock this worker was woken up by.
+    result = await session.execute(
+        select(infractions, (infractions.c.expires_at <= func.now()).label("is_due"))
+        .where(infractions.c.id == any_(bindparam("ids", due, type_=ARRAY(Integer))))
+        .order_by(infractions.c.expires_at)
+    )
+
+    expired = []
+    cancelled = set(due)
+    for row in result.mappings():
+        if not row["active"] or row["expires_at"] is None:
+            continue
+        cancelled.discard(row["id"])
+        if row["is_due"]:
+            expired.append({key: row[key] for key in infractions.c.keys()})
+        else:
+            # Extended, or not due yet by the clock of the database.
+            expiry_scheduler.schedule(row["id"], row["expires_at"].timestamp())
+
+    # Infractions that were deactivated or deleted in the meantime.
+    for infraction_id in cancelled:
+        expiry_scheduler.cancel(infraction_id)
+    return schemas.ORJSONResponse(expired)
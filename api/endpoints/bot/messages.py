@@ -0,0 +1,107 @@
+"""
+Endpoints for the archived messages of the bot.
+
+Deletion logs can contain many thousands of messages, each
+with its own embeds and attachments. The list endpoint is
+therefore paginated by message id, and the export endpoint
+streams its rows from a server-side cursor as newline-delimited
+JSON, so neither the API nor the database has to hold the full
+result in memory.
+"""
+
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import DeletedMessage, Message
+from api.core.pagination import Pagination, paginate
+
+router = APIRouter(prefix="/messages", tags=["messages"])
+
+# The number of rows fetched from the cursor and sent per chunk.
+EXPORT_BATCH_SIZE = 500
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+messages = Message.__table__
+deleted_messages = DeletedMessage.__table__
+
+
+def filter_query(
+    deletion_context_id: typing.Optional[int], channel_id: typing.Optional[int]
+) -> Select:
+    """Select the columns of all messages matching the given filters."""
+    query = select(messages)
+
+    if deletion_context_id is not None:
+        query = query.join(
+            deleted_messages, deleted_messages.c.id == messages.c.id
+        ).where(deleted_messages.c.deletion_context_id == deletion_context_id)
+
+    if channel_id is not None:
+        query = query.where(messages.c.channel_id == channel_id)
+
+    return query
+
+
+async def stream_ndjson(
+    session: AsyncSession, query: Select
+) -> typing.AsyncIterator[bytes]:
+    """
+    Stream the rows of a query as newline-delimited JSON.
+
+    Rows are read from a server-side cursor in batches and every batch
+    is sent as soon as it has been fetched. Plain rows are selected
+    instead of ORM objects, so they never pile up in the session.
+    """
+    result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for batch in result.mappings().partitions(EXPORT_BATCH_SIZE):
+        yield b"".join(schemas.dumps(row) + b"\n" for row in batch)
+
+
+@router.get("", response_model=schemas.Page[schemas.Message])
+async def list_messages(
+    deletion_context_id: typing.Optional[int] = None,
+    channel_id: typing.Optional[int] = None,
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_session),
+) -> schemas.ORJSONResponse:
+    """List the archived messages, ordered by their id."""
+    query = filter_query(deletion_context_id, channel_id)
+    return schemas.ORJSONResponse(
+        await paginate(session, query, messages.c.id, pagination)
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_messages(
+    deletion_context_id: typing.Optional[int] = None,
+    channel_id: typing.Optional[int] = None,
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    """
+    Export the messages of a deletion context or channel as NDJSON.
+
+    At least one of the filters is required; if both are given, only
+    messages matching both filters are exported.
+    """
+    if deletion_context_id is None and channel_id is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Either `deletion_context_id` or `channel_id` is required.",
+        )
+
+    query = filter_query(deletion_context_id, channel_id).order_by(messages.c.id)
+    return StreamingResponse(
+        stream_ndjson(session, query), media_type=NDJSON_MEDIA_TYPE
+    )
@@ -0,0 +1,82 @@
+"""
+Endpoints for the helper nominations.
+
+Reviewing a nomination takes the nominated user, all entries of
+the nomination and the staff members who made them. Instead of
+loading these one relationship at a time, the review queue
+aggregates the entries of every nomination, with the names of
+their actors, into a JSON array in a correlated subquery. The
+whole queue is a single query, whatever the number of entries.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import Nomination, Nominationentry, User
+
+router = APIRouter(prefix="/nominations", tags=["nominations"])
+
+nominations = Nomination.__table__
+entries = Nominationentry.__table__
+users = User.__table__
+
+
+def entries_subquery() -> Select:
+    """Aggregate the entries of a nomination of the outer query, oldest first."""
+    actors = users.alias("actor")
+    entry = func.jsonb_build_object(
+        "id",
+        entries.c.id,
+        "actor_id",
+        entries.c.actor_id,
+        "actor_name",
+        actors.c.name,
+        "reason",
+        entries.c.reason,
+        "inserted_at",
+        entries.c.inserted_at,
+    )
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_agg(aggregate_order_by(entry, entries.c.inserted_at)),
+                literal_column("'[]'::jsonb"),
+                type_=JSONB,
+            )
+        )
+        .select_from(entries.join(actors, actors.c.id == entries.c.actor_id))
+        .where(entries.c.nomination_id == nominations.c.id)
+        .scalar_subquery()
+    )
+
+
+def review_queue_query(limit: int) -> Select:
+    """Select the oldest active nominations that weren't reviewed yet."""
+    return (
+        select(
+            nominations.c.id,
+            nominations.c.user_id,
+            users.c.name.label("user_name"),
+            nominations.c.inserted_at,
+            entries_subquery().label("entries"),
+        )
+        .select_from(nominations.join(users, users.c.id == nominations.c.user_id))
+        .where(nominations.c.active, ~nominations.c.reviewed)
+        .order_by(nominations.c.inserted_at)
+        .limit(limit)
+    )
+
+
+@router.get("/review_queue", response_model=list[schemas.ReviewNomination])
+async def list_review_queue(
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session),
+) -> list[dict]:
+    """List the active nominations waiting for a review, oldest first."""
+    result = await session.execute(review_queue_query(limit))
+    return result.mappings().all()
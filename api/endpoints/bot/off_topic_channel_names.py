@@ -0,0 +1,76 @@
+"""
+Endpoints for the names of the off-topic channels.
+
+Every day, the bot renames the off-topic channels with names
+drawn at random from the names that weren't used yet in the
+current rotation. Once every name has been used, a new rotation
+starts. The draw is done in a single transaction: the unused
+names are picked with `ORDER BY random()` over a partial index
+on the unused names, and marked as used by the same statement.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import String, all_, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from api.core.database import get_session
+from api.core.database.models.api.bot import OffTopicChannelName
+
+router = APIRouter(prefix="/off_topic_channel_names", tags=["off-topic channel names"])
+
+names = OffTopicChannelName.__table__
+
+
+def not_drawn(drawn: list[str]) -> Executable:
+    """Build a condition excluding the names that were just drawn."""
+    return names.c.name != all_(bindparam("drawn", drawn, type_=ARRAY(String)))
+
+
+def draw_statement(count: int, drawn: list[str]) -> Executable:
+    """
+    Build a statement that marks random unused names as used and returns them.
+
+    Names locked by a concurrent draw are skipped.
+    """
+    picked = (
+        select(names.c.name)
+        .where(~names.c.used, not_drawn(drawn))
+        .order_by(func.random())
+        .limit(count)
+        .with_for_update(skip_locked=True)
+        .cte("picked")
+    )
+    return (
+        update(names)
+        .where(names.c.name == picked.c.name)
+        .values(used=True)
+        .returning(names.c.name)
+    )
+
+
+def reset_statement(drawn: list[str]) -> Executable:
+    """Build a statement that starts a new rotation, except for the drawn names."""
+    return update(names).where(names.c.used, not_drawn(drawn)).values(used=False)
+
+
+@router.post("/draw", response_model=list[str])
+async def draw_off_topic_channel_names(
+    count: int = Query(3, ge=1, le=50, description="The number of names to draw."),
+    session: AsyncSession = Depends(get_session),
+) -> list[str]:
+    """
+    Draw random names that weren't used in the current rotation.
+
+    If too few names are left, a new rotation is started, in which the
+    names drawn before the start are already used. Fewer names are only
+    returned if there are fewer names in total.
+    """
+    drawn = list(await session.scalars(draw_statement(count, [])))
+    if len(drawn) < count:
+        await session.execute(reset_statement(drawn))
+        drawn += await session.scalars(draw_statement(count - len(drawn), drawn))
+
+    await session.commit()
+    return drawn
@@ -0,0 +1,59 @@
+"""
+Endpoints for the offensive messages of the bot.
+
+The bot fetches the messages that are due for deletion in
+bulk, deletes them from Discord, and then deletes their rows
+with a single request.
+"""
+
+import datetime
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import BigInteger, any_, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import OffensiveMessage
+
+router = APIRouter(prefix="/offensive_messages", tags=["offensive messages"])
+
+offensive_messages = OffensiveMessage.__table__
+
+
+@router.get("/due", response_model=list[schemas.OffensiveMessage])
+async def list_due_offensive_messages(
+    within: int = Query(
+        0, ge=0, description="Include messages due within this many seconds."
+    ),
+    limit: int = Query(1000, ge=1, le=10_000),
+    session: AsyncSession = Depends(get_session),
+) -> schemas.ORJSONResponse:
+    """List the offensive messages that are due for deletion, oldest first."""
+    result = await session.execute(
+        select(offensive_messages)
+        .where(
+            offensive_messages.c.delete_date
+            <= func.now() + datetime.timedelta(seconds=within)
+        )
+        .order_by(offensive_messages.c.delete_date)
+        .limit(limit)
+    )
+    return schemas.ORJSONResponse(result.mappings().all())
+
+
+@router.delete("", status_code=204, response_class=Response)
+async def delete_offensive_messages(
+    ids: list[int],
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Delete the offensive messages with the given ids, ignoring unknown ids."""
+    await session.execute(
+        delete(offensive_messages).where(
+            offensive_messages.c.id
+            == any_(bindparam("ids", ids, type_=ARRAY(BigInteger)))
+        )
+    )
+    await session.commit()
+    return Response(status_code=204)
@@ -0,0 +1,107 @@
+"""
+Endpoints for the reminders of the bot.
+
+Reminders are delivered by claiming the due ones, sending them,
+and acknowledging the result. Claiming uses `FOR UPDATE SKIP
+LOCKED`, so several clients can poll at the same time without
+ever receiving the same reminder, and a claim is only a lease:
+if a client dies before acknowledging, the reminder can be
+claimed again once its lease has expired.
+"""
+
+import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import Reminder
+
+router = APIRouter(prefix="/reminders", tags=["reminders"])
+
+reminders = Reminder.__table__
+
+
+def claim_statement(limit: int, lease: datetime.timedelta) -> Executable:
+    """
+    Build a statement that claims up to `limit` due reminders.
+
+    The due reminders are found through the partial index on the
+    expiration of active reminders, so a claim costs time in the
+    number of due reminders instead of the number of all reminders.
+    """
+    now = func.now()
+    due = (
+        select(reminders.c.id)
+        .where(
+            reminders.c.active,
+            reminders.c.expiration <= now,
+            or_(reminders.c.claimed_until.is_(None), reminders.c.claimed_until < now),
+        )
+        .order_by(reminders.c.expiration)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(reminders)
+        .where(reminders.c.id.in_(due.scalar_subquery()))
+        .values(claimed_until=now + lease)
+        .returning(*reminders.c)
+    )
+
+
+def ack_statement(reminder_id: int, delivered: bool) -> Executable:
+    """Build a statement that releases the claim on a reminder."""
+    if delivered:
+        values = {"active": False}
+    else:
+        values = {"failures": reminders.c.failures + 1}
+
+    return (
+        update(reminders)
+        .where(reminders.c.id == reminder_id, reminders.c.active)
+        .values(claimed_until=None, **values)
+        .returning(reminders.c.id)
+    )
+
+
+@router.post("/claim", response_model=list[schemas.Reminder])
+async def claim_due_reminders(
+    limit: int = Query(100, ge=1, le=1000),
+    lease: int = Query(60, ge=1, le=3600, description="The lease in seconds."),
+    session: AsyncSession = Depends(get_session),
+) -> schemas.ORJSONResponse:
+    """
+    Claim the due reminders that are not claimed by another client yet.
+
+    Every claimed reminder has to be acknowledged before its lease
+    expires, otherwise it will be handed out again.
+    """
+    result = await session.execute(
+        claim_statement(limit, datetime.timedelta(seconds=lease))
+    )
+    claimed = result.mappings().all()
+    await session.commit()
+    return schemas.ORJSONResponse(claimed)
+
+
+@router.post("/{reminder_id}/ack", status_code=204, response_class=Response)
+async def acknowledge_reminder(
+    reminder_id: int,
+    ack: schemas.ReminderAck,
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """
+    Acknowledge the outcome of sending a claimed reminder.
+
+    A delivered reminder is deactivated. A failed delivery increments
+    the failure count of the reminder and releases it immediately.
+    """
+    result = await session.execute(ack_statement(reminder_id, ack.delivered))
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Active reminder not found.")
+    await session.commit()
+    return Response(status_code=204)
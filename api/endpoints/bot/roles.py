@@ -0,0 +1,102 @@
+"""
+Endpoints for the members of roles.
+
+The roles of a user are stored in the `roles` array of the user,
+which is covered by a GIN index. Members are looked up with the
+array operators the index supports: `roles @> :role_ids` for the
+users with all of the roles, and `roles && :role_ids` for the
+users with any of them. Counting the members of several roles
+is a single aggregate over the users with any of the roles.
+"""
+
+import typing
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import BigInteger, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnElement, Select
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import User
+from api.core.pagination import Pagination, paginate
+
+router = APIRouter(prefix="/roles", tags=["roles"])
+
+# The maximum number of roles in a single query.
+MAX_ROLES = 100
+
+users = User.__table__
+
+
+def has_roles(
+    role_ids: list[int], match_all: bool, name: str = "role_ids"
+) -> ColumnElement:
+    """Build a condition for users with all, or any, of the roles."""
+    operator = "@>" if match_all else "&&"
+    return users.c.roles.op(operator, is_comparison=True)(
+        bindparam(name, role_ids, type_=ARRAY(BigInteger))
+    )
+
+
+def members_query(
+    role_ids: list[int], match_all: bool, in_guild: typing.Optional[bool]
+) -> Select:
+    """Select the users with all, or any, of the roles."""
+    query = select(users).where(has_roles(role_ids, match_all))
+    if in_guild is not None:
+        query = query.where(users.c.in_guild == in_guild)
+    return query
+
+
+def counts_query(role_ids: list[int], in_guild: typing.Optional[bool]) -> Select:
+    """Count the members of every role, and of any and all of the roles."""
+    query = select(
+        func.count().label("any"),
+        func.count().filter(has_roles(role_ids, match_all=True)).label("all"),
+        *(
+            func.count()
+            .filter(has_roles([role_id], match_all=True, name=f"role_{index}"))
+            .label(f"role_{index}")
+            for index, role_id in enumerate(role_ids)
+        ),
+    ).where(has_roles(role_ids, match_all=False, name="any_role_ids"))
+    if in_guild is not None:
+        query = query.where(users.c.in_guild == in_guild)
+    return query
+
+
+@router.get("/members", response_model=schemas.Page[schemas.User])
+async def list_role_members(
+    role_ids: list[int] = Query(..., alias="role_id", min_items=1, max_items=MAX_ROLES),
+    match_all: bool = Query(
+        True, description="Require all of the roles, instead of any of them."
+    ),
+    in_guild: typing.Optional[bool] = None,
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_session),
+) -> schemas.ORJSONResponse:
+    """List the users with all, or any, of the given roles, ordered by their id."""
+    query = members_query(role_ids, match_all, in_guild)
+    return schemas.ORJSONResponse(
+        await paginate(session, query, users.c.id, pagination)
+    )
+
+
+@router.get("/counts", response_model=schemas.RoleCounts)
+async def count_role_members(
+    role_ids: list[int] = Query(..., alias="role_id", min_items=1, max_items=MAX_ROLES),
+    in_guild: typing.Optional[bool] = None,
+    session: AsyncSession = Depends(get_session),
+) -> dict:
+    """Count the users with each of the given roles, and with any and all of them."""
+    role_ids = list(dict.fromkeys(role_ids))
+    counts = (await session.execute(counts_query(role_ids, in_guild))).mappings().one()
+    return {
+        "any": counts["any"],
+        "all": counts["all"],
+        "roles": {
+            role_id: counts[f"role_{index}"] for index, role_id in enumerate(role_ids)
+        },
+    }
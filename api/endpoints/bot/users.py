@@ -0,0 +1,200 @@
+"""
+Endpoints for the users known to the bot.
+
+The bot synchronizes the full member list of our guild on
+startup and whenever it reconnects. To keep that cheap, the
+bulk endpoints validate the whole request body up front and
+write the users with a few chunked statements instead of a
+statement per user.
+
+The effective permissions of users are resolved from the role
+snapshot in `api.core.role_snapshot`, so resolving them only
+takes a query for the roles of the users.
+"""
+
+import typing
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    SmallInteger,
+    String,
+    any_,
+    bindparam,
+    column,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+
+from api.core import schemas
+from api.core.database import get_session
+from api.core.database.models.api.bot import User
+from api.core.role_snapshot import role_snapshot
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+# The number of users written per statement. Every user in an upsert
+# takes five bind parameters, which keeps a chunk well below the limit
+# of 32767 parameters per statement imposed by PostgreSQL.
+CHUNK_SIZE = 1000
+
+# The columns that are written when an existing user is updated.
+UPDATABLE_COLUMNS = ("name", "discriminator", "in_guild", "roles")
+
+users = User.__table__
+
+
+def chunked(rows: list[dict], size: int = CHUNK_SIZE) -> typing.Iterator[list[dict]]:
+    """Yield successive chunks of `size` rows."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def upsert_statement(rows: list[dict]) -> Executable:
+    """
+    Build an `INSERT ... ON CONFLICT (id) DO UPDATE` statement for the given rows.
+
+    Rows that would not change are left alone by the `WHERE` clause of the
+    update, so they are not returned. Every returned row holds a `created`
+    flag, based on the `xmax` system column being zero for fresh inserts.
+    """
+    statement = insert(users).values(rows)
+    excluded = statement.excluded
+
+    return statement.on_conflict_do_update(
+        index_elements=[users.c.id],
+        set_={name: excluded[name] for name in UPDATABLE_COLUMNS},
+        where=tuple_(*(users.c[name] for name in UPDATABLE_COLUMNS)).is_distinct_from(
+            tuple_(*(excluded[name] for name in UPDATABLE_COLUMNS))
+        ),
+    ).returning(literal_column("xmax = 0", Boolean).label("created"))
+
+
+def patch_statement() -> Executable:
+    """
+    Build an `UPDATE` statement that applies a JSON array of partial users.
+
+    The rows are expanded server-side with `jsonb_to_recordset`, so a whole
+    chunk is sent as a single bind parameter named `rows`. Fields missing
+    from a row keep their current value, and users that would not change
+    are not touched. The ids of the updated users are returned.
+    """
+    patch = (
+        func.jsonb_to_recordset(bindparam("rows", type_=JSONB))
+        .table_valued(
+            column("id", BigInteger),
+            column("name", String),
+            column("discriminator", SmallInteger),
+            column("in_guild", Boolean),
+            column("roles", ARRAY(BigInteger)),
+        )
+        .render_derived(name="patch", with_types=True)
+    )
+    values = {
+        name: func.coalesce(patch.c[name], users.c[name]) for name in UPDATABLE_COLUMNS
+    }
+
+    return (
+        update(users)
+        .where(users.c.id == patch.c.id)
+        .where(
+            tuple_(*(users.c[name] for name in UPDATABLE_COLUMNS)).is_distinct_from(
+                tuple_(*values.values())
+            )
+        )
+        .values(values)
+        .returning(users.c.id)
+    )
+
+
+@router.put("/bulk", response_model=schemas.BulkUserResult)
+async def bulk_upsert_users(
+    body: list[schemas.User],
+    session: AsyncSession = Depends(get_session),
+) -> dict[str, int]:
+    """
+    Create or update all given users in a single transaction.
+
+    If a user id is given multiple times, the last occurrence wins.
+    """
+    rows = list({user.id: user.dict() for user in body}.values())
+    created = updated = 0
+
+    for chunk in chunked(rows):
+        result = await session.execute(upsert_statement(chunk))
+        for was_created in result.scalars():
+            if was_created:
+                created += 1
+            else:
+                updated += 1
+
+    await session.commit()
+    return {
+        "created": created,
+        "updated": updated,
+        "unchanged": len(rows) - created - updated,
+    }
+
+
+@router.patch("/bulk", response_model=schemas.BulkUserResult)
+async def bulk_patch_users(
+    body: list[schemas.PartialUser],
+    session: AsyncSession = Depends(get_session),
+) -> dict[str, int]:
+    """
+    Update the given fields of existing users in a single transaction.
+
+    Responds with a 404 listing the unknown ids if any of the users
+    does not exist, in which case no user is updated.
+    """
+    rows = list({user.id: user.dict(exclude_unset=True) for user in body}.values())
+    ids = [row["id"] for row in rows]
+
+    existing = await session.scalars(
+        select(users.c.id).where(
+            users.c.id == any_(bindparam("ids", ids, type_=ARRAY(BigInteger)))
+        )
+    )
+    missing = set(ids).difference(existing)
+    if missing:
+        raise HTTPException(status_code=404, detail={"missing": sorted(missing)})
+
+    updated = 0
+    statement = patch_statement()
+    for chunk in chunked(rows):
+        result = await session.execute(statement, {"rows": chunk})
+        updated += len(result.all())
+
+    await session.commit()
+    return {"created": 0, "updated": updated, "unchanged": len(rows) - updated}
+
+
+@router.post("/permissions", response_model=list[schemas.UserPermissions])
+async def resolve_user_permissions(
+    user_ids: list[int], session: AsyncSession = Depends(get_session)
+) -> schemas.ORJSONResponse:
+    """
+    Resolve the effective permissions and the top role of the given users.
+
+    Unknown users are left out of the response, and roles that are not
+    known are ignored.
+    """
+    await role_snapshot.load(session)
+    result = await session.execute(
+        select(users.c.id, users.c.roles)
+        .where(users.c.id == any_(bindparam("ids", user_ids, type_=ARRAY(BigInteger))))
+        .order_by(users.c.id)
+    )
+    return schemas.ORJSONResponse(
+        [
+            {"id": user_id, **role_snapshot.resolve(role_ids)._asdict()}
+            for user_id, role_ids in result
+        ]
+    )
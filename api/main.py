@@ -9,34 +9,90 @@ The app is initialized with the TokenAuthentication back-end
 that defaults to requiring authentication on *all* endpoints,
 except the `/docs` and the /openapi.json endpoint manifest
 in DEBUG mode.
+
+Each worker process creates its own pooled database engine
+and starts its background tasks on startup, and stops them
+again on shutdown.
 """
 
 import datetime
 import typing
 
-from fastapi import FastAPI
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from starlette.middleware.authentication import AuthenticationMiddleware
-
+from fastapi import FastAPI, Response
 
-from api.core.middleware import TokenAuthentication, on_auth_error
-from api.core.schemas import ErrorMessage, HealthCheck
+from api import endpoints
+from api.core import purge
+from api.core.database import engine
+from api.core.database.notifications import listener
+from api.core.health import readiness_check
+from api.core.metrics import METRICS_MEDIA_TYPE, instrument_engine, render_metrics
+from api.core.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    QueryInspectionMiddleware,
+    TokenAuthentication,
+    TokenAuthenticationMiddleware,
+)
+from api.core.schemas import (
+    ErrorMessage,
+    HealthCheck,
+    Liveness,
+    ORJSONResponse,
+    Readiness,
+)
 from api.core.settings import settings
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Compress large responses for clients that accept it.
+app.add_middleware(CompressionMiddleware)
 
 # Add our middleware that will try to authenticate
 # all requests, excluding /docs and /openapi.json
 # in DEBUG mode.
 app.add_middleware(
-    AuthenticationMiddleware,
-    backend=TokenAuthentication(token=settings.auth_token),
-    on_error=on_auth_error,
+    TokenAuthenticationMiddleware,
+    backend=TokenAuthentication(
+        token=settings.auth_token, scoped_tokens=settings.auth_tokens
+    ),
 )
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(bind=engine)
+# Look out for N+1 and slow queries. Added before the metrics middleware,
+# so that it runs inside of it and shares its query stats.
+if settings.query_inspection or settings.DEBUG:
+    app.add_middleware(QueryInspectionMiddleware)
+
+# Measure every request, including those that failed to authenticate.
+app.add_middleware(MetricsMiddleware)
+
+app.include_router(endpoints.router)
+
+
+@app.on_event("startup")
+async def connect_database() -> None:
+    """Create the database engine of this worker process."""
+    await engine.connect()
+    instrument_engine(engine.get_engine())
+
+
+@app.on_event("startup")
+async def start_background_tasks() -> None:
+    """Start the background tasks of this worker process."""
+    listener.start()
+    purge.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks() -> None:
+    """Stop the background tasks of this worker process."""
+    await purge.stop()
+    await listener.stop()
+
+
+@app.on_event("shutdown")
+async def disconnect_database() -> None:
+    """Close all pooled database connections of this worker process."""
+    await engine.disconnect()
 
 
 @app.get("/", response_model=HealthCheck, responses={403: {"model": ErrorMessage}})
@@ -47,3 +103,28 @@ async def health_check() -> dict[str, typing.Union[str, int, list[str]]]:
         "commit_sha": settings.commit_sha,
         "timestamp": datetime.datetime.utcnow().timestamp(),
     }
+
+
+@app.get("/health/live", response_model=Liveness)
+async def liveness_probe() -> dict[str, bool]:
+    """Report that this worker process is able to handle requests at all."""
+    return {"alive": True}
+
+
+@app.get(
+    "/health/ready", response_model=Readiness, responses={503: {"model": Readiness}}
+)
+async def readiness_probe() -> ORJSONResponse:
+    """
+    Report whether this worker process is ready to receive traffic.
+
+    The response status is 503 if any of the checks failed.
+    """
+    readiness = await readiness_check.check()
+    return ORJSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose the metrics of all worker processes to Prometheus."""
+    return Response(render_metrics(), media_type=METRICS_MEDIA_TYPE)
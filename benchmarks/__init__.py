@@ -0,0 +1 @@
+"""Micro-benchmarks of code that runs on every request."""
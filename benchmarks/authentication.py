@@ -0,0 +1,99 @@
+"""
+Benchmark the per-request overhead of authentication.
+
+Compares Starlette's `AuthenticationMiddleware` wrapping the
+`TokenAuthentication` back-end with `TokenAuthenticationMiddleware`,
+for authenticated and refused requests, around an app that does
+nothing. Run with `poetry run task benchmark-auth`.
+"""
+
+import asyncio
+import time
+import typing
+
+from starlette.middleware.authentication import AuthenticationMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.middleware import (
+    TokenAuthentication,
+    TokenAuthenticationMiddleware,
+    on_auth_error,
+)
+from api.core.settings import ScopedToken
+
+TOKEN = "benchmark_token"
+REQUESTS = 100_000
+
+
+async def app(_scope: Scope, _receive: Receive, _send: Send) -> None:
+    """Do nothing, so only the middleware is measured."""
+
+
+async def receive() -> Message:
+    """Receive an empty request body."""
+    return {"type": "http.request", "body": b""}
+
+
+async def send(_message: Message) -> None:
+    """Discard the response."""
+
+
+def make_scope(token: str) -> Scope:
+    """Build the scope of a request with the typical headers of the bot."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/bot/reminders",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "server": ("testserver", 80),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"user-agent", b"python-httpx/0.18.2"),
+            (b"accept", b"*/*"),
+            (b"accept-encoding", b"gzip, deflate"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+    }
+
+
+async def measure(middleware: ASGIApp, token: str) -> float:
+    """Return the mean time in microseconds the middleware takes per request."""
+    template = make_scope(token)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await middleware(dict(template), receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+async def main() -> None:
+    """Print the overhead of both middlewares."""
+    backend = TokenAuthentication(
+        TOKEN,
+        scoped_tokens=[
+            ScopedToken(name="site", token="site_token", scopes=["read"]),
+            ScopedToken(name="scraper", token="metrics_token", scopes=["metrics"]),
+        ],
+    )
+    middlewares: dict[str, ASGIApp] = {
+        "AuthenticationMiddleware": AuthenticationMiddleware(
+            app, backend=backend, on_error=on_auth_error
+        ),
+        "TokenAuthenticationMiddleware": TokenAuthenticationMiddleware(
+            app, backend=backend
+        ),
+    }
+    cases: typing.Iterable[tuple[str, str]] = (
+        ("authenticated", TOKEN),
+        ("refused", "invalid"),
+    )
+
+    for case, token in cases:
+        for name, middleware in middlewares.items():
+            overhead = await measure(middleware, token)
+            print(f"{case:>13} {name:<29} {overhead:6.2f} µs per request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
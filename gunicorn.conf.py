@@ -1,5 +1,8 @@
 """Configuration file for Gunicorn."""
 
+import os
+import shutil
+
 bind = "0.0.0.0:8000"
 wsgi_app = "api.main:app"
 worker_class = "uvicorn.workers.UvicornWorker"
@@ -9,3 +12,21 @@ max_requests_jitter = 512
 user = 61000
 group = 61000
 worker_temp_dir = "/dev/shm"
+
+# The workers write their metrics to this directory, see `api.core.metrics`.
+# It has to be set before `prometheus_client` is imported by any process.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/dev/shm/api-metrics")
+
+
+def on_starting(_server) -> None:  # noqa: ANN001
+    """Clear the metrics of a previous run."""
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def child_exit(_server, worker) -> None:  # noqa: ANN001
+    """Drop the live gauges of a worker that exited."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
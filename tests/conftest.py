@@ -0,0 +1,38 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.core import settings
+from api.core.cache import response_cache
+from api.core.database import get_session
+from api.main import app
+
+
+@pytest.fixture
+def session() -> AsyncMock:
+    """Override the database session of all endpoints with a mock."""
+    session = AsyncMock(spec=AsyncSession)
+    app.dependency_overrides[get_session] = lambda: session
+    yield session
+    app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    """Start every test with an empty response cache."""
+    response_cache.invalidate()
+
+
+@pytest.fixture
+def client() -> httpx.AsyncClient:
+    """Return an authenticated client that sends its requests to the app."""
+    client = httpx.AsyncClient(
+        app=app,
+        base_url="http://testserver",
+        headers={"Authorization": f"Bearer {settings.auth_token}"},
+    )
+    yield client
+    asyncio.run(client.aclose())
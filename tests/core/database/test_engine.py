@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from api.core import settings
+from api.core.database import engine
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def clean_engine() -> None:
+    """Make sure every test starts without a running engine."""
+    with patch.multiple(engine, _engine=None, _session_factory=None):
+        yield
+
+
+def test_engine_pool_uses_settings() -> None:
+    """Test that the pool of a new engine is sized from the settings."""
+    with patch.multiple(
+        settings,
+        database_pool_size=3,
+        database_max_overflow=2,
+        database_pool_recycle=60,
+    ):
+        async_engine = engine.create_engine()
+
+    assert isinstance(async_engine, AsyncEngine)
+    pool = async_engine.sync_engine.pool
+    assert pool.size() == 3
+    assert pool._max_overflow == 2
+    assert pool._recycle == 60
+
+
+def test_get_engine_before_startup_raises() -> None:
+    """Test that requesting the engine before startup is an error."""
+    with pytest.raises(RuntimeError):
+        engine.get_engine()
+
+
+async def test_connect_creates_a_single_engine() -> None:
+    """Test that connecting twice keeps the engine of the first call."""
+    await engine.connect()
+    first = engine.get_engine()
+    await engine.connect()
+
+    assert engine.get_engine() is first
+
+
+async def test_disconnect_removes_engine() -> None:
+    """Test that the engine is no longer available after disconnecting."""
+    await engine.connect()
+    await engine.disconnect()
+
+    with pytest.raises(RuntimeError):
+        engine.get_engine()
+
+
+async def test_get_session_yields_async_session() -> None:
+    """Test that the session dependency is bound to the shared engine."""
+    await engine.connect()
+    sessions = engine.get_session()
+    session = await sessions.__anext__()
+
+    assert isinstance(session, AsyncSession)
+    assert session.bind is engine.get_engine()
+
+    with pytest.raises(StopAsyncIteration):
+        await sessions.__anext__()
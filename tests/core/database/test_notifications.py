@@ -0,0 +1,49 @@
+from unittest.mock import Mock
+
+from api.core.database.notifications import NotificationListener
+
+
+def test_dispatch_calls_channel_subscribers() -> None:
+    """Test that a notification is passed to the subscribers of its channel."""
+    listener = NotificationListener()
+    lemons, ducks = Mock(), Mock()
+    listener.subscribe("lemons", lemons)
+    listener.subscribe("ducks", ducks)
+
+    listener._dispatch(Mock(), 1, "lemons", "payload")
+
+    lemons.assert_called_once_with("payload")
+    ducks.assert_not_called()
+
+
+def test_failing_subscriber_does_not_stop_dispatch() -> None:
+    """Test that a failing subscriber does not affect the other subscribers."""
+    listener = NotificationListener()
+    subscriber = Mock()
+    listener.subscribe("lemons", Mock(side_effect=RuntimeError))
+    listener.subscribe("lemons", subscriber)
+
+    listener._dispatch(Mock(), 1, "lemons", "payload")
+
+    subscriber.assert_called_once_with("payload")
+
+
+def test_resynchronize_notifies_all_subscribers() -> None:
+    """Test that all subscribers are told to resynchronize after a reconnect."""
+    listener = NotificationListener()
+    lemons, ducks = Mock(), Mock()
+    listener.subscribe("lemons", lemons)
+    listener.subscribe("ducks", ducks)
+
+    listener._resynchronize()
+
+    lemons.assert_called_once_with(None)
+    ducks.assert_called_once_with(None)
+
+
+def test_start_without_subscribers_does_nothing() -> None:
+    """Test that no connection is opened if nothing subscribed."""
+    listener = NotificationListener()
+    listener.start()
+
+    assert listener._task is None
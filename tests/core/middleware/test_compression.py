@@ -0,0 +1,152 @@
+import gzip
+import typing
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from api.core.middleware import CompressionMiddleware, skip_compression
+from api.core.middleware.compression import GzipEncoder, negotiate_encoding
+
+
+pytestmark = pytest.mark.asyncio
+
+LARGE_BODY = "lemon " * 1000
+
+
+async def large(_request: Request) -> Response:
+    """Respond with a body above the minimum size."""
+    return PlainTextResponse(LARGE_BODY)
+
+
+async def tagged(request: Request) -> Response:
+    """Respond with a body of the size in the path and a strong ETag."""
+    size = request.path_params["size"]
+    return PlainTextResponse("l" * size, headers={"ETag": '"lemon"'})
+
+
+async def small(_request: Request) -> Response:
+    """Respond with a body below the minimum size."""
+    return PlainTextResponse("lemon")
+
+
+@skip_compression
+async def opted_out(_request: Request) -> Response:
+    """Respond with a large body that must not be compressed."""
+    return PlainTextResponse(LARGE_BODY)
+
+
+async def streamed(_request: Request) -> Response:
+    """Stream a large body in small chunks."""
+
+    async def chunks() -> typing.AsyncIterator[bytes]:
+        for _ in range(1000):
+            yield b"lemon "
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def events(_request: Request) -> Response:
+    """Respond with a large event stream."""
+    return PlainTextResponse(LARGE_BODY, media_type="text/event-stream")
+
+
+app = Starlette(
+    routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/tagged/{size:int}", tagged),
+        Route("/opted_out", opted_out),
+        Route("/streamed", streamed),
+        Route("/events", events),
+    ]
+)
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+async def get(path: str, accept_encoding: str = "gzip") -> httpx.Response:
+    """Request a path of the test app."""
+    async with httpx.AsyncClient(app=app, base_url="http://testserver") as client:
+        return await client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("deflate", None),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("GZIP;q=0.5, identity", "gzip"),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(
+    accept_encoding: str, expected: typing.Optional[str]
+) -> None:
+    """Test that the encoding is negotiated from the accepted encodings."""
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+async def test_large_response_is_compressed() -> None:
+    """Test that a response above the minimum size is compressed."""
+    response = await get("/large")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.text == LARGE_BODY
+
+
+async def test_small_response_is_not_compressed() -> None:
+    """Test that a response below the minimum size is sent as it is."""
+    response = await get("/small")
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Content-Length"] == "5"
+    assert response.text == "lemon"
+
+
+async def test_streamed_response_is_compressed() -> None:
+    """Test that small streamed chunks are buffered and then compressed."""
+    response = await get("/streamed")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == LARGE_BODY
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [("/tagged/1000", 'W/"lemon"'), ("/tagged/10", '"lemon"')],
+)
+async def test_compressed_response_has_weak_etag(path: str, expected: str) -> None:
+    """Test that the ETag is made weak only if the response is compressed."""
+    response = await get(path)
+
+    assert response.headers["ETag"] == expected
+
+
+@pytest.mark.parametrize("path", ["/opted_out", "/events"])
+async def test_uncompressed_responses(path: str) -> None:
+    """Test that opted out routes and event streams are not compressed."""
+    response = await get(path)
+
+    assert "Content-Encoding" not in response.headers
+    assert response.text == LARGE_BODY
+
+
+async def test_client_without_gzip() -> None:
+    """Test that clients that don't accept gzip get uncompressed responses."""
+    response = await get("/large", accept_encoding="identity")
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_gzip_body_is_valid() -> None:
+    """Test that the compressed chunks form a single valid gzip stream."""
+    encoder = GzipEncoder()
+    body = encoder.compress(b"lemon ") + encoder.compress(b"tree") + encoder.finish()
+
+    assert gzip.decompress(body) == b"lemon tree"
@@ -0,0 +1,61 @@
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from api.core.metrics import query_stats
+from api.core.middleware import MetricsMiddleware
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def lemon(_request: Request) -> Response:
+    """Respond after running two queries."""
+    query_stats.get().count += 2
+    return PlainTextResponse("lemon", status_code=201)
+
+
+app = Starlette(routes=[Route("/lemons/{lemon_id}", lemon)])
+app.add_middleware(MetricsMiddleware)
+
+
+def sample(name: str, **labels: str) -> float:
+    """Return the current value of a sample, or zero."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def get(path: str) -> httpx.Response:
+    """Request a path of the test app."""
+    async with httpx.AsyncClient(app=app, base_url="http://testserver") as client:
+        return await client.get(path)
+
+
+async def test_requests_are_labelled_by_route_template() -> None:
+    """Test that requests are measured by route template and status."""
+    labels = {"method": "GET", "route": "/lemons/{lemon_id}", "status": "201"}
+    before = sample("api_request_duration_seconds_count", **labels)
+    queries_before = sample("api_request_queries_sum", route="/lemons/{lemon_id}")
+
+    await get("/lemons/1")
+    await get("/lemons/2")
+
+    assert sample("api_request_duration_seconds_count", **labels) == before + 2
+    assert (
+        sample("api_request_queries_sum", route="/lemons/{lemon_id}")
+        == queries_before + 4
+    )
+    assert sample("api_requests_in_progress", method="GET") == 0
+
+
+async def test_unmatched_requests_share_a_label() -> None:
+    """Test that unknown paths don't create a time series each."""
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("api_request_duration_seconds_count", **labels)
+
+    await get("/oranges")
+
+    assert sample("api_request_duration_seconds_count", **labels) == before + 1
@@ -0,0 +1,92 @@
+import logging
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from api.core import settings
+from api.core.metrics import QueryStats, query_stats
+from api.core.middleware import QueryInspectionMiddleware
+from api.core.middleware.query_inspection import QUERY_COUNT_HEADER, query_problems
+
+
+pytestmark = pytest.mark.asyncio
+
+USER_QUERY = "SELECT api_user.name FROM api_user WHERE api_user.id = $1"
+NORMALIZED_USER_QUERY = "SELECT api_user.name FROM api_user WHERE api_user.id = ?"
+
+
+async def n_plus_one(_request: Request) -> Response:
+    """Respond after loading the users of ten infractions one by one."""
+    stats = query_stats.get()
+    stats.record("SELECT api_infraction.user_id FROM api_infraction", 0.01)
+    for _ in range(10):
+        stats.record(USER_QUERY, 0.001)
+    return PlainTextResponse("lemon")
+
+
+app = Starlette(routes=[Route("/infractions", n_plus_one)])
+app.add_middleware(QueryInspectionMiddleware)
+
+
+async def get(path: str) -> httpx.Response:
+    """Request a path of the test app."""
+    async with httpx.AsyncClient(app=app, base_url="http://testserver") as client:
+        return await client.get(path)
+
+
+def test_repeated_statements_are_grouped() -> None:
+    """Test that statements differing only by parameters are grouped."""
+    stats = QueryStats()
+    stats.inspect_statements()
+    for parameters in ("$1", "$1, $2", "$1, $2, $3"):
+        stats.record(f"SELECT * FROM api_user WHERE id IN ({parameters})", 0.001)
+
+    assert list(stats.statements.values()) == [3]
+
+
+def test_slow_and_frequent_queries_are_problems() -> None:
+    """Test that every threshold that was exceeded is reported."""
+    stats = QueryStats()
+    stats.inspect_statements()
+    stats.record("SELECT pg_sleep(1)", 1.0)
+    for _ in range(6):
+        stats.record(USER_QUERY, 0.001)
+
+    with patch.multiple(
+        settings,
+        query_inspection_max_queries=5,
+        query_inspection_max_repeats=5,
+        slow_query_threshold=0.5,
+    ):
+        problems = query_problems(stats)
+
+    assert problems == [
+        "7 queries",
+        f"6 executions of {NORMALIZED_USER_QUERY}",
+        "1.000s for SELECT pg_sleep(1)",
+    ]
+
+
+async def test_n_plus_one_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a request repeating a statement is logged."""
+    with caplog.at_level(logging.WARNING):
+        await get("/infractions")
+
+    assert "GET /infractions: 11 queries" not in caplog.text
+    assert f"10 executions of {NORMALIZED_USER_QUERY}" in caplog.text
+
+
+async def test_query_count_header_in_debug() -> None:
+    """Test that the query count is only sent in DEBUG mode."""
+    with patch.object(settings, "DEBUG", True):
+        response = await get("/infractions")
+    assert response.headers[QUERY_COUNT_HEADER] == "11"
+
+    with patch.object(settings, "DEBUG", False):
+        response = await get("/infractions")
+    assert QUERY_COUNT_HEADER not in response.headers
@@ -3,30 +3,39 @@ import json
 import typing
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 from hypothesis import assume, given
 from hypothesis.strategies import text
+from starlette.applications import Starlette
 from starlette.authentication import AuthCredentials, AuthenticationError, SimpleUser
-from starlette.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
 
 from api.core import settings
-from api.core.middleware import TokenAuthentication
+from api.core.middleware import TokenAuthentication, TokenAuthenticationMiddleware
 from api.core.middleware.token_authentication import (
+    INSUFFICIENT_SCOPE,
     INVALID_CREDENTIALS,
     NO_AUTHORIZATION_HEADER,
     NO_AUTH_DEBUG_ENDPOINTS,
+    NO_AUTH_ENDPOINTS,
     on_auth_error,
 )
-
+from api.core.settings import ScopedToken
 
 pytestmark = pytest.mark.asyncio
 
 API_TOKEN = "api_token_only_for_testing"
+SITE_TOKEN = "site_token_only_for_testing"
+METRICS_TOKEN = "metrics_token_only_for_testing"
 
 
-def create_request(path: str, token: typing.Optional[str]) -> Mock:
+def create_request(path: str, token: typing.Optional[str], method: str = "GET") -> Mock:
     """Create a mocked Request with a path and optional authorization header."""
     request = Mock()
+    request.scope = {"type": "http", "method": method}
     request.url.path = path
     request.headers = {}
 
@@ -39,7 +48,13 @@ def create_request(path: str, token: typing.Optional[str]) -> Mock:
 @pytest.fixture(scope="module")
 def auth_middleware() -> TokenAuthentication:
     """Return a TokenAuthentication back-end with a fixed token."""
-    return TokenAuthentication(API_TOKEN)
+    return TokenAuthentication(
+        API_TOKEN,
+        scoped_tokens=[
+            ScopedToken(name="site", token=SITE_TOKEN, scopes=["read"]),
+            ScopedToken(name="scraper", token=METRICS_TOKEN, scopes=["metrics"]),
+        ],
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -81,7 +96,7 @@ async def test_authentication_fails_with_incorrect_token(
     invalid_token: str,
 ) -> None:
     """Test authentication with an invalid token."""
-    assume(invalid_token != API_TOKEN)
+    assume(invalid_token not in (API_TOKEN, SITE_TOKEN, METRICS_TOKEN))
 
     request = create_request("/", invalid_token)
     with pytest.raises(AuthenticationError) as exc:
@@ -90,6 +105,59 @@ async def test_authentication_fails_with_incorrect_token(
     assert INVALID_CREDENTIALS in exc.value.args
 
 
+async def test_credentials_are_reused(auth_middleware: TokenAuthentication) -> None:
+    """Test that the same credentials are returned for every request."""
+    first = await auth_middleware.authenticate(create_request("/", API_TOKEN))
+    second = await auth_middleware.authenticate(create_request("/", API_TOKEN))
+
+    assert first[0] is second[0]
+    assert first[1] is second[1]
+
+
+@pytest.mark.parametrize(
+    argnames=("token", "username", "scopes", "method", "path"),
+    argvalues=(
+        (API_TOKEN, "api_client", ["authenticated"], "DELETE", "/bot/reminders/1"),
+        (SITE_TOKEN, "site", ["read"], "GET", "/bot/reminders"),
+        (SITE_TOKEN, "site", ["read"], "HEAD", "/metrics"),
+        (METRICS_TOKEN, "scraper", ["metrics"], "GET", "/metrics"),
+    ),
+)
+async def test_scoped_token_access(
+    auth_middleware: TokenAuthentication,
+    token: str,
+    username: str,
+    scopes: list[str],
+    method: str,
+    path: str,
+) -> None:
+    """Test that every token is authenticated with its own scopes."""
+    request = create_request(path, token, method)
+    credentials, user = await auth_middleware.authenticate(request)
+
+    assert credentials.scopes == scopes
+    assert user.username == username
+
+
+@pytest.mark.parametrize(
+    argnames=("token", "method", "path"),
+    argvalues=(
+        (SITE_TOKEN, "POST", "/bot/reminders"),
+        (METRICS_TOKEN, "GET", "/bot/reminders"),
+        (METRICS_TOKEN, "POST", "/metrics"),
+    ),
+)
+async def test_scoped_token_outside_of_scope(
+    auth_middleware: TokenAuthentication, token: str, method: str, path: str
+) -> None:
+    """Test that a token is refused outside of its scopes."""
+    request = create_request(path, token, method)
+    with pytest.raises(AuthenticationError) as exc:
+        await auth_middleware.authenticate(request)
+
+    assert INSUFFICIENT_SCOPE in exc.value.args
+
+
 @pytest.mark.parametrize(
     argnames=("debug_path", "token"),
     argvalues=itertools.product(
@@ -113,6 +181,19 @@ async def test_debug_unauthenticated_access(
     assert user.username == "api_client"
 
 
+@pytest.mark.parametrize("probe_path", NO_AUTH_ENDPOINTS)
+async def test_probes_are_unauthenticated(
+    auth_middleware: TokenAuthentication, probe_path: str
+) -> None:
+    """Test that the orchestrator can probe without a token."""
+    request = create_request(probe_path, None)
+
+    credentials, user = await auth_middleware.authenticate(request)
+
+    assert credentials.scopes == ["probe"]
+    assert user.username == "probe"
+
+
 def test_on_auth_error_serialized_exception_message() -> None:
     """Test the serialization of an auth error as JSON."""
     error_message = "Error message"
@@ -123,3 +204,58 @@ def test_on_auth_error_serialized_exception_message() -> None:
     assert isinstance(response, JSONResponse)
     assert response.status_code == 403
     assert json.loads(response.body) == {"error": error_message}
+
+
+async def whoami(request: Request) -> Response:
+    """Respond with the name and scopes of the authenticated client."""
+    return PlainTextResponse(f"{request.user.username} {request.auth.scopes}")
+
+
+@pytest.fixture
+def asgi_client(auth_middleware: TokenAuthentication) -> httpx.AsyncClient:
+    """Return a client of an app behind the authentication middleware."""
+    app = Starlette(routes=[Route("/{path:path}", whoami, methods=["GET", "POST"])])
+    app = TokenAuthenticationMiddleware(app, backend=auth_middleware)
+    return httpx.AsyncClient(app=app, base_url="http://testserver")
+
+
+async def test_middleware_sets_identity(asgi_client: httpx.AsyncClient) -> None:
+    """Test that the middleware sets the client of the request in the scope."""
+    response = await asgi_client.get(
+        "/bot/reminders", headers={"Authorization": f"Bearer {SITE_TOKEN}"}
+    )
+
+    assert response.status_code == 200
+    assert response.text == "site ['read']"
+
+
+@pytest.mark.parametrize(
+    argnames=("headers", "method", "error"),
+    argvalues=(
+        ({}, "GET", NO_AUTHORIZATION_HEADER),
+        ({"Authorization": "Bearer invalid token"}, "GET", INVALID_CREDENTIALS),
+        ({"Authorization": f"Bearer {SITE_TOKEN}"}, "POST", INSUFFICIENT_SCOPE),
+    ),
+)
+async def test_middleware_refuses_request(
+    asgi_client: httpx.AsyncClient, headers: dict, method: str, error: str
+) -> None:
+    """Test that the middleware refuses requests like `on_auth_error`."""
+    response = await asgi_client.request(method, "/bot/reminders", headers=headers)
+    expected = on_auth_error(create_request("/", None), AuthenticationError(error))
+
+    assert response.status_code == expected.status_code
+    assert response.content == expected.body
+    assert response.headers["content-type"] == "application/json"
+
+
+async def test_middleware_skips_debug_endpoints(
+    asgi_client: httpx.AsyncClient, mock_settings: Mock
+) -> None:
+    """Test that the docs don't need a token in DEBUG mode."""
+    mock_settings.DEBUG = True
+
+    response = await asgi_client.get("/docs")
+
+    assert response.status_code == 200
+    assert response.text == "api_client ['debug']"
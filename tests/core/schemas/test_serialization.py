@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+from sqlalchemy.engine.result import result_tuple
+
+from api.core.schemas import ErrorMessage, ORJSONResponse, dumps
+
+
+class Unserializable:
+    """An object that can't be serialized."""
+
+
+def test_dumps_mappings_and_models() -> None:
+    """Test that mappings, models and sets are serialized like dicts and lists."""
+    content = {
+        "mapping": {1: "one"},
+        "model": ErrorMessage(error="Nope"),
+        "set": {1},
+        "date": datetime.datetime(2021, 11, 7, tzinfo=datetime.timezone.utc),
+    }
+
+    assert dumps(content) == (
+        b'{"mapping":{"1":"one"},"model":{"error":"Nope"},'
+        b'"set":[1],"date":"2021-11-07T00:00:00+00:00"}'
+    )
+
+
+def test_dumps_rows() -> None:
+    """Test that SQLAlchemy rows and row mappings are serialized by column name."""
+    row = result_tuple(["id", "name"])((1, "lemon"))
+
+    assert dumps([row, row._mapping]) == (
+        b'[{"id":1,"name":"lemon"},{"id":1,"name":"lemon"}]'
+    )
+
+
+def test_dumps_rejects_unknown_types() -> None:
+    """Test that unknown types are not silently serialized."""
+    with pytest.raises(TypeError):
+        dumps(Unserializable())
+
+
+def test_response_renders_with_orjson() -> None:
+    """Test that the response class renders compact JSON."""
+    response = ORJSONResponse({"a": [1, 2]})
+
+    assert response.body == b'{"a":[1,2]}'
+    assert response.media_type == "application/json"
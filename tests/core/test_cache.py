@@ -0,0 +1,118 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from api.core.cache import (
+    CACHE_CHANNEL,
+    ResponseCache,
+    cached_response,
+    commit_and_invalidate,
+    etag_matches,
+    response_cache,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def create_request(path: str, if_none_match: str = None) -> Mock:
+    """Create a mocked Request with an optional `If-None-Match` header."""
+    request = Mock()
+    request.url.path = path
+    request.url.query = ""
+    request.headers = {}
+    if if_none_match is not None:
+        request.headers["If-None-Match"] = if_none_match
+    return request
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    (
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"def", "abc"', True),
+        ("*", True),
+        ('"def"', False),
+    ),
+)
+def test_etag_matches(header: str, expected: bool) -> None:
+    """Test the comparison of `If-None-Match` against an ETag."""
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_etag_is_derived_from_content() -> None:
+    """Test that equal content gets an equal ETag and other content does not."""
+    cache = ResponseCache()
+    generation = cache.generation("ns")
+
+    first = cache.put("ns", "a", {"lemon": 1}, generation)
+    second = cache.put("ns", "b", {"lemon": 1}, generation)
+    third = cache.put("ns", "c", {"lemon": 2}, generation)
+
+    assert first.etag == second.etag != third.etag
+
+
+def test_invalidate_drops_namespace_only() -> None:
+    """Test that invalidating a namespace leaves other namespaces cached."""
+    cache = ResponseCache()
+    cache.put("lemons", "a", [], cache.generation("lemons"))
+    cache.put("ducks", "a", [], cache.generation("ducks"))
+
+    cache.invalidate("lemons")
+
+    assert cache.get("lemons", "a") is None
+    assert cache.get("ducks", "a") is not None
+
+
+def test_stale_load_is_not_cached() -> None:
+    """Test that a response loaded during an invalidation is not cached."""
+    cache = ResponseCache()
+    generation = cache.generation("ns")
+    cache.invalidate()
+
+    entry = cache.put("ns", "a", ["stale"], generation)
+
+    assert entry.body == b'["stale"]'
+    assert cache.get("ns", "a") is None
+
+
+async def test_cached_response_loads_once() -> None:
+    """Test that a cached response is served without loading it again."""
+    load = AsyncMock(return_value={"lemon": True})
+
+    first = await cached_response(create_request("/lemons"), "ns", load)
+    second = await cached_response(create_request("/lemons"), "ns", load)
+
+    load.assert_awaited_once()
+    assert first.body == second.body == b'{"lemon":true}'
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+
+async def test_cached_response_not_modified() -> None:
+    """Test that a matching `If-None-Match` results in an empty 304."""
+    load = AsyncMock(return_value={"lemon": True})
+    etag = (await cached_response(create_request("/lemons"), "ns", load)).headers[
+        "ETag"
+    ]
+
+    response = await cached_response(create_request("/lemons", etag), "ns", load)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == etag
+
+
+async def test_commit_and_invalidate() -> None:
+    """Test that a write notifies all workers and invalidates locally."""
+    await cached_response(create_request("/lemons"), "ns", AsyncMock(return_value=1))
+    session = AsyncMock()
+
+    await commit_and_invalidate(session, "ns")
+
+    (statement,), _ = session.execute.await_args
+    assert "pg_notify" in str(statement)
+    assert set(statement.compile().params.values()) == {CACHE_CHANNEL, "ns"}
+    session.commit.assert_awaited_once()
+    assert response_cache.get("ns", "/lemons?") is None
@@ -0,0 +1,130 @@
+import asyncio
+import datetime
+import typing
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from api.core.change_feed import (
+    ChangeNotifier,
+    changes_query,
+    format_event,
+    stream_changes,
+)
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+CHANGE = {
+    "id": 7,
+    "table_name": "api_botsetting",
+    "operation": "UPDATE",
+    "data": {"name": "news", "data": {}},
+    "created_at": datetime.datetime(2021, 11, 7, tzinfo=datetime.timezone.utc),
+}
+
+
+def session_factory(session: AsyncMock) -> Mock:
+    """Return a session factory whose sessions are all `session`."""
+    context = MagicMock()
+    context.__aenter__.return_value = session
+    return Mock(return_value=context)
+
+
+def test_changes_query_filters_tables() -> None:
+    """Test that the query resumes after an id and filters by table."""
+    sql = compile_sql(changes_query(7, ["api_role"]), literal_binds=True)
+
+    assert "api_change.id > 7" in sql
+    assert "api_change.table_name IN ('api_role')" in sql
+    assert "ORDER BY api_change.id" in sql
+
+
+def test_format_event() -> None:
+    """Test that a change is formatted as a server-sent event with its id."""
+    event = format_event(CHANGE).decode()
+
+    assert event.startswith("id: 7\nevent: change\ndata: {")
+    assert '"table":"api_botsetting"' in event
+    assert event.endswith("}\n\n")
+
+
+async def test_notifier_wakes_waiting_streams() -> None:
+    """Test that a notification wakes up a waiting stream."""
+    notifier = ChangeNotifier()
+    waiter = asyncio.create_task(notifier.wait(notifier.generation, 10))
+    await asyncio.sleep(0)
+
+    notifier.notify("7")
+
+    assert await waiter
+
+
+async def test_notifier_does_not_miss_earlier_changes() -> None:
+    """Test that a change before the wait started is not missed."""
+    notifier = ChangeNotifier()
+    generation = notifier.generation
+    notifier.notify("7")
+
+    assert await notifier.wait(generation, 0)
+
+
+async def test_notifier_times_out() -> None:
+    """Test that waiting without a change times out."""
+    notifier = ChangeNotifier()
+
+    assert not await notifier.wait(notifier.generation, 0.01)
+
+
+async def test_stream_starts_from_latest_change() -> None:
+    """Test that a stream without an id starts at the latest change."""
+    session = AsyncMock()
+    result = Mock()
+    result.one.return_value = (1, 6)
+    result.mappings.return_value.all.return_value = [CHANGE]
+    session.execute.return_value = result
+
+    stream = stream_changes(session_factory(session), None)
+
+    assert await stream.__anext__() == b"id: 6\nevent: ready\ndata: \n\n"
+    assert (await stream.__anext__()).startswith(b"id: 7\n")
+    await stream.aclose()
+
+
+@pytest.mark.parametrize(
+    ("oldest", "expected"),
+    [
+        (None, b"id: 3\nevent: ready\ndata: \n\n"),
+        (4, b"id: 3\nevent: ready\ndata: \n\n"),
+        (5, b"id: 9\nevent: resync\ndata: \n\n"),
+    ],
+)
+async def test_stream_resyncs_after_purged_changes(
+    oldest: typing.Optional[int], expected: bytes
+) -> None:
+    """Test that a stream resuming from a purged change starts with a resync."""
+    session = AsyncMock()
+    result = Mock()
+    result.one.return_value = (oldest, 9)
+    session.execute.return_value = result
+
+    stream = stream_changes(session_factory(session), 3)
+
+    assert await stream.__anext__() == expected
+    await stream.aclose()
+
+
+async def test_idle_stream_sends_keepalives() -> None:
+    """Test that an idle stream sends a comment after the keepalive interval."""
+    session = AsyncMock()
+    result = Mock()
+    result.one.return_value = (1, 7)
+    result.mappings.return_value.all.return_value = []
+    session.execute.return_value = result
+
+    stream = stream_changes(session_factory(session), 7)
+    await stream.__anext__()
+    with patch("api.core.change_feed.KEEPALIVE_INTERVAL", 0.01):
+        assert await stream.__anext__() == b": keepalive\n\n"
+    await stream.aclose()
@@ -0,0 +1,62 @@
+import pytest
+
+from api.core.database.models.api.bot import Message
+from api.core.embeds import embed_errors, validate_embed
+
+VALID_EMBED = {
+    "title": "Lemon",
+    "description": "A yellow citrus fruit.",
+    "fields": [{"name": "Colour", "value": "Yellow", "inline": True}],
+    "footer": {"text": "Lemon facts"},
+    "author": {"name": "Ducky"},
+}
+
+
+def test_valid_embed() -> None:
+    """Test that a valid embed passes validation unchanged."""
+    assert validate_embed(VALID_EMBED) is VALID_EMBED
+
+
+@pytest.mark.parametrize(
+    ("embed", "error"),
+    (
+        ({}, "must not be empty"),
+        ([], "must be a mapping"),
+        ({"color": 1}, "must contain one of the fields"),
+        ({"title": "a", "lemon": 1}, "Unknown field name: 'lemon'"),
+        ({"title": ""}, "Key 'title' must not be empty."),
+        ({"title": "a" * 257}, "Reached max length of embed title"),
+        ({"description": "a" * 4097}, "Reached max length of embed description"),
+        ({"fields": [{"name": "a"}]}, "must contain the following fields"),
+        ({"fields": [{"name": "a", "value": "b", "x": 1}]}, "Unknown embed field"),
+        ({"fields": [{"name": "a" * 257, "value": "b"}]}, "field-name length"),
+        ({"fields": [{"name": "a", "value": "b" * 1025}]}, "field-value length"),
+        ({"fields": [{"name": "a", "value": "b", "inline": 1}]}, "type bool"),
+        ({"title": "a", "footer": {"text": ""}}, "Footer text must not be empty"),
+        ({"title": "a", "footer": {"text": "a", "x": 1}}, "Unknown embed footer"),
+        ({"title": "a", "author": {"name": "a" * 257}}, "author name length"),
+        ({"title": "a", "author": {"name": "a", "x": 1}}, "Unknown embed author"),
+    ),
+)
+def test_invalid_embed(embed: dict, error: str) -> None:
+    """Test that invalid embeds are rejected with a descriptive error."""
+    with pytest.raises(ValueError, match=error):
+        validate_embed(embed)
+
+
+def test_embed_errors_reports_every_invalid_message() -> None:
+    """Test that a batch reports the error of each invalid message by index."""
+    batch = [[VALID_EMBED], [{"title": ""}], [], [VALID_EMBED, {"lemon": 1}]]
+
+    assert embed_errors(batch) == {
+        1: "Key 'title' must not be empty.",
+        3: "Unknown field name: 'lemon'",
+    }
+
+
+def test_message_model_uses_embed_validation() -> None:
+    """Test that the ORM hook of the `Message` model validates embeds."""
+    assert Message(embeds=[VALID_EMBED]).embeds == [VALID_EMBED]
+
+    with pytest.raises(ValueError, match="must not be empty"):
+        Message(embeds=[{}])
@@ -0,0 +1,179 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from api.core.filter_matching import FilterEntry, FilterIndex, FilterMatcher
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def entry(
+    entry_id: int, filter_type: str, content: str, allowed: bool = False
+) -> FilterEntry:
+    """Return a filter list entry."""
+    return FilterEntry(entry_id, filter_type, allowed, content)
+
+
+@pytest.fixture
+def index() -> FilterIndex:
+    """Return an index with entries of all filter list types."""
+    index = FilterIndex()
+    index.update(
+        [
+            entry(1, "FILTER_TOKEN", r"lemon+"),
+            entry(2, "FILTER_TOKEN", r"(duck)y"),
+            entry(3, "FILTER_TOKEN", r"[invalid"),
+            entry(4, "DOMAIN_NAME", "example.com"),
+            entry(5, "GUILD_INVITE", "python", allowed=True),
+            entry(6, "FILE_FORMAT", ".py", allowed=True),
+        ]
+    )
+    return index
+
+
+def matched_ids(index: FilterIndex, content: str, filenames: tuple = ()) -> set:
+    """Return the ids of the entries matching a message."""
+    return {match.entry.id for match in index.match(content, filenames)}
+
+
+def test_tokens_are_matched_case_insensitively(index: FilterIndex) -> None:
+    """Test that combined and separately compiled tokens both match."""
+    assert matched_ids(index, "LEMONNN and a ducky") == {1, 2}
+
+
+def test_invalid_tokens_are_ignored(index: FilterIndex) -> None:
+    """Test that an invalid pattern does not break the other tokens."""
+    assert matched_ids(index, "[invalid lemon") == {1}
+
+
+def test_overlapping_tokens_all_match() -> None:
+    """Test that tokens matching at the same position or overlapping all match."""
+    index = FilterIndex()
+    index.update(
+        [
+            entry(1, "FILTER_TOKEN", r"foo"),
+            entry(2, "FILTER_TOKEN", r"foobar"),
+            entry(3, "FILTER_TOKEN", r"barbaz"),
+            entry(4, "FILTER_TOKEN", r"safe", allowed=True),
+            entry(5, "FILTER_TOKEN", r"safe ?word"),
+        ]
+    )
+
+    assert matched_ids(index, "foobarbaz") == {1, 2, 3}
+    assert matched_ids(index, "a safe word") == {4, 5}
+    assert matched_ids(index, "nothing here") == set()
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    (
+        ("see https://example.com/page", {4}),
+        ("see http://www.EXAMPLE.com", {4}),
+        ("see https://notexample.com", set()),
+        ("see https://example.com.evil.org", set()),
+    ),
+)
+def test_domains_match_on_label_boundaries(
+    index: FilterIndex, content: str, expected: set
+) -> None:
+    """Test that a domain entry matches the domain and its subdomains only."""
+    assert matched_ids(index, content) == expected
+
+
+def test_domains_with_empty_labels_are_ignored() -> None:
+    """Test that a domain with empty labels does not break the other domains."""
+    index = FilterIndex()
+    index.update(
+        [
+            entry(1, "DOMAIN_NAME", "com"),
+            entry(2, "DOMAIN_NAME", "a..org"),
+            entry(3, "DOMAIN_NAME", "a..com"),
+        ]
+    )
+
+    assert matched_ids(index, "see https://a.com") == {1}
+    assert index.domains.lookup("x.org") is None
+
+
+def test_invites_and_file_formats(index: FilterIndex) -> None:
+    """Test that invite codes and attachment extensions are looked up."""
+    assert matched_ids(index, "join discord.gg/python", ("Main.PY",)) == {5, 6}
+
+
+def test_update_only_rebuilds_changed_types(index: FilterIndex) -> None:
+    """Test that updating one type leaves the other indexes alone."""
+    tokens = index.tokens
+
+    rebuilt = index.update([entry(7, "DOMAIN_NAME", "citrus.org")], deleted=[4])
+
+    assert rebuilt == {"DOMAIN_NAME"}
+    assert index.tokens is tokens
+    assert matched_ids(index, "https://citrus.org https://example.com") == {7}
+
+
+def test_update_moves_entry_between_types(index: FilterIndex) -> None:
+    """Test that changing the type of an entry removes it from the old type."""
+    rebuilt = index.update([entry(1, "DOMAIN_NAME", "lemon.org")])
+
+    assert rebuilt == {"FILTER_TOKEN", "DOMAIN_NAME"}
+    assert matched_ids(index, "lemon") == set()
+
+
+async def test_matcher_fetches_only_changed_rows() -> None:
+    """Test that the matcher refreshes from rows at or after its watermark."""
+    matcher = FilterMatcher()
+    matcher.index.update([entry(1, "FILTER_TOKEN", "lemon")])
+    matcher._watermark = "old"
+
+    session = AsyncMock()
+    counts = Mock()
+    counts.one.return_value = ("new", 2)
+    session.execute.side_effect = [counts, [entry(2, "FILTER_TOKEN", "duck")]]
+
+    with patch("api.core.filter_matching.settings") as settings:
+        settings.filter_lists_refresh_interval = 60
+        matches = await matcher.match(session, "lemon duck", ())
+        await matcher.match(session, "lemon duck", ())
+
+    assert {match.entry.id for match in matches} == {1, 2}
+    assert session.execute.await_count == 2
+    session.scalars.assert_not_awaited()
+
+    changed_query = session.execute.await_args_list[1].args[0]
+    assert "updated_at >=" in str(changed_query)
+
+
+async def test_matcher_drops_deleted_rows() -> None:
+    """Test that rows missing from the table are removed from the index."""
+    matcher = FilterMatcher()
+    matcher.index.update([entry(1, "FILTER_TOKEN", "lemon")])
+    matcher._watermark = "old"
+
+    session = AsyncMock()
+    counts = Mock()
+    counts.one.return_value = ("old", 0)
+    session.execute.side_effect = [counts, []]
+    session.scalars.return_value = []
+
+    assert await matcher.match(session, "lemon", ()) == []
+
+
+async def test_matcher_fetches_rows_missed_by_the_watermark() -> None:
+    """Test that rows committed with an older `updated_at` are fetched by id."""
+    matcher = FilterMatcher()
+    matcher.index.update([entry(1, "FILTER_TOKEN", "lemon")])
+    matcher._watermark = "old"
+
+    session = AsyncMock()
+    counts = Mock()
+    counts.one.return_value = ("old", 2)
+    session.execute.side_effect = [counts, [], [entry(2, "FILTER_TOKEN", "duck")]]
+    session.scalars.return_value = [1, 2]
+
+    matches = await matcher.match(session, "lemon duck", ())
+
+    assert {match.entry.id for match in matches} == {1, 2}
+    missing_query = str(session.execute.await_args_list[2].args[0])
+    assert "updated_at" not in missing_query
+    assert "api_filterlist.id IN" in missing_query
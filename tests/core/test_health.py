@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.pool import QueuePool
+
+from api.core import settings
+from api.core.health import (
+    DatabaseCheck,
+    ReadinessCheck,
+    expected_revision,
+    pool_available,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def mock_pool(checked_out: int, size: int = 5) -> Mock:
+    """Return a mocked engine whose pool has connections checked out."""
+    pool = Mock(spec=QueuePool)
+    pool.checkedout.return_value = checked_out
+    pool.size.return_value = size
+    return Mock(return_value=Mock(sync_engine=Mock(pool=pool)))
+
+
+def test_expected_revision_is_the_head() -> None:
+    """Test that the expected revision is the head of the migrations."""
+    assert expected_revision() is not None
+
+
+@pytest.mark.parametrize(
+    ("checked_out", "available"), [(0, True), (14, True), (15, False)]
+)
+def test_pool_saturation(checked_out: int, available: bool) -> None:
+    """Test that the pool is unavailable once the overflow is used up."""
+    with patch(
+        "api.core.health.engine.get_engine", mock_pool(checked_out)
+    ), patch.object(settings, "database_max_overflow", 10):
+        assert pool_available() is available
+
+
+async def test_database_check_is_cached() -> None:
+    """Test that the database is only queried once per TTL."""
+    check = ReadinessCheck()
+    query = AsyncMock(return_value=expected_revision())
+
+    with patch.object(ReadinessCheck, "_query_revision", query), patch(
+        "api.core.health.engine.get_engine", mock_pool(0)
+    ):
+        first = await check.check()
+        second = await check.check()
+
+    query.assert_awaited_once()
+    assert (
+        first
+        == second
+        == {
+            "ready": True,
+            "pool": True,
+            "database": True,
+            "migrations": True,
+        }
+    )
+
+
+async def test_outdated_migrations_are_not_ready() -> None:
+    """Test that a database at another revision is not ready."""
+    check = ReadinessCheck()
+    query = AsyncMock(return_value="0123456789ab")
+
+    with patch.object(ReadinessCheck, "_query_revision", query):
+        result = await check.check_database()
+
+    assert result == DatabaseCheck(database=True, migrations=False)
+
+
+async def test_unreachable_database_is_not_ready() -> None:
+    """Test that a database check that times out fails."""
+    check = ReadinessCheck()
+    query = AsyncMock(side_effect=asyncio.TimeoutError)
+
+    with patch.object(ReadinessCheck, "_query_revision", query):
+        result = await check.check_database()
+
+    assert result == DatabaseCheck(database=False, migrations=False)
+
+
+async def test_saturated_pool_skips_the_database() -> None:
+    """Test that a saturated pool fails without waiting for a connection."""
+    check = ReadinessCheck()
+    query = AsyncMock()
+
+    with patch.object(ReadinessCheck, "_query_revision", query), patch(
+        "api.core.health.engine.get_engine", mock_pool(100)
+    ):
+        result = await check.check()
+
+    query.assert_not_awaited()
+    assert not result["ready"]
+    assert not result["pool"]
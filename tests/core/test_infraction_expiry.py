@@ -0,0 +1,118 @@
+import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from api.core.infraction_expiry import (
+    ExpiryScheduler,
+    REDELIVERY_DELAY,
+    expiry_payload,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+EXPIRY = datetime.datetime(2021, 11, 7, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def scheduler() -> ExpiryScheduler:
+    """Return a loaded scheduler with two infractions."""
+    scheduler = ExpiryScheduler()
+    scheduler._loaded = True
+    scheduler.schedule(1, 200.0)
+    scheduler.schedule(2, 100.0)
+    return scheduler
+
+
+def test_pop_due_in_order_of_expiry(scheduler: ExpiryScheduler) -> None:
+    """Test that due infractions are popped by expiry and rescheduled."""
+    assert scheduler.pop_due(now=50.0) == []
+    assert scheduler.pop_due(now=300.0) == [2, 1]
+    assert scheduler.next_expiry() == 300.0 + REDELIVERY_DELAY
+
+
+def test_cancelled_infractions_are_skipped(scheduler: ExpiryScheduler) -> None:
+    """Test that cancelled and rescheduled entries are not popped."""
+    scheduler.cancel(2)
+    scheduler.schedule(1, 500.0)
+
+    assert scheduler.pop_due(now=300.0) == []
+    assert scheduler.next_expiry() == 500.0
+    assert len(scheduler) == 1
+
+
+def test_notifications_update_the_schedule(scheduler: ExpiryScheduler) -> None:
+    """Test that notification payloads schedule and cancel infractions."""
+    scheduler.on_notification(expiry_payload(3, EXPIRY))
+    scheduler.on_notification(expiry_payload(2, None))
+
+    assert scheduler.next_expiry() == 200.0
+    assert scheduler.pop_due(now=EXPIRY.timestamp()) == [1, 3]
+
+
+def test_resynchronization_unloads_the_schedule(scheduler: ExpiryScheduler) -> None:
+    """Test that a `None` notification forces a reload."""
+    scheduler.on_notification(None)
+
+    assert not scheduler.loaded
+
+
+async def test_load_schedules_active_infractions() -> None:
+    """Test that the schedule is loaded from the database only once."""
+    scheduler = ExpiryScheduler()
+    session = AsyncMock()
+    session.execute.return_value = [(1, EXPIRY)]
+
+    await scheduler.load(session)
+    await scheduler.load(session)
+
+    session.execute.assert_awaited_once()
+    assert scheduler.next_expiry() == EXPIRY.timestamp()
+
+
+async def test_notifications_during_load_are_replayed() -> None:
+    """Test that notifications received during the load aren't lost."""
+    scheduler = ExpiryScheduler()
+
+    async def execute(_statement: object) -> list:
+        # A pardon and a new infraction are committed during the query.
+        scheduler.on_notification(expiry_payload(1, None))
+        scheduler.on_notification(expiry_payload(2, EXPIRY))
+        return [(1, EXPIRY)]
+
+    session = AsyncMock()
+    session.execute.side_effect = execute
+
+    await scheduler.load(session)
+
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(now=EXPIRY.timestamp()) == [2]
+
+
+async def test_failed_load_is_retried() -> None:
+    """Test that a schedule which failed to load is loaded on the next call."""
+    scheduler = ExpiryScheduler()
+    session = AsyncMock()
+    session.execute.side_effect = [ConnectionResetError, [(1, EXPIRY)]]
+
+    with pytest.raises(ConnectionResetError):
+        await scheduler.load(session)
+    assert not scheduler.loaded
+
+    await scheduler.load(session)
+    assert scheduler.loaded
+    assert session.execute.await_count == 2
+    assert scheduler.next_expiry() == EXPIRY.timestamp()
+
+
+async def test_wait_due_returns_due_infractions(scheduler: ExpiryScheduler) -> None:
+    """Test that waiting returns immediately if infractions are due."""
+    with patch("api.core.infraction_expiry.time.time", return_value=150.0):
+        assert await scheduler.wait_due(10) == [2]
+
+
+async def test_wait_due_times_out(scheduler: ExpiryScheduler) -> None:
+    """Test that waiting returns nothing if nothing expires in time."""
+    with patch("api.core.infraction_expiry.time.time", return_value=0.0):
+        assert await scheduler.wait_due(0.01) == []
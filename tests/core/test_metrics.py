@@ -0,0 +1,64 @@
+from unittest.mock import Mock, patch
+
+from sqlalchemy.pool import QueuePool
+
+from api.core import metrics
+from api.core.metrics import (
+    POOL_CHECKED_OUT,
+    POOL_OVERFLOW,
+    PoolMonitor,
+    QueryStats,
+    query_stats,
+    render_metrics,
+)
+
+
+def test_queries_are_counted_per_request() -> None:
+    """Test that executed queries are added to the stats of the request."""
+    conn = Mock(info={})
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        for _ in range(2):
+            metrics._before_cursor_execute(conn)
+            metrics._after_cursor_execute(conn, None, "SELECT 1")
+    finally:
+        query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert conn.info["query_start_time"] == []
+
+
+def test_queries_outside_requests_are_ignored() -> None:
+    """Test that queries of background tasks don't need request stats."""
+    conn = Mock(info={})
+
+    metrics._before_cursor_execute(conn)
+    metrics._after_cursor_execute(conn, None, "SELECT 1")
+
+    assert query_stats.get() is None
+
+
+def test_pool_monitor_tracks_overflow() -> None:
+    """Test that connections beyond the pool size are counted as overflow."""
+    pool = Mock(spec=QueuePool)
+    pool.size.return_value = 1
+
+    with patch("api.core.metrics.event.listen"):
+        monitor = PoolMonitor(pool)
+    monitor.on_checkout()
+    monitor.on_checkout()
+
+    assert POOL_CHECKED_OUT._value.get() == 2
+    assert POOL_OVERFLOW._value.get() == 1
+
+    monitor.on_checkin()
+
+    assert POOL_CHECKED_OUT._value.get() == 1
+    assert POOL_OVERFLOW._value.get() == 0
+
+
+def test_render_metrics() -> None:
+    """Test that the metrics are rendered in the Prometheus text format."""
+    assert b"# TYPE api_request_duration_seconds histogram" in render_metrics()
@@ -0,0 +1,61 @@
+import pytest
+from fastapi import HTTPException
+from hypothesis import given
+from hypothesis.strategies import integers
+from sqlalchemy import select
+
+from api.core.database.models.api.bot import Infraction
+from api.core.pagination import Pagination, decode_cursor, encode_cursor
+from tests.helpers import compile_sql
+
+
+@given(integers(min_value=0, max_value=2 ** 63 - 1))
+def test_cursor_round_trip(key: int) -> None:
+    """Test that a decoded cursor yields the key it was encoded from."""
+    assert decode_cursor(encode_cursor(key)) == key
+
+
+@pytest.mark.parametrize("cursor", ("", "not a cursor", "bGVtb24"))
+def test_invalid_cursor_is_rejected(cursor: str) -> None:
+    """Test that an invalid cursor results in a client error."""
+    with pytest.raises(HTTPException) as exc:
+        Pagination(cursor=cursor, limit=10)
+
+    assert exc.value.status_code == 400
+
+
+def test_apply_uses_keyset_instead_of_offset() -> None:
+    """Test that a page is selected by comparing against the cursor key."""
+    pagination = Pagination(cursor=encode_cursor(42), limit=10)
+    query = pagination.apply(select(Infraction.id), Infraction.id)
+    sql = compile_sql(query, literal_binds=True)
+
+    assert "WHERE api_infraction.id > 42" in sql
+    assert "ORDER BY api_infraction.id" in sql
+    assert "LIMIT 11" in sql
+    assert "OFFSET" not in sql
+
+
+def test_first_page_has_no_lower_bound() -> None:
+    """Test that the first page starts at the lowest key."""
+    pagination = Pagination(cursor=None, limit=10)
+    query = pagination.apply(select(Infraction.id), Infraction.id)
+
+    assert query.whereclause is None
+
+
+def test_page_without_more_rows_has_no_cursor() -> None:
+    """Test that the last page does not point to a next page."""
+    pagination = Pagination(cursor=None, limit=2)
+    rows = [{"id": 1}, {"id": 2}]
+
+    assert pagination.page(rows, "id") == {"items": rows, "next_cursor": None}
+
+
+def test_page_with_more_rows_points_to_last_item() -> None:
+    """Test that the cursor of a full page points to its last item."""
+    pagination = Pagination(cursor=None, limit=2)
+    page = pagination.page([{"id": 1}, {"id": 2}, {"id": 3}], "id")
+
+    assert page["items"] == [{"id": 1}, {"id": 2}]
+    assert decode_cursor(page["next_cursor"]) == 2
@@ -0,0 +1,88 @@
+import datetime
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from api.core import purge
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def session_factory(*rowcounts: int) -> Mock:
+    """Return a session factory whose sessions delete the given numbers of rows."""
+    session = AsyncMock()
+    session.execute.side_effect = [Mock(rowcount=count) for count in rowcounts]
+
+    context = MagicMock()
+    context.__aenter__.return_value = session
+    return Mock(return_value=context, session=session)
+
+
+def test_purge_statement_deletes_a_bounded_batch() -> None:
+    """Test that a single batch of overdue rows is deleted."""
+    statement = purge.purge_statement(500, datetime.timedelta(days=1))
+    sql = compile_sql(statement, literal_binds=True)
+
+    assert sql.startswith("DELETE FROM api_offensivemessage WHERE")
+    assert "api_offensivemessage.id IN (SELECT api_offensivemessage.id" in sql
+    assert "LIMIT 500 FOR UPDATE SKIP LOCKED" in sql
+
+
+def test_change_purge_statement_keeps_the_latest_change() -> None:
+    """Test that old changes are deleted in batches, except the latest one."""
+    statement = purge.change_purge_statement(500, datetime.timedelta(days=7))
+    sql = compile_sql(statement, literal_binds=True)
+
+    assert sql.startswith("DELETE FROM api_change WHERE")
+    assert "api_change.id < (SELECT max(api_change.id)" in sql
+    assert "ORDER BY api_change.id" in sql
+    assert "LIMIT 500 FOR UPDATE SKIP LOCKED" in sql
+
+
+async def test_purge_runs_batches_until_done() -> None:
+    """Test that batches are purged until a batch is not full."""
+    factory = session_factory(10, 10, 3)
+
+    purged = await purge.purge_overdue(factory, 10, datetime.timedelta(0))
+
+    assert purged == 23
+    assert factory.call_count == 3
+    assert factory.session.commit.await_count == 3
+
+
+async def test_purge_stops_after_empty_batch() -> None:
+    """Test that nothing more is purged once there are no overdue rows."""
+    factory = session_factory(10, 0)
+
+    assert await purge.purge_overdue(factory, 10, datetime.timedelta(0)) == 10
+
+
+async def test_purge_changes_runs_batches_until_done() -> None:
+    """Test that old changes are purged until a batch is not full."""
+    factory = session_factory(10, 4)
+
+    purged = await purge.purge_changes(factory, 10, datetime.timedelta(days=7))
+
+    assert purged == 14
+    assert factory.call_count == 2
+
+
+async def test_purge_task_is_disabled_without_interval() -> None:
+    """Test that an interval of zero disables the purge task."""
+    with patch.object(purge.settings, "offensive_messages_purge_interval", 0):
+        purge.start()
+
+    assert purge._task is None
+
+
+async def test_purge_task_is_cancelled_on_stop() -> None:
+    """Test that stopping the purge task cancels it."""
+    with patch.object(purge, "run_purge_loop", AsyncMock()):
+        purge.start()
+        task = purge._task
+        await purge.stop()
+
+    assert task.done()
+    assert purge._task is None
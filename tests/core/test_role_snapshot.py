@@ -0,0 +1,88 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from api.core.role_snapshot import ResolvedRoles, RoleSnapshot
+
+
+pytestmark = pytest.mark.asyncio
+
+EVERYONE, HELPER, MODERATOR, ADMIN, OLD_ADMIN = 1, 20, 30, 40, 4
+
+
+@pytest.fixture
+def snapshot() -> RoleSnapshot:
+    """Return a snapshot of a small role hierarchy."""
+    snapshot = RoleSnapshot()
+    snapshot.update(
+        [
+            (EVERYONE, 0b0001, 0),
+            (HELPER, 0b0010, 1),
+            (MODERATOR, 0b0100, 2),
+            (ADMIN, 0b1000, 3),
+            (OLD_ADMIN, 0b1000, 3),
+        ]
+    )
+    return snapshot
+
+
+def test_permissions_are_combined(snapshot: RoleSnapshot) -> None:
+    """Test that the permissions of all roles and `@everyone` are combined."""
+    assert snapshot.resolve([HELPER, MODERATOR]) == ResolvedRoles(0b0111, MODERATOR)
+
+
+def test_users_without_roles_have_base_permissions(snapshot: RoleSnapshot) -> None:
+    """Test that users without roles only have the `@everyone` permissions."""
+    assert snapshot.resolve([]) == ResolvedRoles(0b0001, None)
+
+
+def test_unknown_roles_are_ignored(snapshot: RoleSnapshot) -> None:
+    """Test that roles missing from the snapshot don't count."""
+    assert snapshot.resolve([HELPER, 999]) == ResolvedRoles(0b0011, HELPER)
+
+
+def test_older_role_ranks_higher_on_same_position(snapshot: RoleSnapshot) -> None:
+    """Test that ties in position are broken like discord.py does."""
+    assert snapshot.resolve([ADMIN, OLD_ADMIN]).top_role_id == OLD_ADMIN
+
+
+def test_resolved_roles_are_reused(snapshot: RoleSnapshot) -> None:
+    """Test that the same set of roles is only resolved once."""
+    assert snapshot.resolve([HELPER, ADMIN]) is snapshot.resolve([ADMIN, HELPER])
+
+
+async def test_load_once_until_changed() -> None:
+    """Test that roles are loaded once, and again after a change."""
+    snapshot = RoleSnapshot()
+    result = Mock()
+    result.all.return_value = [(HELPER, 0b0010, 1)]
+    session = AsyncMock()
+    session.execute.return_value = result
+
+    await snapshot.load(session)
+    await snapshot.load(session)
+    assert session.execute.await_count == 1
+    assert snapshot.resolve([HELPER]) == ResolvedRoles(0b0010, HELPER)
+
+    snapshot.on_change("42")
+    assert not snapshot.loaded
+    await snapshot.load(session)
+    assert session.execute.await_count == 2
+
+
+async def test_failed_load_is_retried() -> None:
+    """Test that roles which failed to load are loaded on the next call."""
+    snapshot = RoleSnapshot()
+    result = Mock()
+    result.all.return_value = [(HELPER, 0b0010, 1)]
+    session = AsyncMock()
+    session.execute.side_effect = [ConnectionResetError, result]
+
+    with pytest.raises(ConnectionResetError):
+        await snapshot.load(session)
+    assert not snapshot.loaded
+
+    await snapshot.load(session)
+    assert snapshot.loaded
+    assert session.execute.await_count == 2
+    assert snapshot.resolve([HELPER]) == ResolvedRoles(0b0010, HELPER)
@@ -0,0 +1,71 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+
+pytestmark = pytest.mark.asyncio
+
+DEFCON = {"name": "defcon", "data": {"enabled": False}}
+
+
+def rows(*mappings: dict) -> Mock:
+    """Return a result holding the given rows."""
+    result = Mock()
+    result.mappings.return_value = Mock(
+        __iter__=lambda _: iter(mappings), first=lambda: next(iter(mappings), None)
+    )
+    return result
+
+
+async def test_reads_are_cached(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that a second read is served from the cache with the same ETag."""
+    session.execute.return_value = rows(DEFCON)
+
+    first = await client.get("/bot/bot_settings/defcon")
+    second = await client.get(
+        "/bot/bot_settings/defcon", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert first.status_code == 200
+    assert first.json() == DEFCON
+    assert second.status_code == 304
+    session.execute.assert_awaited_once()
+
+
+async def test_unknown_setting(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that reading a missing setting is a 404."""
+    session.execute.return_value = rows()
+
+    response = await client.get("/bot/bot_settings/defcon")
+
+    assert response.status_code == 404
+
+
+async def test_put_invalidates_cache(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that writing a setting invalidates the cached reads."""
+    session.execute.return_value = rows(DEFCON)
+    await client.get("/bot/bot_settings")
+
+    response = await client.put(
+        "/bot/bot_settings/defcon", json={"data": {"enabled": True}}
+    )
+    await client.get("/bot/bot_settings")
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "defcon", "data": {"enabled": True}}
+    session.commit.assert_awaited_once()
+    # One read, the upsert and its notification, and the read after the write.
+    assert session.execute.await_count == 4
+
+
+async def test_put_unknown_setting(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that only known settings can be written."""
+    response = await client.put("/bot/bot_settings/lemon", json={"data": {}})
+
+    assert response.status_code == 404
+    session.execute.assert_not_awaited()
@@ -0,0 +1,38 @@
+import typing
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_unknown_table(client: httpx.AsyncClient) -> None:
+    """Test that only tracked tables can be streamed."""
+    response = await client.get("/bot/changes", params={"table": "api_user"})
+
+    assert response.status_code == 400
+
+
+async def test_last_event_id_takes_precedence(client: httpx.AsyncClient) -> None:
+    """Test that a reconnecting client resumes after its last event."""
+    calls = []
+
+    async def stream(
+        _factory: object, after: int, tables: list[str]
+    ) -> typing.AsyncIterator[bytes]:
+        calls.append((after, tables))
+        yield b": keepalive\n\n"
+
+    with patch("api.endpoints.bot.changes.stream_changes", stream), patch(
+        "api.endpoints.bot.changes.engine.get_session_factory", Mock()
+    ):
+        response = await client.get(
+            "/bot/changes",
+            params={"after": 1, "table": "api_role"},
+            headers={"Last-Event-ID": "5"},
+        )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert calls == [(5, ["api_role"])]
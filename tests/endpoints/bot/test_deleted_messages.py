@@ -0,0 +1,118 @@
+import json
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from api.core import schemas
+from api.endpoints.bot.deleted_messages import (
+    COLUMNS,
+    merge_deleted_statement,
+    merge_messages_statement,
+    message_records,
+)
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+MESSAGE = {
+    "id": 1,
+    "channel_id": 2,
+    "content": "Eat a lemon",
+    "embeds": [{"title": "Lemons"}],
+    "author_id": 3,
+    "attachments": [],
+}
+CONTEXT = {
+    "actor_id": 4,
+    "creation": "2021-11-07T21:22:57+00:00",
+    "deletedmessage_set": [MESSAGE, {**MESSAGE, "id": 5}],
+}
+
+
+@pytest.fixture
+def driver_connection(session: AsyncMock) -> AsyncMock:
+    """Return the mocked asyncpg connection behind the session."""
+    driver_connection = AsyncMock()
+    connection = AsyncMock()
+    connection.get_raw_connection.return_value = Mock(
+        driver_connection=driver_connection
+    )
+    session.connection.return_value = connection
+    session.scalar.return_value = 10
+    return driver_connection
+
+
+def test_records_serialize_embeds() -> None:
+    """Test that the embeds of a record are serialized JSON documents."""
+    (record,) = message_records([schemas.Message(**MESSAGE)])
+
+    assert len(record) == len(COLUMNS)
+    assert record[COLUMNS.index("embeds")] == [json.dumps({"title": "Lemons"})]
+
+
+def test_merges_skip_archived_messages() -> None:
+    """Test that both merges leave existing rows untouched."""
+    messages_sql = compile_sql(merge_messages_statement())
+    deleted_sql = compile_sql(merge_deleted_statement(10))
+
+    assert "INSERT INTO api_message" in messages_sql
+    assert "FROM staging_message" in messages_sql
+    assert "INSERT INTO api_deletedmessage" in deleted_sql
+    for sql in (messages_sql, deleted_sql):
+        assert "ON CONFLICT (id) DO NOTHING" in sql
+
+
+async def test_archive_copies_messages(
+    client: httpx.AsyncClient, session: AsyncMock, driver_connection: AsyncMock
+) -> None:
+    """Test that a deletion is archived with a single `COPY`."""
+    response = await client.post("/bot/deleted_messages", json=CONTEXT)
+
+    assert response.status_code == 201
+    assert response.json() == {"id": 10, "messages": 2}
+    driver_connection.copy_records_to_table.assert_awaited_once()
+    args, kwargs = driver_connection.copy_records_to_table.call_args
+    assert args == ("staging_message",)
+    assert [record[0] for record in kwargs["records"]] == [1, 5]
+    session.commit.assert_awaited_once()
+
+
+async def test_archive_without_messages(
+    client: httpx.AsyncClient, session: AsyncMock, driver_connection: AsyncMock
+) -> None:
+    """Test that an empty deletion only stores its context."""
+    response = await client.post(
+        "/bot/deleted_messages", json={**CONTEXT, "deletedmessage_set": []}
+    )
+
+    assert response.status_code == 201
+    driver_connection.copy_records_to_table.assert_not_awaited()
+    session.execute.assert_not_awaited()
+
+
+async def test_archive_reports_invalid_embeds(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that every message with invalid embeds is reported at once."""
+    invalid = {**MESSAGE, "embeds": [{"colour": 1}]}
+    context = {**CONTEXT, "deletedmessage_set": [invalid, MESSAGE, invalid]}
+
+    response = await client.post("/bot/deleted_messages", json=context)
+
+    assert response.status_code == 422
+    assert response.text.count("message 1:") == 2
+    session.scalar.assert_not_awaited()
+
+
+async def test_archive_unknown_author(
+    client: httpx.AsyncClient, session: AsyncMock, driver_connection: AsyncMock
+) -> None:
+    """Test that a deletion referring to unknown users is rejected."""
+    session.commit.side_effect = IntegrityError("INSERT", {}, Exception())
+
+    response = await client.post("/bot/deleted_messages", json=CONTEXT)
+
+    assert response.status_code == 400
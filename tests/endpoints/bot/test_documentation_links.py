@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+
+pytestmark = pytest.mark.asyncio
+
+LINK = {
+    "package": "lemon",
+    "base_url": "https://lemon.readthedocs.io/en/latest/",
+    "inventory_url": "https://lemon.readthedocs.io/en/latest/objects.inv",
+}
+
+
+async def test_list_is_cached(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that the list of links is only loaded once."""
+    result = Mock()
+    result.mappings.return_value = [LINK]
+    session.execute.return_value = result
+
+    first = await client.get("/bot/documentation_links")
+    second = await client.get("/bot/documentation_links")
+
+    assert first.json() == second.json() == [LINK]
+    assert "ETag" in first.headers
+    session.execute.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    "invalid",
+    ({"package": "Lemon!"}, {"base_url": "https://lemon.readthedocs.io"}),
+)
+async def test_create_uses_model_validators(
+    client: httpx.AsyncClient, session: AsyncMock, invalid: dict
+) -> None:
+    """Test that links are validated like the `DocumentationLink` model does."""
+    response = await client.post("/bot/documentation_links", json={**LINK, **invalid})
+
+    assert response.status_code == 422
+    session.execute.assert_not_awaited()
+
+
+async def test_create_existing_package(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that creating a link for an existing package is a conflict."""
+    result = Mock()
+    result.first.return_value = None
+    session.execute.return_value = result
+
+    response = await client.post("/bot/documentation_links", json=LINK)
+
+    assert response.status_code == 409
+    session.commit.assert_not_awaited()
+
+
+async def test_delete_invalidates_cache(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that deleting a link commits and invalidates the cache."""
+    result = Mock()
+    result.first.return_value = ("lemon",)
+    session.execute.return_value = result
+
+    response = await client.delete("/bot/documentation_links/lemon")
+
+    assert response.status_code == 204
+    session.commit.assert_awaited_once()
@@ -0,0 +1,37 @@
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from api.core.filter_matching import FilterEntry, FilterMatch
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_match_returns_matching_entries(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that matching entries are returned with the matched value."""
+    entry = FilterEntry(1, "FILE_FORMAT", True, ".py")
+
+    with patch("api.endpoints.bot.filter_lists.filter_matcher") as matcher:
+        matcher.match = AsyncMock(return_value=[FilterMatch(entry, ".py")])
+        response = await client.post(
+            "/bot/filter_lists/match",
+            json={"content": "lemon", "attachments": ["main.py"]},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "matches": [
+            {
+                "id": 1,
+                "type": "FILE_FORMAT",
+                "allowed": True,
+                "content": ".py",
+                "value": ".py",
+            }
+        ]
+    }
+    matcher.match.assert_awaited_once_with(session, "lemon", ["main.py"])
@@ -0,0 +1,214 @@
+import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+from api.core.schemas import NewInfraction
+from api.endpoints.bot.infractions import apply_statement, summary_statement
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+INFRACTION = {
+    "id": 1,
+    "inserted_at": "2021-11-07T21:22:57+00:00",
+    "expires_at": "2021-11-08T21:22:57+00:00",
+    "active": True,
+    "type": "mute",
+    "reason": "Too many lemons",
+    "hidden": False,
+    "dm_sent": True,
+    "actor_id": 2,
+    "user_id": 3,
+}
+
+
+def test_summary_aggregates_by_type() -> None:
+    """Test that the summary is a single aggregate grouped by type."""
+    sql = compile_sql(summary_statement(1))
+
+    assert "count(*) FILTER (WHERE api_infraction.active)" in sql
+    assert "max(api_infraction.expires_at) FILTER (WHERE api_infraction.active)" in sql
+    assert "GROUP BY api_infraction.type" in sql
+
+
+def test_apply_is_a_single_statement() -> None:
+    """Test that the previous infraction is deactivated in the insert statement."""
+    infraction = NewInfraction(type="mute", actor_id=2, user_id=3)
+    sql = compile_sql(apply_statement(infraction))
+
+    assert "WITH deactivated AS \n(UPDATE api_infraction SET active=" in sql
+    assert "FROM previous ON CONFLICT (user_id, type) WHERE active DO NOTHING" in sql
+    assert "FROM previous LEFT OUTER JOIN inserted ON true" in sql
+
+
+async def test_apply_infraction(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that the expiries of new and deactivated infractions are notified."""
+    result = Mock()
+    result.mappings.return_value.one.return_value = {
+        **INFRACTION,
+        "deactivated_ids": [7],
+    }
+    session.execute.return_value = result
+    payload = {key: INFRACTION[key] for key in ("type", "actor_id", "user_id")}
+
+    with patch("api.endpoints.bot.infractions.notify_expiry") as notify_expiry:
+        response = await client.post(
+            "/bot/infractions", json={**payload, "expires_at": INFRACTION["expires_at"]}
+        )
+
+    assert response.status_code == 201
+    assert response.json() == {**INFRACTION, "deactivated_ids": [7]}
+    assert [call.args[1:] for call in notify_expiry.await_args_list] == [
+        (7, None),
+        (1, INFRACTION["expires_at"]),
+    ]
+    session.commit.assert_awaited_once()
+
+
+async def test_apply_infraction_conflict(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that a concurrently applied infraction is reported as a conflict."""
+    result = Mock()
+    result.mappings.return_value.one.return_value = {
+        **dict.fromkeys(INFRACTION),
+        "deactivated_ids": [],
+    }
+    session.execute.return_value = result
+
+    response = await client.post(
+        "/bot/infractions", json={"type": "ban", "actor_id": 2, "user_id": 3}
+    )
+
+    assert response.status_code == 409
+    session.commit.assert_not_awaited()
+
+
+async def test_apply_infraction_rejects_unknown_type(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that unsupported infraction types are rejected."""
+    response = await client.post(
+        "/bot/infractions", json={"type": "lemon", "actor_id": 2, "user_id": 3}
+    )
+
+    assert response.status_code == 422
+    session.execute.assert_not_awaited()
+
+
+async def test_summary_totals(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that the totals and latest expiry are derived from all types."""
+    expiry = datetime.datetime(2021, 11, 7, tzinfo=datetime.timezone.utc)
+    result = Mock()
+    result.mappings.return_value = [
+        {
+            "type": "ban",
+            "total": 1,
+            "active": 1,
+            "latest_expiry": None,
+            "active_ids": [3],
+        },
+        {
+            "type": "mute",
+            "total": 2,
+            "active": 1,
+            "latest_expiry": expiry,
+            "active_ids": [5],
+        },
+        {
+            "type": "note",
+            "total": 300,
+            "active": 0,
+            "latest_expiry": None,
+            "active_ids": None,
+        },
+    ]
+    session.execute.return_value = result
+
+    response = await client.get("/bot/infractions/summary/1")
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["total"] == 303
+    assert summary["active"] == 2
+    assert summary["latest_expiry"] == "2021-11-07T00:00:00+00:00"
+    assert summary["types"][2]["active_ids"] == []
+
+
+async def test_summary_without_infractions(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that a user without infractions gets an empty summary."""
+    result = Mock()
+    result.mappings.return_value = []
+    session.execute.return_value = result
+
+    response = await client.get("/bot/infractions/summary/1")
+
+    assert response.json() == {
+        "user_id": 1,
+        "total": 0,
+        "active": 0,
+        "latest_expiry": None,
+        "types": [],
+    }
+
+
+async def test_expired_skips_deactivated_infractions(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that due infractions which are no longer active are cancelled."""
+    scheduler = Mock(loaded=True, load=AsyncMock(), wait_due=AsyncMock())
+    scheduler.wait_due.return_value = [1, 2, 3]
+    result = Mock()
+    result.mappings.return_value = [
+        {**INFRACTION, "is_due": True},
+        {**INFRACTION, "id": 2, "active": False, "is_due": True},
+    ]
+    session.execute.return_value = result
+
+    with patch("api.endpoints.bot.infractions.expiry_scheduler", scheduler):
+        response = await client.get("/bot/infractions/expired")
+
+    assert response.json() == [INFRACTION]
+    assert sorted(call.args[0] for call in scheduler.cancel.call_args_list) == [2, 3]
+    scheduler.schedule.assert_not_called()
+    session.close.assert_awaited_once()
+
+
+async def test_expired_reschedules_infractions_not_due_yet(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that an infraction not due by the database clock is rescheduled."""
+    expires_at = datetime.datetime(
+        2021, 11, 8, 21, 22, 57, tzinfo=datetime.timezone.utc
+    )
+    scheduler = Mock(loaded=True, load=AsyncMock(), wait_due=AsyncMock())
+    scheduler.wait_due.return_value = [1]
+    result = Mock()
+    result.mappings.return_value = [
+        {**INFRACTION, "expires_at": expires_at, "is_due": False}
+    ]
+    session.execute.return_value = result
+
+    with patch("api.endpoints.bot.infractions.expiry_scheduler", scheduler):
+        response = await client.get("/bot/infractions/expired")
+
+    assert response.json() == []
+    scheduler.schedule.assert_called_once_with(1, expires_at.timestamp())
+    scheduler.cancel.assert_not_called()
+
+
+async def test_expired_times_out(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that nothing is queried if nothing expired."""
+    scheduler = Mock(loaded=True, load=AsyncMock(), wait_due=AsyncMock())
+    scheduler.wait_due.return_value = []
+
+    with patch("api.endpoints.bot.infractions.expiry_scheduler", scheduler):
+        response = await client.get("/bot/infractions/expired", params={"timeout": 0})
+
+    assert response.json() == []
+    session.execute.assert_not_awaited()
@@ -0,0 +1,90 @@
+import json
+import typing
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from api.core.pagination import decode_cursor
+from api.endpoints.bot.messages import EXPORT_BATCH_SIZE, filter_query
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def message(message_id: int) -> dict:
+    """Return a message row with the given id."""
+    return {
+        "id": message_id,
+        "channel_id": 1,
+        "content": "lemon",
+        "embeds": [{"title": "ducky"}],
+        "author_id": 2,
+        "attachments": [],
+    }
+
+
+def streamed_result(*batches: list[dict]) -> Mock:
+    """Return a streamed result yielding the given batches of rows."""
+
+    async def partitions(_size: int) -> typing.AsyncIterator[list[dict]]:
+        for batch in batches:
+            yield batch
+
+    result = Mock()
+    result.mappings.return_value.partitions = partitions
+    return result
+
+
+def test_filter_query_for_deletion_context() -> None:
+    """Test that a deletion context is resolved through the deleted messages."""
+    sql = compile_sql(filter_query(5, None))
+
+    assert "JOIN api_deletedmessage ON api_deletedmessage.id = api_message.id" in sql
+    assert "api_deletedmessage.deletion_context_id = " in sql
+
+
+async def test_list_messages_is_paginated(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that the message list returns a page with a cursor."""
+    result = Mock()
+    result.mappings.return_value.all.return_value = [message(1), message(2)]
+    session.execute.return_value = result
+
+    response = await client.get("/bot/messages", params={"limit": 1})
+
+    assert response.status_code == 200
+    page = response.json()
+    assert page["items"] == [message(1)]
+    assert decode_cursor(page["next_cursor"]) == 1
+
+
+async def test_export_streams_ndjson(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that every message is sent as a line of JSON."""
+    session.stream.return_value = streamed_result(
+        [message(1), message(2)], [message(3)]
+    )
+
+    response = await client.get("/bot/messages/export", params={"channel_id": 1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [message(i) for i in (1, 2, 3)]
+
+    (query,), _ = session.stream.await_args
+    assert query.get_execution_options()["yield_per"] == EXPORT_BATCH_SIZE
+
+
+async def test_export_requires_a_filter(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that exporting the whole archive at once is refused."""
+    response = await client.get("/bot/messages/export")
+
+    assert response.status_code == 400
+    session.stream.assert_not_awaited()
@@ -0,0 +1,48 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from api.endpoints.bot.nominations import review_queue_query
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def test_review_queue_is_a_single_query() -> None:
+    """Test that the entries and their actors are aggregated in a subquery."""
+    sql = compile_sql(review_queue_query(10))
+
+    assert "jsonb_agg(jsonb_build_object(" in sql
+    assert "ORDER BY api_nominationentry.inserted_at)" in sql
+    assert "JOIN api_user AS actor ON actor.id = api_nominationentry.actor_id" in sql
+    assert "WHERE api_nomination.active AND NOT api_nomination.reviewed" in sql
+    assert "ORDER BY api_nomination.inserted_at" in sql
+
+
+async def test_list_review_queue(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that the aggregated entries are returned with each nomination."""
+    entry = {
+        "id": 5,
+        "actor_id": 2,
+        "actor_name": "ducky",
+        "reason": "Very helpful",
+        "inserted_at": "2021-11-07T21:22:57+00:00",
+    }
+    nomination = {
+        "id": 1,
+        "user_id": 3,
+        "user_name": "lemon",
+        "inserted_at": "2021-11-06T21:22:57+00:00",
+        "entries": [entry],
+    }
+    result = Mock()
+    result.mappings.return_value.all.return_value = [nomination]
+    session.execute.return_value = result
+
+    response = await client.get("/bot/nominations/review_queue")
+
+    assert response.status_code == 200
+    assert response.json() == [nomination]
+    session.execute.assert_awaited_once()
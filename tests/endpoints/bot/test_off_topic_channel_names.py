@@ -0,0 +1,56 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from api.endpoints.bot.off_topic_channel_names import draw_statement, reset_statement
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def test_draw_marks_random_unused_names() -> None:
+    """Test that names are drawn and marked as used in a single statement."""
+    sql = compile_sql(draw_statement(3, []))
+
+    assert "WHERE NOT api_offtopicchannelname.used" in sql
+    assert "ORDER BY random()" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert sql.startswith("WITH picked AS")
+    assert "RETURNING api_offtopicchannelname.name" in sql
+
+
+def test_reset_keeps_drawn_names_used() -> None:
+    """Test that a new rotation doesn't include the names just drawn."""
+    sql = compile_sql(reset_statement(["lemon"]))
+
+    assert "api_offtopicchannelname.name != ALL (%(drawn)s::VARCHAR[])" in sql
+
+
+async def test_draw_without_reset(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that no new rotation is started while enough names are left."""
+    session.scalars.return_value = ["lemon", "duck", "kiwi"]
+
+    response = await client.post("/bot/off_topic_channel_names/draw")
+
+    assert response.json() == ["lemon", "duck", "kiwi"]
+    session.execute.assert_not_awaited()
+    session.commit.assert_awaited_once()
+
+
+async def test_draw_starts_new_rotation(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that the remaining names are drawn from a new rotation."""
+    session.scalars.side_effect = [["lemon"], ["duck", "kiwi"]]
+
+    response = await client.post(
+        "/bot/off_topic_channel_names/draw", params={"count": 3}
+    )
+
+    assert response.json() == ["lemon", "duck", "kiwi"]
+    session.execute.assert_awaited_once()
+    assert session.scalars.await_count == 2
@@ -0,0 +1,35 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_list_due_offensive_messages(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that due offensive messages are listed."""
+    row = {"id": 1, "channel_id": 2, "delete_date": "2021-12-11T00:00:00+00:00"}
+    result = Mock()
+    result.mappings.return_value.all.return_value = [row]
+    session.execute.return_value = result
+
+    response = await client.get("/bot/offensive_messages/due", params={"within": 60})
+
+    assert response.status_code == 200
+    assert response.json() == [row]
+    (query,), _ = session.execute.await_args
+    assert "ORDER BY api_offensivemessage.delete_date" in str(query)
+
+
+async def test_delete_offensive_messages(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that offensive messages are deleted in a single statement."""
+    response = await client.request("DELETE", "/bot/offensive_messages", json=[1, 2])
+
+    assert response.status_code == 204
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
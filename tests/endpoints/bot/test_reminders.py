@@ -0,0 +1,91 @@
+import datetime
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from api.endpoints.bot.reminders import ack_statement, claim_statement
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+REMINDER = {
+    "id": 1,
+    "active": True,
+    "channel_id": 2,
+    "content": "Eat a lemon",
+    "expiration": "2021-11-07T21:22:57+00:00",
+    "failures": 0,
+    "author_id": 3,
+    "jump_url": "https://discord.com/channels/1/2/3",
+    "mentions": [],
+    "claimed_until": "2021-11-07T21:23:57+00:00",
+}
+
+
+def test_claim_skips_locked_and_leased_reminders() -> None:
+    """Test that a claim only selects unclaimed, due reminders."""
+    sql = compile_sql(claim_statement(10, datetime.timedelta(seconds=30)))
+
+    assert "api_reminder.active AND api_reminder.expiration <= now()" in sql
+    assert "api_reminder.claimed_until < now()" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "SET claimed_until=(now() + " in sql
+
+
+def test_negative_ack_increments_failures() -> None:
+    """Test that a failed delivery bumps the failure count."""
+    sql = compile_sql(ack_statement(1, delivered=False))
+
+    assert "failures=(api_reminder.failures + " in sql
+    assert "active=" not in sql
+
+
+def test_positive_ack_deactivates_reminder() -> None:
+    """Test that a delivered reminder is deactivated."""
+    sql = compile_sql(ack_statement(1, delivered=True))
+
+    assert "active=" in sql
+    assert "failures" not in sql
+
+
+async def test_claim_returns_claimed_reminders(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that the claimed reminders are returned and committed."""
+    result = Mock()
+    result.mappings.return_value.all.return_value = [REMINDER]
+    session.execute.return_value = result
+
+    response = await client.post("/bot/reminders/claim", params={"limit": 5})
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == 1
+    session.commit.assert_awaited_once()
+
+
+async def test_ack_unknown_reminder(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that acknowledging an inactive or unknown reminder is a 404."""
+    result = Mock()
+    result.first.return_value = None
+    session.execute.return_value = result
+
+    response = await client.post("/bot/reminders/1/ack", json={"delivered": True})
+
+    assert response.status_code == 404
+    session.commit.assert_not_awaited()
+
+
+async def test_ack_reminder(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that acknowledging a claimed reminder commits the change."""
+    result = Mock()
+    result.first.return_value = (1,)
+    session.execute.return_value = result
+
+    response = await client.post("/bot/reminders/1/ack", json={"delivered": False})
+
+    assert response.status_code == 204
+    session.commit.assert_awaited_once()
@@ -0,0 +1,77 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+
+from api.endpoints.bot.roles import counts_query, members_query
+from tests.helpers import compile_sql
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize(("match_all", "operator"), ((True, "@>"), (False, "&&")))
+def test_members_use_array_operators(match_all: bool, operator: str) -> None:
+    """Test that members are selected with an operator of the GIN index."""
+    sql = compile_sql(members_query([1, 2], match_all, in_guild=None))
+
+    assert f"WHERE api_user.roles {operator} %(role_ids)s::BIGINT[]" in sql
+
+
+def test_counts_are_a_single_aggregate() -> None:
+    """Test that the members of every role are counted in one query."""
+    sql = compile_sql(counts_query([1, 2], in_guild=True))
+
+    assert "count(*) FILTER (WHERE api_user.roles @> %(role_1)s::BIGINT[])" in sql
+    assert "WHERE (api_user.roles && %(any_role_ids)s::BIGINT[])" in sql
+    assert "api_user.in_guild = true" in sql
+
+
+async def test_list_role_members(client: httpx.AsyncClient, session: AsyncMock) -> None:
+    """Test that role members are paginated."""
+    member = {
+        "id": 1,
+        "name": "lemon",
+        "discriminator": 1,
+        "in_guild": True,
+        "roles": [5],
+    }
+    result = Mock()
+    result.mappings.return_value.all.return_value = [member]
+    session.execute.return_value = result
+
+    response = await client.get("/bot/roles/members", params={"role_id": 5})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [member], "next_cursor": None}
+
+
+async def test_count_role_members(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that the counts are returned by role id, once per role."""
+    result = Mock()
+    result.mappings.return_value.one.return_value = {
+        "any": 10,
+        "all": 2,
+        "role_0": 5,
+        "role_1": 7,
+    }
+    session.execute.return_value = result
+
+    response = await client.get(
+        "/bot/roles/counts", params=[("role_id", 5), ("role_id", 6), ("role_id", 5)]
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"any": 10, "all": 2, "roles": {"5": 5, "6": 7}}
+
+
+async def test_role_ids_are_required(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that at least one role is required."""
+    response = await client.get("/bot/roles/counts")
+
+    assert response.status_code == 422
+    session.execute.assert_not_awaited()
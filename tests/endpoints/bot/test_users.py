@@ -0,0 +1,138 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+from api.core.role_snapshot import ResolvedRoles
+from api.core.schemas import PartialUser, User
+from api.endpoints.bot.users import chunked, patch_statement, upsert_statement
+from tests.helpers import compile_sql
+
+
+def user(user_id: int, **fields) -> dict:
+    """Return a valid user payload with the given id."""
+    return {"id": user_id, "name": "lemon", "discriminator": 1, "roles": [], **fields}
+
+
+@pytest.mark.parametrize(
+    "fields",
+    ({"id": -1}, {"discriminator": 0}, {"discriminator": 10_000}, {"roles": [-5]}),
+)
+def test_user_schema_uses_model_validators(fields: dict) -> None:
+    """Test that the user schema rejects what the `User` model rejects."""
+    with pytest.raises(ValueError):
+        User(**user(1, **fields))
+
+
+def test_partial_user_only_requires_id() -> None:
+    """Test that a partial user only contains the fields that were set."""
+    assert PartialUser(id=1, name="ducky").dict(exclude_unset=True) == {
+        "id": 1,
+        "name": "ducky",
+    }
+
+
+def test_chunked_splits_rows() -> None:
+    """Test that rows are split into chunks of at most the given size."""
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+def test_upsert_skips_unchanged_rows() -> None:
+    """Test that the upsert only updates rows that are distinct."""
+    sql = compile_sql(upsert_statement([user(1)]))
+
+    assert "ON CONFLICT (id) DO UPDATE" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert "RETURNING xmax = 0 AS created" in sql
+
+
+def test_patch_expands_rows_server_side() -> None:
+    """Test that partial users are sent as a single JSON parameter."""
+    sql = compile_sql(patch_statement())
+
+    assert "FROM jsonb_to_recordset(" in sql
+    assert "AS patch(id BIGINT," in sql
+    assert "coalesce(patch.name, api_user.name)" in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_counts_rows(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that created, updated and unchanged users are counted."""
+    result = Mock()
+    result.scalars.return_value = [True, False]
+    session.execute.return_value = result
+
+    response = await client.put(
+        "/bot/users/bulk", json=[user(1), user(2), user(3), user(3, name="ducky")]
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 1, "updated": 1, "unchanged": 1}
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rejects_invalid_users(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that nothing is written if a single user is invalid."""
+    response = await client.put("/bot/users/bulk", json=[user(1), user(-2)])
+
+    assert response.status_code == 422
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch_counts_rows(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that updated and unchanged users are counted."""
+    session.scalars.return_value = [1, 2]
+    result = Mock()
+    result.all.return_value = [(1,)]
+    session.execute.return_value = result
+
+    response = await client.patch(
+        "/bot/users/bulk", json=[{"id": 1, "in_guild": False}, {"id": 2}]
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 0, "updated": 1, "unchanged": 1}
+    _, parameters = session.execute.await_args.args
+    assert parameters == {"rows": [{"id": 1, "in_guild": False}, {"id": 2}]}
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch_unknown_users(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that patching unknown users responds with their ids."""
+    session.scalars.return_value = [1]
+
+    response = await client.patch("/bot/users/bulk", json=[{"id": 1}, {"id": 3}])
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": {"missing": [3]}}
+    session.execute.assert_not_awaited()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_resolve_user_permissions(
+    client: httpx.AsyncClient, session: AsyncMock
+) -> None:
+    """Test that the permissions of known users are resolved from the snapshot."""
+    snapshot = Mock(load=AsyncMock())
+    snapshot.resolve.return_value = ResolvedRoles(permissions=6, top_role_id=3)
+    session.execute.return_value = [(1, [2, 3])]
+
+    with patch("api.endpoints.bot.users.role_snapshot", snapshot):
+        response = await client.post("/bot/users/permissions", json=[1, 2])
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "permissions": 6, "top_role_id": 3}]
+    snapshot.load.assert_awaited_once_with(session)
+    snapshot.resolve.assert_called_once_with([2, 3])
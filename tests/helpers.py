@@ -0,0 +1,12 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import ClauseElement
+
+
+def compile_sql(statement: ClauseElement, literal_binds: bool = False) -> str:
+    """Compile a statement for PostgreSQL, optionally rendering bound values."""
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": literal_binds},
+        )
+    )
@@ -0,0 +1,40 @@
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from api.core import settings
+from api.main import app
+
+
+pytestmark = pytest.mark.asyncio
+
+READY = {"ready": True, "pool": True, "database": True, "migrations": True}
+
+
+async def test_health_check_includes_commit_sha(client: httpx.AsyncClient) -> None:
+    """Test that the health check reports the deployed commit."""
+    response = await client.get("/")
+
+    assert response.json()["commit_sha"] == settings.commit_sha
+
+
+async def test_liveness_without_token() -> None:
+    """Test that the liveness probe needs no token."""
+    async with httpx.AsyncClient(app=app, base_url="http://testserver") as client:
+        response = await client.get("/health/live")
+
+    assert response.json() == {"alive": True}
+
+
+@pytest.mark.parametrize(("ready", "status"), [(True, 200), (False, 503)])
+async def test_readiness_status(
+    client: httpx.AsyncClient, ready: bool, status: int
+) -> None:
+    """Test that a worker that is not ready responds with a 503."""
+    readiness = {**READY, "ready": ready, "database": ready}
+    with patch("api.main.readiness_check.check", AsyncMock(return_value=readiness)):
+        response = await client.get("/health/ready")
+
+    assert response.status_code == status
+    assert response.json() == readiness